@@ -1,7 +1,9 @@
 """HSK Curriculum Reference Library.
 
 Provides structured access to HSK 1-6 vocabulary, grammar patterns,
-and conversation topics. Data is lazy-loaded from JSON files and cached.
+and conversation topics. The JSON files under data/ are the source of
+truth; they are compiled into a memory-mapped data/hsk.bin (see
+compiled.py) and each level is decoded from it on first use and cached.
 
 Usage:
     from backend.chinese.hsk import get_vocab, get_grammar, get_topics, get_level, LEVELS
@@ -11,33 +13,116 @@ Usage:
     get_vocab(2, 3)       # Combined vocab for HSK2 + HSK3
     get_grammar(3)        # Grammar patterns for HSK3
     get_topics(2)         # Conversation topics for HSK2
+
+For hot paths, an index over all levels is built once (see load_all):
+
+    vocab_level(2)                    # HSK2 vocab as a shared tuple
+    lookup("爱好")                    # Entry for a word, or None
+    level_words(2)                    # frozenset of HSK2 words
+    sample_vocab(2, 3, exclude={"爱"}) # 3 random distinct entries, O(k)
+
+get_level/get_vocab/get_grammar/get_topics return plain dicts, as when
+the data was loaded from JSON (cached per level and shared, so treat them
+as read-only too). The hot-path functions return the shared
+slotted VocabEntry records directly; they are read-only mappings
+(entry["field"], .get(), dict(entry)), and as_dict() gives a copy for
+serialization.
 """
 
 from __future__ import annotations
 
-import json
-from pathlib import Path
-from typing import Any
+import random
+import threading
+from typing import Any, Iterable
+
+from backend.chinese.hsk import compiled
+from backend.chinese.hsk.compiled import DededeQuestion, VocabEntry
 
 LEVELS: list[int] = [1, 2, 3, 4, 5, 6]
 
-_DATA_DIR = Path(__file__).parent / "data"
+_data: compiled.CompiledHSK | None = None
+# The startup warm-up thread and the event loop may both get here first
+_data_lock = threading.Lock()
 _cache: dict[int, dict[str, Any]] = {}
+_dict_cache: dict[int, dict[str, Any]] = {}
+
+
+def _compiled() -> compiled.CompiledHSK:
+    global _data
+    if _data is None:
+        with _data_lock:
+            if _data is None:
+                _data = compiled.load()
+    return _data
 
 
 def _load(level: int) -> dict[str, Any]:
     if level not in LEVELS:
         raise ValueError(f"Invalid HSK level: {level}. Must be one of {LEVELS}")
     if level not in _cache:
-        path = _DATA_DIR / f"hsk{level}.json"
-        with open(path, encoding="utf-8") as f:
-            _cache[level] = json.load(f)
+        data = _compiled()
+        _cache[level] = {
+            "level": level,
+            "vocab": data.records("vocab", level),
+            "grammar": data.records("grammar", level),
+            "topics": data.records("topics", level),
+        }
     return _cache[level]
 
 
+class _VocabIndex:
+    __slots__ = ("by_level", "by_chinese", "words")
+
+    def __init__(self) -> None:
+        self.by_level: dict[int, tuple[VocabEntry, ...]] = {}
+        self.by_chinese: dict[str, VocabEntry] = {}
+        self.words: dict[int, frozenset[str]] = {}
+        for level in LEVELS:
+            entries = tuple(_load(level)["vocab"])
+            self.by_level[level] = entries
+            self.words[level] = frozenset(e.chinese for e in entries)
+            for entry in entries:
+                # A word listed at several levels resolves to the lowest one
+                self.by_chinese.setdefault(entry.chinese, entry)
+
+
+_index: _VocabIndex | None = None
+
+
+def load_all() -> None:
+    """Map the compiled data and build the vocab index (called at startup)."""
+    _vocab_index()
+
+
+def _vocab_index() -> _VocabIndex:
+    global _index
+    if _index is None:
+        _index = _VocabIndex()
+    return _index
+
+
+def _level_entries(level: int) -> tuple[VocabEntry, ...]:
+    if level not in LEVELS:
+        raise ValueError(f"Invalid HSK level: {level}. Must be one of {LEVELS}")
+    return _vocab_index().by_level[level]
+
+
+def _load_dicts(level: int) -> dict[str, Any]:
+    """Plain-dict view of a level, built once and shared like the records."""
+    if level not in _dict_cache:
+        data = _load(level)
+        _dict_cache[level] = {
+            "level": level,
+            "vocab": [r.as_dict() for r in data["vocab"]],
+            "grammar": [r.as_dict() for r in data["grammar"]],
+            "topics": [r.as_dict() for r in data["topics"]],
+        }
+    return _dict_cache[level]
+
+
 def get_level(level: int) -> dict[str, Any]:
     """Return the full curriculum dict for a single HSK level."""
-    return _load(level)
+    return _load_dicts(level)
 
 
 def get_vocab(*levels: int) -> list[dict[str, str]]:
@@ -46,15 +131,61 @@ def get_vocab(*levels: int) -> list[dict[str, str]]:
         raise ValueError("At least one level is required")
     result: list[dict[str, str]] = []
     for lvl in levels:
-        result.extend(_load(lvl)["vocab"])
+        result.extend(_load_dicts(lvl)["vocab"])
     return result
 
 
 def get_grammar(level: int) -> list[dict[str, str]]:
     """Return grammar patterns for a single HSK level."""
-    return _load(level)["grammar"]
+    return _load_dicts(level)["grammar"]
 
 
 def get_topics(level: int) -> list[dict[str, str]]:
     """Return conversation topics for a single HSK level."""
-    return _load(level)["topics"]
+    return _load_dicts(level)["topics"]
+
+
+def get_dedede() -> list[DededeQuestion]:
+    """Return the 的/得/地 practice questions."""
+    return _compiled().records("dedede")
+
+
+def vocab_level(level: int) -> tuple[VocabEntry, ...]:
+    """Return one level's vocab entries without copying them."""
+    return _level_entries(level)
+
+
+def lookup(chinese: str) -> VocabEntry | None:
+    """Return the vocab entry for a word (lowest level it appears in)."""
+    return _vocab_index().by_chinese.get(chinese)
+
+
+def level_words(level: int) -> frozenset[str]:
+    """Return the set of words in one level."""
+    _level_entries(level)
+    return _vocab_index().words[level]
+
+
+def sample_vocab(
+    level: int, k: int, exclude: Iterable[str] = ()
+) -> list[VocabEntry]:
+    """Pick up to k random entries with distinct words, skipping `exclude`.
+
+    Uses rejection sampling over the level's entries, so the cost is O(k)
+    rather than O(level size); falls back to a scan only when most of the
+    level is excluded.
+    """
+    entries = _level_entries(level)
+    seen = set(exclude)
+    picked: list[VocabEntry] = []
+    for _ in range(k * 8 if entries else 0):
+        if len(picked) >= k:
+            break
+        entry = entries[random.randrange(len(entries))]
+        if entry.chinese not in seen:
+            seen.add(entry.chinese)
+            picked.append(entry)
+    if len(picked) < k:
+        rest = list({e.chinese: e for e in entries if e.chinese not in seen}.values())
+        picked.extend(random.sample(rest, min(k - len(picked), len(rest))))
+    return picked
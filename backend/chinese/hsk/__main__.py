@@ -0,0 +1,6 @@
+"""Compile the HSK JSON data: python -m backend.chinese.hsk"""
+
+from backend.chinese.hsk.compiled import build
+
+out = build()
+print(f"Wrote {out} ({out.stat().st_size} bytes)")
@@ -0,0 +1,271 @@
+"""Compiled, memory-mappable form of the HSK data files.
+
+`python -m backend.chinese.hsk` compiles data/hsk1-6.json and
+data/dedede.json into data/hsk.bin (a build artifact, not checked in).
+The library rebuilds it automatically when it is missing or older than
+any JSON source, so running the build step by hand is optional.
+
+Layout (all integers little-endian uint32 unless noted):
+
+    header      magic "HSKC", u16 format version, 2 pad bytes,
+                string table size in bytes
+    sections    (offset, record count, fields per record) for each of
+                vocab, grammar, topics, dedede
+    strings     deduplicated UTF-8 strings, each NUL-terminated
+    records     per section, fixed-width rows of string ids sorted by
+                level; the first field of every row is the HSK level
+                (0 for dedede)
+
+The string table is decoded with a single split; records are built
+column-wise from strided views of the mapped rows, so no JSON parsing or
+per-field Python work happens at load time.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+import json
+import mmap
+import os
+from pathlib import Path
+import struct
+import sys
+import tempfile
+
+DATA_DIR = Path(__file__).parent / "data"
+COMPILED_PATH = DATA_DIR / "hsk.bin"
+
+_MAGIC = b"HSKC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sH2xI")
+_SECTION = struct.Struct("<III")
+_LEVELS = range(1, 7)
+
+
+class Record(Mapping):
+    """Slotted, read-only mapping over the record's fields.
+
+    Behaves like the dicts the JSON loader used to return (entry["field"],
+    .get(), dict(entry), == against a dict); use as_dict() to get a real
+    dict, e.g. for json.dumps.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def as_dict(self) -> dict[str, str]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+
+class VocabEntry(Record):
+    __slots__ = ("chinese", "pinyin", "english")
+
+    def __init__(self, chinese: str, pinyin: str, english: str) -> None:
+        self.chinese = chinese
+        self.pinyin = pinyin
+        self.english = english
+
+
+class GrammarPattern(Record):
+    __slots__ = ("pattern", "english", "example")
+
+    def __init__(self, pattern: str, english: str, example: str) -> None:
+        self.pattern = pattern
+        self.english = english
+        self.example = example
+
+
+class Topic(Record):
+    __slots__ = ("id", "label", "description")
+
+    def __init__(self, id: str, label: str, description: str) -> None:
+        self.id = id
+        self.label = label
+        self.description = description
+
+
+class DededeQuestion(Record):
+    __slots__ = ("sentence", "answer", "english", "pinyin")
+
+    def __init__(self, sentence: str, answer: str, english: str, pinyin: str) -> None:
+        self.sentence = sentence
+        self.answer = answer
+        self.english = english
+        self.pinyin = pinyin
+
+
+# Section order in the file, with the record type stored in each
+SECTIONS: tuple[tuple[str, type[Record]], ...] = (
+    ("vocab", VocabEntry),
+    ("grammar", GrammarPattern),
+    ("topics", Topic),
+    ("dedede", DededeQuestion),
+)
+_RECORD_TYPES = dict(SECTIONS)
+
+
+def _source_paths(data_dir: Path) -> list[Path]:
+    return [data_dir / f"hsk{level}.json" for level in _LEVELS] + [
+        data_dir / "dedede.json"
+    ]
+
+
+def _u32(values) -> bytes:
+    packed = array("I", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def compile_data(data_dir: Path = DATA_DIR) -> bytes:
+    """Compile the JSON sources into the binary format."""
+    strings: dict[str, int] = {}
+
+    def sid(value: str) -> int:
+        if "\0" in value:
+            raise ValueError(f"NUL character in HSK data: {value!r}")
+        return strings.setdefault(value, len(strings))
+
+    rows: dict[str, list[int]] = {name: [] for name, _ in SECTIONS}
+    for level in _LEVELS:
+        with open(data_dir / f"hsk{level}.json", encoding="utf-8") as f:
+            data = json.load(f)
+        for name, record_type in SECTIONS[:3]:
+            for entry in data[name]:
+                rows[name].append(level)
+                rows[name].extend(sid(entry[field]) for field in record_type.__slots__)
+    with open(data_dir / "dedede.json", encoding="utf-8") as f:
+        for entry in json.load(f):
+            rows["dedede"].append(0)
+            rows["dedede"].extend(sid(entry[field]) for field in DededeQuestion.__slots__)
+
+    table = "".join(s + "\0" for s in strings).encode("utf-8")
+    table += b"\0" * (-len(table) % 4)  # keep the record arrays aligned
+
+    start = _HEADER.size + _SECTION.size * len(SECTIONS) + len(table)
+    directory = b""
+    body = b""
+    for name, record_type in SECTIONS:
+        width = 1 + len(record_type.__slots__)
+        directory += _SECTION.pack(start + len(body), len(rows[name]) // width, width)
+        body += _u32(rows[name])
+
+    return _HEADER.pack(_MAGIC, _VERSION, len(table)) + directory + table + body
+
+
+def build(data_dir: Path = DATA_DIR, out_path: Path = COMPILED_PATH) -> Path:
+    """Compile the sources and write the artifact atomically.
+
+    Each writer uses its own temporary file, so concurrent builds can't
+    publish a partly written one.
+    """
+    data = compile_data(data_dir)
+    with tempfile.NamedTemporaryFile(
+        dir=out_path.parent, prefix=out_path.name + ".", suffix=".tmp", delete=False
+    ) as tmp:
+        tmp.write(data)
+    try:
+        os.replace(tmp.name, out_path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+    return out_path
+
+
+class CompiledHSK:
+    """Reader over a compiled buffer (an mmap of hsk.bin, or bytes)."""
+
+    def __init__(self, buffer) -> None:
+        self._view = memoryview(buffer)
+        magic, version, table_size = _HEADER.unpack_from(self._view, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a compiled HSK file (or an older format)")
+        pos = _HEADER.size
+        self._sections: dict[str, tuple[int, int, int]] = {}
+        for name, _ in SECTIONS:
+            self._sections[name] = _SECTION.unpack_from(self._view, pos)
+            pos += _SECTION.size
+        self._table = (pos, table_size)
+        self._strings: list[str] | None = None
+
+    def _string_table(self) -> list[str]:
+        if self._strings is None:
+            pos, size = self._table
+            self._strings = str(self._view[pos : pos + size], "utf-8").split("\0")
+        return self._strings
+
+    def _rows(self, section: str):
+        offset, count, width = self._sections[section]
+        raw = self._view[offset : offset + 4 * count * width]
+        if sys.byteorder == "little":
+            return raw.cast("I"), width
+        rows = array("I", raw)
+        rows.byteswap()
+        return rows, width
+
+    def records(self, section: str, level: int | None = None) -> list[Record]:
+        """Decode a section's rows, optionally only those for one level."""
+        rows, width = self._rows(section)
+        if level is not None:
+            levels = rows[0::width].tolist()
+            lo, hi = bisect_left(levels, level), bisect_right(levels, level)
+            rows = rows[lo * width : hi * width]
+        lookup = self._string_table().__getitem__
+        columns = [map(lookup, rows[f::width]) for f in range(1, width)]
+        return list(map(_RECORD_TYPES[section], *columns))
+
+
+def _is_stale(path: Path) -> bool:
+    try:
+        built = path.stat().st_mtime_ns
+    except OSError:
+        return True
+    return any(src.stat().st_mtime_ns > built for src in _source_paths(path.parent))
+
+
+def open_compiled(path: Path = COMPILED_PATH) -> CompiledHSK | None:
+    """Map the artifact read-only; None if it is missing, stale or unreadable."""
+    if _is_stale(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return CompiledHSK(mapped)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def load() -> CompiledHSK:
+    """Return the compiled data, (re)building the artifact if needed.
+
+    If the data directory isn't writable, compiles into memory instead.
+    """
+    compiled = open_compiled()
+    if compiled is not None:
+        return compiled
+    try:
+        build()
+    except OSError:
+        return CompiledHSK(compile_data())
+    return open_compiled() or CompiledHSK(compile_data())
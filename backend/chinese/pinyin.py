@@ -1,39 +1,107 @@
-from pypinyin import pinyin, Style
+"""Pinyin annotation with memoization.
 
+Text is split with pypinyin's own segmenter (Han runs, then phrase-level
+mmseg), and each Han word's readings are cached, so repeated words cost a
+dict lookup instead of a converter pass. Whole texts are cached too, since
+the same sentences and card words are annotated over and over. One pass
+produces both the per-character pairs and the joined pinyin string.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+# Joins texts for annotate_many; pypinyin treats it as a non-Han boundary
+_SEPARATOR = "\x1f"
+
+
+class Annotation(NamedTuple):
+    pairs: tuple[tuple[str, str], ...]  # (character, pinyin); "" if none
+    pinyin: str  # space-separated pinyin of the Chinese characters
+
+
+@lru_cache(maxsize=None)
+def _pypinyin():
+    """Import pypinyin on first use; loading its phrase dictionary is slow."""
+    from pypinyin import Style
+    from pypinyin.constants import RE_HANS
+    from pypinyin.core import Pinyin
+
+    return Pinyin(), Style.TONE, RE_HANS
 
-def annotate_pinyin(text: str) -> list[tuple[str, str]]:
-    """Return (character, pinyin) pairs. Non-Chinese chars get empty pinyin.
 
-    pypinyin groups consecutive non-Chinese characters into a single reading,
-    so we match readings back to the original text by position.
+@lru_cache(maxsize=50_000)
+def _word_pairs(word: str) -> tuple[tuple[str, str], ...]:
+    """(character, pinyin) pairs for one Han segment.
+
+    pypinyin groups consecutive characters it has no reading for into a
+    single item, so readings are matched back to the word by position.
     """
-    readings = pinyin(text, style=Style.TONE, heteronym=False)
+    engine, tone, _ = _pypinyin()
+    readings = engine.pinyin(word, style=tone, heteronym=False)
     result: list[tuple[str, str]] = []
     pos = 0
     for reading in readings:
         segment = reading[0]
-        if text[pos : pos + len(segment)] == segment:
-            # Non-Chinese group — split back into individual characters
+        if word[pos : pos + len(segment)] == segment:
+            # No reading — split back into individual characters
             for char in segment:
                 result.append((char, ""))
             pos += len(segment)
         else:
-            # Chinese character — segment is its pinyin
-            result.append((text[pos], segment))
+            result.append((word[pos], segment))
             pos += 1
-    return result
+    return tuple(result)
+
+
+def _pairs(text: str) -> list[tuple[str, str]]:
+    engine, _, re_hans = _pypinyin()
+    pairs: list[tuple[str, str]] = []
+    for word in engine.seg(text):
+        if re_hans.match(word):
+            pairs.extend(_word_pairs(word))
+        else:
+            pairs.extend((char, "") for char in word)
+    return pairs
+
+
+def _build(pairs) -> Annotation:
+    return Annotation(tuple(pairs), " ".join(p for _, p in pairs if p))
+
+
+@lru_cache(maxsize=4096)
+def annotate(text: str) -> Annotation:
+    """Annotate text in a single pass; results are cached per text."""
+    return _build(_pairs(text))
+
+
+def annotate_many(texts: list[str]) -> list[Annotation]:
+    """Annotate a batch of texts, in order.
+
+    Uncached texts are joined and segmented in one pass, then split back.
+    """
+    pending = list(dict.fromkeys(
+        t for t in texts if t and _SEPARATOR not in t
+    ))
+    done: dict[str, Annotation] = {}
+    if pending:
+        joined = _pairs(_SEPARATOR.join(pending))
+        start = 0
+        for text in pending:
+            done[text] = _build(joined[start : start + len(text)])
+            start += len(text) + 1  # skip the separator
+    return [done[t] if t in done else annotate(t) for t in texts]
+
+
+def warm_up() -> None:
+    """Load pypinyin ahead of the first annotation."""
+    _pypinyin()
+
+
+def annotate_pinyin(text: str) -> list[tuple[str, str]]:
+    """Return (character, pinyin) pairs. Non-Chinese chars get empty pinyin."""
+    return list(annotate(text).pairs)
 
 
 def pinyin_for_text(text: str) -> str:
     """Return space-separated pinyin for all Chinese characters in text."""
-    readings = pinyin(text, style=Style.TONE, heteronym=False)
-    parts: list[str] = []
-    pos = 0
-    for reading in readings:
-        segment = reading[0]
-        if text[pos : pos + len(segment)] == segment:
-            pos += len(segment)
-        else:
-            parts.append(segment)
-            pos += 1
-    return " ".join(parts)
+    return annotate(text).pinyin
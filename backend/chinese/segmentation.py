@@ -1,19 +1,61 @@
+from functools import lru_cache
+import os
+from pathlib import Path
+
 import jieba
 
+from backend.processes import process_pool
+
+# Batches at least this large are segmented in worker processes; below it
+# the per-process startup (loading jieba's dictionary) costs more than it saves
+_PARALLEL_MIN = 50_000
+_MAX_WORKERS = 4
+
+
+def initialize(cache_dir: Path) -> None:
+    """Load jieba's dictionary, caching the built prefix dict in cache_dir.
+
+    The cache file name carries the jieba version, so an upgrade rebuilds
+    it; jieba itself rebuilds it if a custom dictionary is newer.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    jieba.dt.tmp_dir = str(cache_dir)
+    jieba.dt.cache_file = f"jieba-{jieba.__version__}.cache"
+    jieba.initialize()
+
+
+@lru_cache(maxsize=4096)
+def _segment(text: str) -> tuple[str, ...]:
+    return tuple(jieba.cut(text, cut_all=False))
+
 
 def segment_text(text: str) -> list[str]:
     """Return jieba word list; concatenation == original text."""
-    return list(jieba.cut(text, cut_all=False))
+    return list(_segment(text))
 
 
-def segment_to_word_boundaries(text: str) -> list[tuple[int, int, str]]:
-    """Return (start, end, word) tuples with char offsets into the text.
+def _segment_chunk(texts: list[str]) -> list[list[str]]:
+    # Runs in a worker process
+    return [list(jieba.cut(text, cut_all=False)) for text in texts]
 
-    Offsets index into the character-level PinyinPair array stored with each
-    message, so the frontend can do `pairs.slice(start, end)` to get the
-    pairs for one word.
+
+def segment_many(texts: list[str]) -> list[list[str]]:
+    """Segment a batch of texts, in order.
+
+    Small batches go through the cache; large ones are split across a
+    process pool (jieba holds the GIL, so threads don't help).
     """
-    words = segment_text(text)
+    workers = min(_MAX_WORKERS, os.cpu_count() or 1)
+    if len(texts) < _PARALLEL_MIN or workers < 2:
+        return [segment_text(text) for text in texts]
+    size = -(-len(texts) // workers)
+    chunks = [texts[i : i + size] for i in range(0, len(texts), size)]
+    with process_pool(workers) as pool:
+        return [words for chunk in pool.map(_segment_chunk, chunks) for words in chunk]
+
+
+def word_boundaries(words: list[str]) -> list[tuple[int, int, str]]:
+    """Return (start, end, word) tuples for consecutive words."""
     boundaries: list[tuple[int, int, str]] = []
     pos = 0
     for word in words:
@@ -21,3 +63,13 @@ def segment_to_word_boundaries(text: str) -> list[tuple[int, int, str]]:
         boundaries.append((pos, end, word))
         pos = end
     return boundaries
+
+
+def segment_to_word_boundaries(text: str) -> list[tuple[int, int, str]]:
+    """Return (start, end, word) tuples with char offsets into the text.
+
+    Offsets index into the character-level PinyinPair array stored with each
+    message, so the frontend can do `pairs.slice(start, end)` to get the
+    pairs for one word.
+    """
+    return word_boundaries(segment_text(text))
@@ -11,8 +11,42 @@ CHAT_PROVIDER: str = os.getenv("CHAT_PROVIDER", "gemini")
 CHAT_MODEL: str = os.getenv("CHAT_MODEL", "gemini-2.5-flash")
 TRILINGO_TOKEN: str = os.getenv("TRILINGO_TOKEN", "")
 DB_PATH: str = os.getenv("DB_PATH", str(_project_root / "trilingo.db"))
+DB_POOL_READERS: int = int(os.getenv("DB_POOL_READERS", "4"))
+# Local caches that survive restarts (e.g. jieba's prefix dictionary)
+DATA_DIR: Path = Path(os.getenv("DATA_DIR", str(_project_root / "data")))
+# Print how long each startup phase takes
+PROFILE_STARTUP: bool = os.getenv("PROFILE_STARTUP", "0") == "1"
 
 # Asset generation
 ASSETS_DIR: Path = Path(__file__).resolve().parent / "assets"
 TTS_VOICE: str = os.getenv("TTS_VOICE", "zh-CN-XiaoxiaoNeural")
 TTS_RATE: str = os.getenv("TTS_RATE", "-15%")
+# Unreferenced TTS audio is kept this long in case the word comes back
+TTS_UNUSED_RETENTION_DAYS: float = float(os.getenv("TTS_UNUSED_RETENTION_DAYS", "7"))
+# Asset job queue: worker pool size, per-kind concurrency, retry limit
+ASSET_WORKERS: int = int(os.getenv("ASSET_WORKERS", "4"))
+ASSET_AUDIO_CONCURRENCY: int = int(os.getenv("ASSET_AUDIO_CONCURRENCY", "3"))
+ASSET_IMAGE_CONCURRENCY: int = int(os.getenv("ASSET_IMAGE_CONCURRENCY", "2"))
+ASSET_JOB_MAX_ATTEMPTS: int = int(os.getenv("ASSET_JOB_MAX_ATTEMPTS", "5"))
+# Image downloads: concurrent requests per host, largest body accepted
+HTTP_PER_HOST_LIMIT: int = int(os.getenv("HTTP_PER_HOST_LIMIT", "4"))
+IMAGE_MAX_BYTES: int = int(os.getenv("IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+# Image normalization: longest side of the display image and thumbnail (px)
+IMAGE_DISPLAY_MAX: int = int(os.getenv("IMAGE_DISPLAY_MAX", "800"))
+IMAGE_THUMB_MAX: int = int(os.getenv("IMAGE_THUMB_MAX", "320"))
+IMAGE_WEBP_QUALITY: int = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+IMAGE_PROCESS_WORKERS: int = int(os.getenv("IMAGE_PROCESS_WORKERS", "2"))
+
+# Mad Libs prefetch pool
+MADLIBS_POOL_TARGET: int = int(os.getenv("MADLIBS_POOL_TARGET", "5"))
+MADLIBS_POOL_CONCURRENCY: int = int(os.getenv("MADLIBS_POOL_CONCURRENCY", "2"))
+
+# Chat context window: recent turns sent verbatim, older ones summarized
+CHAT_CONTEXT_TURNS: int = int(os.getenv("CHAT_CONTEXT_TURNS", "10"))
+CHAT_SUMMARY_EVERY: int = int(os.getenv("CHAT_SUMMARY_EVERY", "10"))
+CHAT_CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "3000"))
+
+# LLM response cache
+LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_TTL_DAYS: float = float(os.getenv("LLM_CACHE_TTL_DAYS", "30"))
+LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
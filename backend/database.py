@@ -1,11 +1,13 @@
+import asyncio
 from contextlib import asynccontextmanager
 import json
 import logging
-from pathlib import Path
+import sqlite3
+import time
 
 import aiosqlite
 
-from backend.config import DB_PATH, ASSETS_DIR, TTS_VOICE, TTS_RATE
+from backend.config import DB_PATH, DB_POOL_READERS
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +51,16 @@ CREATE TABLE IF NOT EXISTS flashcard_attempts (
     attempted_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
+-- Rolling per-card quiz history, maintained by submit_answer.
+-- Bit i of recent_mask is the result of the (i+1)-th most recent attempt.
+CREATE TABLE IF NOT EXISTS flashcard_stats (
+    card_id        INTEGER PRIMARY KEY REFERENCES flashcards(id),
+    recent_mask    INTEGER NOT NULL DEFAULT 0,
+    recent_count   INTEGER NOT NULL DEFAULT 0,
+    total_attempts INTEGER NOT NULL DEFAULT 0,
+    last_seen      TEXT
+);
+
 CREATE TABLE IF NOT EXISTS game_sentences (
     id          INTEGER PRIMARY KEY AUTOINCREMENT,
     hsk_level   INTEGER NOT NULL,
@@ -65,66 +77,434 @@ CREATE TABLE IF NOT EXISTS dedede_questions (
     english     TEXT NOT NULL,
     pinyin      TEXT NOT NULL
 );
+
+CREATE TABLE IF NOT EXISTS schema_version (
+    version     INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at  TEXT NOT NULL DEFAULT (datetime('now'))
+);
 """
 
-_DEDEDE_DATA = Path(__file__).parent / "chinese" / "hsk" / "data" / "dedede.json"
+FLASHCARD_STATS_WINDOW = 10  # attempts tracked in flashcard_stats.recent_mask
 
 
 async def init_db() -> None:
     async with aiosqlite.connect(DB_PATH) as db:
+        # WAL is persistent, so setting it once here covers every later connection
+        await db.execute("PRAGMA journal_mode=WAL")
         await db.executescript(_SCHEMA)
         await db.commit()
 
         # Seed dedede questions if the table is empty
         row = await db.execute_fetchall("SELECT COUNT(*) FROM dedede_questions")
         if row[0][0] == 0:
-            questions = json.loads(_DEDEDE_DATA.read_text(encoding="utf-8"))
+            from backend.chinese.hsk import get_dedede
+
             await db.executemany(
                 "INSERT INTO dedede_questions (sentence, answer, english, pinyin) "
                 "VALUES (?, ?, ?, ?)",
-                [(q["sentence"], q["answer"], q["english"], q["pinyin"]) for q in questions],
+                [(q.sentence, q.answer, q.english, q.pinyin) for q in get_dedede()],
             )
             await db.commit()
 
+        await _run_migrations(db)
+
     # Generate dedede audio files if missing
     await _ensure_dedede_audio()
 
 
-_DEDEDE_AUDIO = {
-    "的": "audio/dedede_de1.mp3",
-    "得": "audio/dedede_de2.mp3",
-    "地": "audio/dedede_de3.mp3",
-}
+async def _rebuild_flashcard_stats(db) -> None:
+    """Recompute flashcard_stats from the raw flashcard_attempts history."""
+    rows = await db.execute_fetchall(
+        "SELECT card_id, correct, rn FROM ("
+        "    SELECT card_id, correct, "
+        "           ROW_NUMBER() OVER (PARTITION BY card_id ORDER BY id DESC) AS rn "
+        "    FROM flashcard_attempts"
+        ") WHERE rn <= ?",
+        (FLASHCARD_STATS_WINDOW,),
+    )
+    if not rows:
+        return
+    masks: dict[int, list[int]] = {}
+    for card_id, correct, rn in rows:
+        entry = masks.setdefault(card_id, [0, 0])
+        entry[0] |= correct << (rn - 1)
+        entry[1] += 1
+
+    totals = await db.execute_fetchall(
+        "SELECT card_id, COUNT(*), MAX(attempted_at) "
+        "FROM flashcard_attempts GROUP BY card_id"
+    )
+    await db.executemany(
+        "INSERT OR REPLACE INTO flashcard_stats "
+        "(card_id, recent_mask, recent_count, total_attempts, last_seen) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (card_id, masks[card_id][0], masks[card_id][1], total, last_seen)
+            for card_id, total, last_seen in totals
+        ],
+    )
+    logger.info("Rebuilt flashcard_stats for %d cards", len(totals))
+
+
+# ---------------------------------------------------------------------------
+# Migrations
+# ---------------------------------------------------------------------------
+#
+# Each step runs once, in order, and is recorded in schema_version. A step
+# is either a SQL script or an async callable taking the connection. A step
+# and its schema_version row commit together, so a crash mid-step leaves
+# nothing half-applied; callables must not commit (or use executescript,
+# which does). Append new steps to the end; never edit or reorder ones that
+# have shipped.
+
+
+def _statements(script: str) -> list[str]:
+    """Split a SQL script into its statements."""
+    statements, current = [], ""
+    for part in script.split(";"):
+        current += part + ";"
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    if current.strip(" \n;"):
+        statements.append(current.strip())
+    return statements
+
+_HOT_PATH_INDEXES = """\
+CREATE INDEX IF NOT EXISTS idx_flashcard_attempts_card
+    ON flashcard_attempts(card_id, id);
+CREATE INDEX IF NOT EXISTS idx_flashcards_active
+    ON flashcards(id, audio_path) WHERE active = 1;
+CREATE INDEX IF NOT EXISTS idx_flashcards_missing_audio
+    ON flashcards(id) WHERE audio_path IS NULL;
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session
+    ON chat_messages(session_id, id);
+CREATE INDEX IF NOT EXISTS idx_game_sentences_level
+    ON game_sentences(hsk_level, id);
+"""
+
+
+async def _unique_chinese_index(db) -> None:
+    """Enforce one card per Chinese word, unless legacy duplicates exist."""
+    dupes = await db.execute_fetchall(
+        "SELECT chinese FROM flashcards GROUP BY chinese HAVING COUNT(*) > 1"
+    )
+    if dupes:
+        logger.warning(
+            "Found %d duplicated flashcard words; creating a non-unique index. "
+            "Remove the duplicates and drop idx_flashcards_chinese to enforce it.",
+            len(dupes),
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_flashcards_chinese ON flashcards(chinese)"
+        )
+    else:
+        await db.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_flashcards_chinese "
+            "ON flashcards(chinese)"
+        )
+
+
+async def _compact_chat_pinyin(db) -> None:
+    """Move chat pinyin from JSON to interned syllable codes.
+
+    See services/pinyin_store.py for the encoding. Rows whose JSON doesn't
+    line up with their content are left as JSON, which is still read.
+    """
+    from backend.services import pinyin_store
+
+    for statement in _statements("""\
+CREATE TABLE IF NOT EXISTS pinyin_syllables (
+    id        INTEGER PRIMARY KEY,
+    syllable  TEXT NOT NULL UNIQUE
+);
+INSERT OR IGNORE INTO pinyin_syllables (id, syllable) VALUES (0, '');
+ALTER TABLE chat_messages ADD COLUMN pinyin_codes BLOB;
+"""):
+        await db.execute(statement)
+    await pinyin_store.load(db)
+    last_id, converted = 0, 0
+    while True:
+        rows = await db.execute_fetchall(
+            "SELECT id, content, pinyin FROM chat_messages "
+            "WHERE pinyin IS NOT NULL AND id > ? ORDER BY id LIMIT 1000",
+            (last_id,),
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        updates = []
+        for message_id, content, raw in rows:
+            pairs = [(p["char"], p["pinyin"]) for p in json.loads(raw)]
+            if "".join(c for c, _ in pairs) == content:
+                updates.append((message_id, pairs))
+        await pinyin_store.intern(db, (p for _, pairs in updates for _, p in pairs))
+        await db.executemany(
+            "UPDATE chat_messages SET pinyin_codes = ?, pinyin = NULL WHERE id = ?",
+            [(pinyin_store.pack(pairs), message_id) for message_id, pairs in updates],
+        )
+        converted += len(updates)
+    if converted:
+        logger.info("Compacted pinyin for %d chat messages", converted)
+
+
+_MIGRATIONS: list[tuple[int, str, object]] = [
+    (1, "hot-path secondary indexes", _HOT_PATH_INDEXES),
+    (2, "unique index on flashcards.chinese", _unique_chinese_index),
+    (3, "rebuild flashcard_stats from attempts", _rebuild_flashcard_stats),
+    (4, "precomputed segments and pinyin on game_sentences", """\
+ALTER TABLE game_sentences ADD COLUMN segments TEXT;
+ALTER TABLE game_sentences ADD COLUMN pinyin TEXT;
+"""),
+    (5, "Mad Libs prefetch pool served flag", """\
+ALTER TABLE game_sentences ADD COLUMN served INTEGER NOT NULL DEFAULT 1;
+CREATE INDEX IF NOT EXISTS idx_game_sentences_fresh
+    ON game_sentences(hsk_level, id) WHERE served = 0;
+"""),
+    (6, "LLM response cache", """\
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key         TEXT PRIMARY KEY,
+    response    TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used);
+"""),
+    (7, "rolling chat session summaries", """\
+ALTER TABLE chat_sessions ADD COLUMN summary TEXT;
+ALTER TABLE chat_sessions ADD COLUMN summary_upto INTEGER NOT NULL DEFAULT 0;
+"""),
+    (8, "compact chat pinyin encoding", _compact_chat_pinyin),
+    (9, "persisted chat message segmentation",
+     "ALTER TABLE chat_messages ADD COLUMN segments TEXT;"),
+    # Used to run on every boot; writes lowercase English since then
+    (10, "lowercase flashcard English",
+     "UPDATE flashcards SET english = LOWER(english) WHERE english != LOWER(english);"),
+    (11, "durable asset generation queue", """\
+CREATE TABLE IF NOT EXISTS asset_jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    card_id     INTEGER NOT NULL,
+    kind        TEXT NOT NULL CHECK(kind IN ('audio', 'image')),
+    status      TEXT NOT NULL DEFAULT 'pending'
+                CHECK(status IN ('pending', 'running', 'done', 'failed')),
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    run_after   REAL NOT NULL DEFAULT 0,
+    last_error  TEXT,
+    created_at  REAL NOT NULL,
+    finished_at REAL
+);
+-- At most one queued job per card and kind; enqueueing again is a no-op
+CREATE UNIQUE INDEX IF NOT EXISTS idx_asset_jobs_queued
+    ON asset_jobs(card_id, kind) WHERE status IN ('pending', 'running');
+CREATE INDEX IF NOT EXISTS idx_asset_jobs_status ON asset_jobs(status, run_after);
+"""),
+    (12, "content-addressed TTS audio store", """\
+CREATE TABLE IF NOT EXISTS audio_blobs (
+    hash        TEXT PRIMARY KEY,  -- sha256 of (voice, rate, text)
+    path        TEXT NOT NULL,
+    refcount    INTEGER NOT NULL DEFAULT 0,  -- flashcards.audio_hash references
+    pinned      INTEGER NOT NULL DEFAULT 0,  -- never collected (dedede clips)
+    created_at  REAL NOT NULL,
+    released_at REAL  -- when refcount last dropped to 0
+);
+ALTER TABLE flashcards ADD COLUMN audio_hash TEXT;
+"""),
+    (13, "normalized flashcard image variants", """\
+ALTER TABLE flashcards ADD COLUMN image_thumb_path TEXT;
+ALTER TABLE flashcards ADD COLUMN image_width INTEGER;
+ALTER TABLE flashcards ADD COLUMN image_height INTEGER;
+ALTER TABLE flashcards ADD COLUMN image_bytes INTEGER;
+ALTER TABLE flashcards ADD COLUMN image_thumb_bytes INTEGER;
+"""),
+    (14, "asset job priorities", """\
+ALTER TABLE asset_jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0;
+DROP INDEX IF EXISTS idx_asset_jobs_status;
+CREATE INDEX IF NOT EXISTS idx_asset_jobs_ready
+    ON asset_jobs(status, priority DESC, id);
+"""),
+    (15, "index for images awaiting normalization", """\
+CREATE INDEX IF NOT EXISTS idx_flashcards_unnormalized_image
+    ON flashcards(id) WHERE image_path IS NOT NULL AND image_bytes IS NULL;
+"""),
+]
+
+
+async def _run_migrations(db) -> None:
+    rows = await db.execute_fetchall("SELECT MAX(version) FROM schema_version")
+    current = rows[0][0] or 0
+    for version, description, step in _MIGRATIONS:
+        if version <= current:
+            continue
+        await db.execute("BEGIN")
+        try:
+            if isinstance(step, str):
+                for statement in _statements(step):
+                    await db.execute(statement)
+            else:
+                await step(db)
+            await db.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description),
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        logger.info("Applied migration %d: %s", version, description)
+
+
+_DEDEDE_ANSWERS = ("的", "得", "地")
 
 
 async def _ensure_dedede_audio() -> None:
-    """Generate TTS audio for 的/得/地 if the files don't exist."""
-    audio_dir = ASSETS_DIR / "audio"
-    audio_dir.mkdir(parents=True, exist_ok=True)
-    missing = [(word, path) for word, path in _DEDEDE_AUDIO.items()
-               if not (ASSETS_DIR / path).exists()]
-    if not missing:
-        return
+    """Make sure TTS audio for 的/得/地 exists in the audio store."""
+    from backend.services import tts_store
+
     try:
-        import edge_tts
-        for word, rel_path in missing:
-            out = ASSETS_DIR / rel_path
-            comm = edge_tts.Communicate(text=word, voice=TTS_VOICE, rate=TTS_RATE)
-            await comm.save(str(out))
-            logger.info("Generated dedede audio: %s", rel_path)
+        await tts_store.pin(_DEDEDE_ANSWERS)
     except Exception:
         logger.warning("Failed to generate dedede audio", exc_info=True)
 
 
 def get_dedede_audio_path(answer: str) -> str | None:
     """Return the asset-relative audio path for a dedede answer."""
-    return _DEDEDE_AUDIO.get(answer)
+    if answer not in _DEDEDE_ANSWERS:
+        return None
+    from backend.services import tts_store
 
+    return tts_store.relative_path(tts_store.audio_key(answer))
 
-@asynccontextmanager
-async def get_db():
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-16000",    # ~16 MB page cache
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+async def _connect() -> aiosqlite.Connection:
     db = await aiosqlite.connect(DB_PATH)
     db.row_factory = aiosqlite.Row
+    for pragma in _PRAGMAS:
+        await db.execute(pragma)
+    return db
+
+
+class _ConnectionPool:
+    """Long-lived aiosqlite connections: one serialized writer, N readers.
+
+    SQLite allows a single writer at a time, so the writer connection is
+    guarded by a lock; readers run concurrently under WAL.
+    """
+
+    def __init__(self, readers: int) -> None:
+        self._reader_count = max(1, readers)
+        self._writer: aiosqlite.Connection | None = None
+        self._writer_lock = asyncio.Lock()
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._all: list[aiosqlite.Connection] = []
+        self.stats = {
+            "acquired": 0,
+            "waits": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    async def open(self) -> None:
+        self._writer = await _connect()
+        self._all.append(self._writer)
+        for _ in range(self._reader_count):
+            conn = await _connect()
+            self._all.append(conn)
+            self._readers.put_nowait(conn)
+
+    async def close(self) -> None:
+        for conn in self._all:
+            await conn.close()
+        self._all.clear()
+        self._writer = None
+
+    def _record_wait(self, started: float) -> None:
+        waited = time.perf_counter() - started
+        self.stats["acquired"] += 1
+        if waited > 0.001:
+            self.stats["waits"] += 1
+        self.stats["wait_seconds_total"] += waited
+        self.stats["wait_seconds_max"] = max(self.stats["wait_seconds_max"], waited)
+
+    @asynccontextmanager
+    async def acquire(self, readonly: bool):
+        started = time.perf_counter()
+        if readonly:
+            conn = await self._readers.get()
+            self._record_wait(started)
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    await conn.rollback()
+                self._readers.put_nowait(conn)
+        else:
+            async with self._writer_lock:
+                self._record_wait(started)
+                try:
+                    yield self._writer
+                finally:
+                    # Never hand a half-finished transaction to the next caller
+                    if self._writer.in_transaction:
+                        await self._writer.rollback()
+
+
+_pool: _ConnectionPool | None = None
+
+
+async def open_pool() -> None:
+    """Open the shared connection pool (called from the app lifespan)."""
+    global _pool
+    pool = _ConnectionPool(DB_POOL_READERS)
+    await pool.open()
+    _pool = pool
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+def get_pool_stats() -> dict:
+    """Return connection pool wait-time metrics."""
+    if _pool is None:
+        return {"open": False}
+    stats = dict(_pool.stats)
+    acquired = stats["acquired"] or 1
+    stats["wait_seconds_avg"] = stats["wait_seconds_total"] / acquired
+    stats["readers_idle"] = _pool._readers.qsize()
+    stats["writer_busy"] = _pool._writer_lock.locked()
+    stats["open"] = True
+    return stats
+
+
+@asynccontextmanager
+async def get_db(readonly: bool = False):
+    """Yield a pooled connection.
+
+    Pass readonly=True for pure reads so they don't queue behind writers.
+    Outside the app lifespan (no pool) a one-off connection is opened.
+    """
+    if _pool is not None:
+        async with _pool.acquire(readonly) as db:
+            yield db
+        return
+    db = await _connect()
     try:
         yield db
     finally:
@@ -1,4 +1,10 @@
-from contextlib import asynccontextmanager
+import time
+
+_IMPORT_START = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+import logging
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,37 +12,128 @@ from fastapi.security import APIKeyHeader
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import JSONResponse
 
-from backend.config import ASSETS_DIR, TRILINGO_TOKEN
-from backend.database import init_db
+from backend.chinese import hsk, pinyin, segmentation
+from backend.config import ASSETS_DIR, DATA_DIR, PROFILE_STARTUP, TRILINGO_TOKEN
+from backend.database import close_pool, get_pool_stats, init_db, open_pool
+from backend.providers.cache import get_cache_stats
 from backend.routers import chat, flashcards, games
-from backend.services.asset_worker import backfill_assets
+from backend.services import (
+    asset_queue,
+    asset_worker,
+    chat_context,
+    image_processing,
+    madlibs_pool,
+    tts_store,
+)
+from backend.services.sentence_bank import backfill_nlp
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+logger = logging.getLogger(__name__)
 
 PUBLIC_PATHS = {"/api/health", "/docs", "/openapi.json", "/redoc"}
 
 _token_scheme = APIKeyHeader(name="x-trilingo-token", auto_error=False)
 
 
+_startup_phases: list[tuple[str, float]] = [("imports", _IMPORT_SECONDS)]
+
+
+@contextmanager
+def _phase(name: str):
+    """Time one startup phase for PROFILE_STARTUP."""
+    start = time.perf_counter()
+    yield
+    _startup_phases.append((name, time.perf_counter() - start))
+
+
+def _warm_up_nlp() -> None:
+    start = time.perf_counter()
+    segmentation.initialize(DATA_DIR)
+    pinyin.warm_up()
+    hsk.load_all()
+    if PROFILE_STARTUP:
+        print(f"  NLP warm-up (background)     {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+
+def _log_warm_up_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        # Not fatal: each library still loads on first use
+        logger.error("NLP warm-up failed", exc_info=task.exception())
+
+
+async def _start_madlibs_pool(warmup: asyncio.Task) -> None:
+    # The pool segments every sentence it stores; starting it before jieba
+    # has loaded would block the event loop on jieba's init lock
+    await asyncio.wait([warmup])
+    madlibs_pool.start()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
-    # Preload jieba dictionary to avoid cold-start delay
-    import jieba
-    jieba.initialize()
-    print("jieba dictionary loaded")
-    # Normalize existing English to lowercase
-    from backend.database import get_db
-    async with get_db() as db:
-        await db.execute("UPDATE flashcards SET english = LOWER(english) WHERE english != LOWER(english)")
-        await db.commit()
-    # Backfill assets for cards missing audio/images
-    queued = await backfill_assets(batch_size=5)
+    # Load the jieba dictionary (cached in DATA_DIR after the first run),
+    # pypinyin's phrase tables and the HSK vocab index in the background; a request that needs them
+    # before they're ready waits on jieba's own init lock / the import
+    app.state.nlp_warmup = asyncio.create_task(asyncio.to_thread(_warm_up_nlp))
+    app.state.nlp_warmup.add_done_callback(_log_warm_up_failure)
+    with _phase("database"):
+        await init_db()
+    with _phase("connection pool"):
+        await open_pool()
+    # Queue assets for cards missing audio/images, then start the workers
+    # (jobs left over from a previous run resume too)
+    with _phase("asset backfill scan"):
+        await tts_store.collect()
+        queued = await asset_queue.backfill_assets()
+        await asset_queue.start()
     if queued:
-        print(f"Queued asset generation for {queued} cards")
+        print(f"Queued {queued} asset generation jobs")
+    # Precompute segmentation/pinyin for older game sentences
+    app.state.nlp_backfill = asyncio.create_task(backfill_nlp())
+    # Keep fresh Mad Libs sentences generated ahead of demand
+    app.state.madlibs_start = asyncio.create_task(
+        _start_madlibs_pool(app.state.nlp_warmup)
+    )
     if TRILINGO_TOKEN:
         print(f"Auth enabled (token: {TRILINGO_TOKEN[:4]}...)")
     else:
         print("Auth DISABLED — no TRILINGO_TOKEN set")
-    yield
+    if PROFILE_STARTUP:
+        total = sum(seconds for _, seconds in _startup_phases)
+        for name, seconds in _startup_phases:
+            print(f"  {name:<28} {seconds * 1000:7.1f} ms")
+        print(f"  {'total':<28} {total * 1000:7.1f} ms")
+    try:
+        yield
+    finally:
+        await _shutdown(app)
+
+
+async def _shutdown(app: FastAPI) -> None:
+    """Run each teardown step even if an earlier one fails.
+
+    The pool is closed last no matter what: its aiosqlite threads aren't
+    daemons, so leaving them open keeps the process alive.
+    """
+    steps = (
+        ("NLP backfill", app.state.nlp_backfill.cancel),
+        ("Mad Libs pool start", app.state.madlibs_start.cancel),
+        ("asset queue", asset_queue.stop),
+        ("Mad Libs pool", madlibs_pool.stop),
+        ("chat summaries", chat_context.stop),
+        ("HTTP client", asset_worker.close_http),
+        ("image processing", image_processing.shutdown),
+    )
+    try:
+        for name, step in steps:
+            try:
+                result = step()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception:
+                logger.exception("Shutdown step failed: %s", name)
+    finally:
+        await close_pool()
 
 
 app = FastAPI(
@@ -80,6 +177,15 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/api/metrics")
+async def metrics():
+    return {
+        "db_pool": get_pool_stats(),
+        "llm_cache": get_cache_stats(),
+        "tts_cache": tts_store.get_stats(),
+    }
+
+
 @app.get("/api/auth/check")
 async def auth_check():
     return {"ok": True}
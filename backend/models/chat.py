@@ -26,6 +26,17 @@ class ChatMessageResponse(BaseModel):
     created_at: str
 
 
+class ChatMessagePage(BaseModel):
+    """One page of a session's messages, oldest first."""
+    messages: list[ChatMessageResponse]
+    has_more: bool  # older messages exist before this page
+
+
+class MessagePinyin(BaseModel):
+    message_id: int
+    pinyin: list[PinyinPair] | None = None
+
+
 class ChatSessionResponse(BaseModel):
     id: int
     created_at: str
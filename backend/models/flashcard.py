@@ -28,6 +28,9 @@ class FlashcardResponse(BaseModel):
     active: bool
     created_at: str
     source: str
+    image_thumb_path: str | None = None  # small variant for lists and quizzes
+    image_width: int | None = None  # of the display image at image_path
+    image_height: int | None = None
 
 
 class QuizQuestion(BaseModel):
@@ -38,6 +41,7 @@ class QuizQuestion(BaseModel):
     options: list[str]  # 4 choices (one correct)
     audio_path: str | None = None
     image_path: str | None = None
+    image_thumb_path: str | None = None
 
 
 class QuizAnswerRequest(BaseModel):
@@ -64,3 +68,32 @@ class FlashcardFromWordRequest(BaseModel):
 class FlashcardFromWordResponse(BaseModel):
     card: FlashcardResponse
     duplicate: bool = False
+
+
+class FlashcardFromWordsRequest(BaseModel):
+    words: list[str]
+    source: str = "chat"
+
+
+class ExampleSentencesRequest(BaseModel):
+    card_ids: list[int]
+
+
+class AssetQueueKind(BaseModel):
+    pending: int
+    running: int
+    failed: int
+    limit: int  # max jobs of this kind running at once
+
+
+class AssetQueueStatus(BaseModel):
+    depth: int  # pending + running jobs
+    kinds: dict[str, AssetQueueKind]
+    workers: int
+    paused: bool
+    backlog_total: int  # jobs created since the oldest one still queued
+    backlog_completed: int  # of those, how many are done or failed
+    eta_seconds: float | None = None  # at the current rate; None if idle or paused
+    completed_last_minute: int
+    completed_last_hour: int
+    throughput_per_minute: float  # averaged over the last 10 minutes
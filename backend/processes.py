@@ -0,0 +1,14 @@
+"""Process pools for CPU-bound work (jieba segmentation, Pillow)."""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Return a process pool that is safe to start from the server.
+
+    Workers are spawned, not forked: the server process runs threads
+    (aiosqlite, asyncio's executor), and a forked child can inherit a lock
+    one of them was holding.
+    """
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
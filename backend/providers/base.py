@@ -1,4 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 from pydantic import BaseModel
 
@@ -16,19 +18,67 @@ class ChatResponse(BaseModel):
 
 
 class ChatProvider(ABC):
+    """AI provider interface.
+
+    The `cache` keyword on each call is a hint for the response cache that
+    wraps providers (see providers/cache.py); pass cache=False when a fresh
+    generation is wanted. Providers themselves ignore it.
+
+    `context` on chat calls is extra background for the model (e.g. a
+    summary of earlier turns no longer sent verbatim); providers add it to
+    the system prompt.
+    """
+
+    model: str = ""
+    chat_temperature: float | None = None
+    text_temperature: float | None = None
+
     @abstractmethod
     async def chat(
         self,
         messages: list[dict[str, str]],
         system_prompt: str | None = None,
+        *,
+        cache: bool = True,
+        context: str | None = None,
     ) -> ChatResponse:
         """Send message history to the AI and get a structured response."""
         ...
 
-    async def generate_text(self, prompt: str) -> str:
+    async def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        system_prompt: str | None = None,
+        *,
+        context: str | None = None,
+    ) -> AsyncIterator[str | ChatResponse]:
+        """Stream a chat reply.
+
+        Yields pieces of the `response` text as they arrive, then the
+        complete ChatResponse as the last item. Streams are never cached.
+        The default yields the whole reply at once; override to stream.
+        """
+        resp = await self.chat(messages, system_prompt, cache=False, context=context)
+        yield resp.response
+        yield resp
+
+    async def generate_text(self, prompt: str, *, cache: bool = True) -> str:
         """Generate plain text from a prompt. Override for provider-specific impl."""
         resp = await self.chat(
             [{"role": "user", "content": prompt}],
             system_prompt="Reply with only the requested text, nothing else.",
+            cache=cache,
         )
         return resp.response
+
+    async def generate_batch(
+        self, prompts: list[str], *, cache: bool = True
+    ) -> list[str]:
+        """Generate one plain-text reply per prompt, in order.
+
+        The default makes one generate_text call per prompt. Override to
+        answer the whole batch in a single provider request.
+        """
+        return list(await asyncio.gather(
+            *(self.generate_text(p, cache=cache) for p in prompts)
+        ))
@@ -0,0 +1,189 @@
+"""Persistent response cache wrapped around a ChatProvider.
+
+Responses are stored in the llm_cache table keyed by a hash of
+(model, call kind, temperature, prompt/messages). Entries expire after
+LLM_CACHE_TTL_DAYS and the table is trimmed to LLM_CACHE_MAX_ENTRIES by
+least-recent use. Any call can bypass the cache with cache=False.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+
+from backend.config import LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_DAYS
+from backend.database import get_db
+from backend.providers.base import ChatProvider, ChatResponse
+
+logger = logging.getLogger(__name__)
+
+_TTL_SECONDS = LLM_CACHE_TTL_DAYS * 86400
+_EVICT_EVERY = 50  # stores between eviction passes
+
+_stats = {"hits": 0, "misses": 0, "bypassed": 0, "evicted": 0}
+_stores_since_evict = 0
+
+
+def get_cache_stats() -> dict:
+    """Return hit/miss counters for the LLM response cache."""
+    lookups = _stats["hits"] + _stats["misses"]
+    return {**_stats, "hit_rate": _stats["hits"] / lookups if lookups else 0.0}
+
+
+def _key(*parts) -> str:
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def _lookup(key: str) -> str | None:
+    return (await _lookup_many([key]))[0]
+
+
+async def _lookup_many(keys: list[str]) -> list[str | None]:
+    """Return the cached response for each key (None on a miss).
+
+    One read for all keys and one write refreshing the hits' last_used.
+    """
+    if not keys:
+        return []
+    placeholders = ", ".join("?" * len(keys))
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT key, response, created_at FROM llm_cache "
+            f"WHERE key IN ({placeholders})",
+            keys,
+        )
+    now = time.time()
+    found = {
+        key: response
+        for key, response, created_at in rows
+        if now - created_at <= _TTL_SECONDS
+    }
+    results = [found.get(key) for key in keys]
+    hits = sum(r is not None for r in results)
+    _stats["hits"] += hits
+    _stats["misses"] += len(keys) - hits
+    if found:
+        async with get_db() as db:
+            await db.executemany(
+                "UPDATE llm_cache SET last_used = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+            await db.commit()
+    return results
+
+
+async def _store(entries: list[tuple[str, str]]) -> None:
+    global _stores_since_evict
+    now = time.time()
+    async with get_db() as db:
+        await db.executemany(
+            "INSERT OR REPLACE INTO llm_cache (key, response, created_at, last_used) "
+            "VALUES (?, ?, ?, ?)",
+            [(key, response, now, now) for key, response in entries],
+        )
+        await db.commit()
+    _stores_since_evict += len(entries)
+    if _stores_since_evict >= _EVICT_EVERY:
+        _stores_since_evict = 0
+        await evict()
+
+
+async def evict() -> int:
+    """Drop expired entries and trim the cache to its size bound (LRU)."""
+    async with get_db() as db:
+        cursor = await db.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?",
+            (time.time() - _TTL_SECONDS,),
+        )
+        removed = cursor.rowcount
+        cursor = await db.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "    SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?"
+            ")",
+            (LLM_CACHE_MAX_ENTRIES,),
+        )
+        removed += cursor.rowcount
+        await db.commit()
+    _stats["evicted"] += removed
+    return removed
+
+
+class CachedChatProvider(ChatProvider):
+    """Caching decorator around another ChatProvider."""
+
+    def __init__(self, inner: ChatProvider) -> None:
+        self._inner = inner
+        self.model = inner.model
+        self.chat_temperature = inner.chat_temperature
+        self.text_temperature = inner.text_temperature
+
+    async def chat(
+        self,
+        messages: list[dict[str, str]],
+        system_prompt: str | None = None,
+        *,
+        cache: bool = True,
+        context: str | None = None,
+    ) -> ChatResponse:
+        if not cache:
+            _stats["bypassed"] += 1
+            return await self._inner.chat(
+                messages, system_prompt, cache=False, context=context
+            )
+        key = _key(
+            self.model, "chat", self.chat_temperature, system_prompt, context, messages
+        )
+        hit = await _lookup(key)
+        if hit is not None:
+            return ChatResponse.model_validate_json(hit)
+        resp = await self._inner.chat(
+            messages, system_prompt, cache=False, context=context
+        )
+        await _store([(key, resp.model_dump_json())])
+        return resp
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        system_prompt: str | None = None,
+        *,
+        context: str | None = None,
+    ) -> AsyncIterator[str | ChatResponse]:
+        _stats["bypassed"] += 1
+        async for item in self._inner.chat_stream(
+            messages, system_prompt, context=context
+        ):
+            yield item
+
+    async def generate_text(self, prompt: str, *, cache: bool = True) -> str:
+        if not cache:
+            _stats["bypassed"] += 1
+            return await self._inner.generate_text(prompt, cache=False)
+        key = _key(self.model, "text", self.text_temperature, prompt)
+        hit = await _lookup(key)
+        if hit is not None:
+            return hit
+        text = await self._inner.generate_text(prompt, cache=False)
+        await _store([(key, text)])
+        return text
+
+    async def generate_batch(
+        self, prompts: list[str], *, cache: bool = True
+    ) -> list[str]:
+        if not cache:
+            _stats["bypassed"] += len(prompts)
+            return await self._inner.generate_batch(prompts, cache=False)
+        # Batch items share keys with single generate_text calls
+        keys = [_key(self.model, "text", self.text_temperature, p) for p in prompts]
+        results = await _lookup_many(keys)
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            fresh = await self._inner.generate_batch(
+                [prompts[i] for i in missing], cache=False
+            )
+            for i, text in zip(missing, fresh):
+                results[i] = text
+            await _store([(keys[i], results[i]) for i in missing])
+        return results
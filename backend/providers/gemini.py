@@ -1,4 +1,6 @@
 import json
+import re
+from collections.abc import AsyncIterator
 
 from google import genai
 from google.genai import types
@@ -46,10 +48,92 @@ _RESPONSE_SCHEMA = types.Schema(
         ),
     },
     required=["response", "translation", "feedback", "emotion"],
+    # "response" first, so streaming can forward it before the rest arrives
+    property_ordering=["response", "translation", "feedback", "emotion"],
 )
 
+_JSON_ESCAPES = {
+    '"': '"', "\\": "\\", "/": "/",
+    "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t",
+}
+
+
+class _StringFieldReader:
+    """Incrementally decode one string field out of a streamed JSON object.
+
+    feed() takes raw JSON text as it arrives and returns whatever new part
+    of the field's value can be decoded so far.
+    """
+
+    def __init__(self, field: str) -> None:
+        self._start = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buf = ""
+        self._pos: int | None = None
+        self._done = False
+
+    def feed(self, text: str) -> str:
+        self._buf += text
+        if self._done:
+            return ""
+        if self._pos is None:
+            match = self._start.search(self._buf)
+            if not match:
+                return ""
+            self._pos = match.end()
+        buf, i, out = self._buf, self._pos, []
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self._done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            if i + 1 >= len(buf):
+                break  # escape split across chunks
+            if buf[i + 1] != "u":
+                out.append(_JSON_ESCAPES.get(buf[i + 1], buf[i + 1]))
+                i += 2
+                continue
+            if i + 6 > len(buf):
+                break
+            code = int(buf[i + 2 : i + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # Surrogate pair: wait for the low half
+                if i + 12 > len(buf):
+                    break
+                low = int(buf[i + 8 : i + 12], 16)
+                code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                i += 12
+            else:
+                i += 6
+            out.append(chr(code))
+        self._pos = i
+        return "".join(out)
+
+    @property
+    def text(self) -> str:
+        """All raw JSON received so far."""
+        return self._buf
+
+
+_BATCH_PROMPT = """\
+Complete each of the {count} numbered tasks below independently.
+Return a JSON array of exactly {count} strings, where item i is your full \
+reply to task i, formatted exactly as that task asks.
+
+{tasks}"""
+
+_BATCH_MAX = 50  # prompts per request; larger batches are split
+
 
 class GeminiChatProvider(ChatProvider):
+    model = CHAT_MODEL
+    chat_temperature = 0.7
+    text_temperature = 0.5
+
     def __init__(self) -> None:
         self._client = genai.Client(api_key=GEMINI_API_KEY)
 
@@ -57,7 +141,50 @@ class GeminiChatProvider(ChatProvider):
         self,
         messages: list[dict[str, str]],
         system_prompt: str | None = None,
+        *,
+        cache: bool = True,
+        context: str | None = None,
     ) -> ChatResponse:
+        try:
+            resp = await self._client.aio.models.generate_content(
+                model=self.model,
+                **self._chat_request(messages, system_prompt, context),
+            )
+        except genai.errors.ClientError as e:
+            if e.code == 429:
+                raise RateLimitError("AI rate limit exceeded") from e
+            raise
+        return self._parse_chat_reply(resp.text)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        system_prompt: str | None = None,
+        *,
+        context: str | None = None,
+    ) -> AsyncIterator[str | ChatResponse]:
+        reader = _StringFieldReader("response")
+        try:
+            stream = await self._client.aio.models.generate_content_stream(
+                model=self.model,
+                **self._chat_request(messages, system_prompt, context),
+            )
+            async for chunk in stream:
+                delta = reader.feed(chunk.text or "")
+                if delta:
+                    yield delta
+        except genai.errors.ClientError as e:
+            if e.code == 429:
+                raise RateLimitError("AI rate limit exceeded") from e
+            raise
+        yield self._parse_chat_reply(reader.text)
+
+    def _chat_request(
+        self,
+        messages: list[dict[str, str]],
+        system_prompt: str | None,
+        context: str | None,
+    ) -> dict:
         contents = [
             types.Content(
                 role="model" if m["role"] == "assistant" else m["role"],
@@ -65,26 +192,20 @@ class GeminiChatProvider(ChatProvider):
             )
             for m in messages
         ]
-
+        system_instruction = system_prompt or _SYSTEM_PROMPT
+        if context:
+            system_instruction += f"\n\nContext:\n{context}"
         config = types.GenerateContentConfig(
-            system_instruction=system_prompt or _SYSTEM_PROMPT,
+            system_instruction=system_instruction,
             response_mime_type="application/json",
             response_schema=_RESPONSE_SCHEMA,
-            temperature=0.7,
+            temperature=self.chat_temperature,
         )
+        return {"contents": contents, "config": config}
 
-        try:
-            resp = await self._client.aio.models.generate_content(
-                model=CHAT_MODEL,
-                contents=contents,
-                config=config,
-            )
-        except genai.errors.ClientError as e:
-            if e.code == 429:
-                raise RateLimitError("AI rate limit exceeded") from e
-            raise
-
-        data = json.loads(resp.text)
+    @staticmethod
+    def _parse_chat_reply(text: str) -> ChatResponse:
+        data = json.loads(text)
         return ChatResponse(
             response=data["response"],
             translation=data["translation"],
@@ -92,12 +213,12 @@ class GeminiChatProvider(ChatProvider):
             emotion=data.get("emotion", "neutral"),
         )
 
-    async def generate_text(self, prompt: str) -> str:
+    async def generate_text(self, prompt: str, *, cache: bool = True) -> str:
         try:
             resp = await self._client.aio.models.generate_content(
-                model=CHAT_MODEL,
+                model=self.model,
                 contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
-                config=types.GenerateContentConfig(temperature=0.5),
+                config=types.GenerateContentConfig(temperature=self.text_temperature),
             )
         except genai.errors.ClientError as e:
             if e.code == 429:
@@ -113,3 +234,42 @@ class GeminiChatProvider(ChatProvider):
                     if part.text:
                         return part.text.strip()
             raise ValueError("Failed to parse Gemini response") from e
+
+    async def generate_batch(
+        self, prompts: list[str], *, cache: bool = True
+    ) -> list[str]:
+        results: list[str] = []
+        for start in range(0, len(prompts), _BATCH_MAX):
+            results.extend(await self._generate_chunk(prompts[start : start + _BATCH_MAX]))
+        return results
+
+    async def _generate_chunk(self, prompts: list[str]) -> list[str]:
+        if len(prompts) == 1:
+            return [await self.generate_text(prompts[0])]
+        tasks = "\n\n".join(
+            f"### Task {i}\n{prompt}" for i, prompt in enumerate(prompts, 1)
+        )
+        prompt = _BATCH_PROMPT.format(count=len(prompts), tasks=tasks)
+        try:
+            resp = await self._client.aio.models.generate_content(
+                model=self.model,
+                contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+                config=types.GenerateContentConfig(
+                    temperature=self.text_temperature,
+                    response_mime_type="application/json",
+                    response_schema=types.Schema(
+                        type="ARRAY", items=types.Schema(type="STRING")
+                    ),
+                ),
+            )
+        except genai.errors.ClientError as e:
+            if e.code == 429:
+                raise RateLimitError("AI rate limit exceeded") from e
+            raise
+        items = json.loads(resp.text)
+        if not isinstance(items, list) or len(items) != len(prompts):
+            raise ValueError(
+                f"Gemini batch returned {len(items) if isinstance(items, list) else 'no'} "
+                f"items for {len(prompts)} prompts"
+            )
+        return [str(item).strip() for item in items]
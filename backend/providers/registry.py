@@ -1,10 +1,25 @@
-from backend.config import CHAT_PROVIDER
+from backend.config import CHAT_PROVIDER, LLM_CACHE_ENABLED
 from backend.providers.base import ChatProvider
 
+_provider: ChatProvider | None = None
 
-def get_chat_provider() -> ChatProvider:
+
+def _create_provider() -> ChatProvider:
     if CHAT_PROVIDER == "gemini":
         from backend.providers.gemini import GeminiChatProvider
 
         return GeminiChatProvider()
     raise ValueError(f"Unknown chat provider: {CHAT_PROVIDER}")
+
+
+def get_chat_provider() -> ChatProvider:
+    """Return the shared chat provider, wrapped in the response cache."""
+    global _provider
+    if _provider is None:
+        provider = _create_provider()
+        if LLM_CACHE_ENABLED:
+            from backend.providers.cache import CachedChatProvider
+
+            provider = CachedChatProvider(provider)
+        _provider = provider
+    return _provider
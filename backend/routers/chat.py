@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader
 
 from backend.providers.base import RateLimitError
 from backend.models.chat import (
     ChatMessageCreate,
+    ChatMessagePage,
     ChatMessageResponse,
     ChatSessionDetail,
     ChatSessionResponse,
+    MessagePinyin,
     SegmentedMessageResponse,
 )
 from backend.services import chat_service
 
+logger = logging.getLogger(__name__)
+
+_RATE_LIMIT_DETAIL = "AI rate limit exceeded — please wait a moment and try again"
+
 _token_header = APIKeyHeader(name="x-trilingo-token", auto_error=False)
 
 router = APIRouter(
@@ -26,8 +36,11 @@ async def create_session():
 
 
 @router.get("/sessions", response_model=list[ChatSessionResponse])
-async def list_sessions():
-    return await chat_service.list_sessions()
+async def list_sessions(
+    before_id: int | None = None,
+    limit: int | None = Query(None, ge=1, le=200),
+):
+    return await chat_service.list_sessions(before_id, limit)
 
 
 @router.get("/sessions/{session_id}", response_model=ChatSessionDetail)
@@ -38,6 +51,26 @@ async def get_session(session_id: int):
     return session
 
 
+@router.get("/sessions/{session_id}/messages", response_model=ChatMessagePage)
+async def list_messages(
+    session_id: int,
+    before_id: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    include_pinyin: bool = True,
+):
+    page = await chat_service.list_messages(
+        session_id, before_id, limit, include_pinyin
+    )
+    if page is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return page
+
+
+@router.get("/messages/pinyin", response_model=list[MessagePinyin])
+async def get_message_pinyin(ids: list[int] = Query(..., max_length=200)):
+    return await chat_service.get_message_pinyin(ids)
+
+
 @router.delete("/sessions/{session_id}", status_code=204)
 async def delete_session(session_id: int):
     deleted = await chat_service.delete_session(session_id)
@@ -50,13 +83,46 @@ async def send_message(session_id: int, body: ChatMessageCreate):
     try:
         result = await chat_service.send_message(session_id, body.content)
     except RateLimitError:
-        raise HTTPException(status_code=429, detail="AI rate limit exceeded — please wait a moment and try again")
+        raise HTTPException(status_code=429, detail=_RATE_LIMIT_DETAIL)
     if result is None:
         raise HTTPException(status_code=404, detail="Session not found")
     user_msg, assistant_msg = result
     return {"user_message": user_msg, "assistant_message": assistant_msg}
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/sessions/{session_id}/messages/stream")
+async def send_message_stream(session_id: int, body: ChatMessageCreate):
+    """Like send_message, but streams the reply as Server-Sent Events.
+
+    Events: user_message, delta, chunk, done (see
+    chat_service.send_message_stream), or error with a `detail` and
+    `status` if generation fails part-way.
+    """
+    events = await chat_service.send_message_stream(session_id, body.content)
+    if events is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async def stream():
+        try:
+            async for event, data in events:
+                yield _sse(event, data)
+        except RateLimitError:
+            yield _sse("error", {"status": 429, "detail": _RATE_LIMIT_DETAIL})
+        except Exception:
+            logger.exception("Chat stream failed for session %d", session_id)
+            yield _sse("error", {"status": 500, "detail": "Failed to generate a reply"})
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post(
     "/messages/{message_id}/segment",
     response_model=SegmentedMessageResponse,
@@ -7,9 +7,12 @@ from fastapi.security import APIKeyHeader
 from backend.config import ASSETS_DIR
 
 from backend.models.flashcard import (
+    AssetQueueStatus,
+    ExampleSentencesRequest,
     FlashcardCreate,
     FlashcardFromWordRequest,
     FlashcardFromWordResponse,
+    FlashcardFromWordsRequest,
     FlashcardResponse,
     FlashcardUpdate,
     QuizAnswerRequest,
@@ -17,7 +20,7 @@ from backend.models.flashcard import (
     QuizQuestion,
     SeedRequest,
 )
-from backend.services import flashcard_service
+from backend.services import asset_queue, flashcard_service
 
 _token_header = APIKeyHeader(name="x-trilingo-token", auto_error=False)
 
@@ -35,13 +38,16 @@ async def list_cards(active: bool | None = Query(None)):
 
 @router.post("", response_model=FlashcardResponse)
 async def create_card(body: FlashcardCreate):
-    return await flashcard_service.create_card(
-        chinese=body.chinese,
-        pinyin=body.pinyin,
-        english=body.english,
-        notes=body.notes,
-        source=body.source,
-    )
+    try:
+        return await flashcard_service.create_card(
+            chinese=body.chinese,
+            pinyin=body.pinyin,
+            english=body.english,
+            notes=body.notes,
+            source=body.source,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.get("/quiz", response_model=QuizQuestion)
@@ -66,6 +72,23 @@ async def seed_cards(body: SeedRequest):
     return {"seeded": seeded}
 
 
+@router.get("/assets/status", response_model=AssetQueueStatus)
+async def asset_queue_status():
+    return await asset_queue.get_status()
+
+
+@router.post("/assets/pause", response_model=AssetQueueStatus)
+async def pause_asset_queue():
+    asset_queue.pause()
+    return await asset_queue.get_status()
+
+
+@router.post("/assets/resume", response_model=AssetQueueStatus)
+async def resume_asset_queue():
+    asset_queue.resume()
+    return await asset_queue.get_status()
+
+
 @router.post("/from-word", response_model=FlashcardFromWordResponse)
 async def create_from_word(body: FlashcardFromWordRequest):
     return await flashcard_service.create_card_from_word(
@@ -73,6 +96,26 @@ async def create_from_word(body: FlashcardFromWordRequest):
     )
 
 
+@router.post("/from-words", response_model=list[FlashcardFromWordResponse])
+async def create_from_words(body: FlashcardFromWordsRequest):
+    if len(body.words) < 1 or len(body.words) > 50:
+        raise HTTPException(status_code=400, detail="Provide 1-50 words")
+    return await flashcard_service.create_cards_from_words(
+        words=body.words, source=body.source
+    )
+
+
+@router.post("/example-sentences")
+async def get_example_sentences(body: ExampleSentencesRequest):
+    if len(body.card_ids) < 1 or len(body.card_ids) > 50:
+        raise HTTPException(status_code=400, detail="Provide 1-50 card IDs")
+    try:
+        sentences = await flashcard_service.get_example_sentences(body.card_ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate sentences: {e}")
+    return {"sentences": sentences}
+
+
 @router.post("/quiz/answer", response_model=QuizAnswerResponse)
 async def submit_answer(body: QuizAnswerRequest):
     result = await flashcard_service.submit_answer(
@@ -103,7 +146,10 @@ async def regenerate_assets(card_id: int):
 
 @router.get("/{card_id}/audio")
 async def get_card_audio(card_id: int):
-    audio_path = ASSETS_DIR / "audio" / f"{card_id}.mp3"
+    card = await flashcard_service.get_card(card_id)
+    if card is None or not card.audio_path:
+        raise HTTPException(status_code=404, detail="Audio not available")
+    audio_path = ASSETS_DIR / card.audio_path
     if not audio_path.is_file():
         raise HTTPException(status_code=404, detail="Audio not available")
     return FileResponse(audio_path, media_type="audio/mpeg")
@@ -119,7 +165,10 @@ async def get_card(card_id: int):
 
 @router.patch("/{card_id}", response_model=FlashcardResponse)
 async def update_card(card_id: int, body: FlashcardUpdate):
-    card = await flashcard_service.update_card(card_id, **body.model_dump(exclude_unset=True))
+    try:
+        card = await flashcard_service.update_card(card_id, **body.model_dump(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if card is None:
         raise HTTPException(status_code=404, detail="Card not found")
     return card
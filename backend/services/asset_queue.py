@@ -0,0 +1,288 @@
+"""Durable job queue for flashcard asset generation.
+
+Jobs are rows in asset_jobs, one per (card, kind), so work queued before a
+crash or restart is picked up again on the next start. A fixed pool of
+ASSET_WORKERS tasks claims ready jobs by priority (new cards, then
+active cards, then the rest), oldest first, with at most
+ASSET_AUDIO_CONCURRENCY audio and ASSET_IMAGE_CONCURRENCY image jobs
+running at once (so a bulk seed can't fan out into hundreds of TTS and
+HTTP calls). A failed job is retried with exponential backoff and is
+marked 'failed' after ASSET_JOB_MAX_ATTEMPTS. A partial unique index
+allows one pending/running job per card and kind, so enqueueing the same
+work twice only raises its priority if needed.
+
+Workers form a sliding window: each takes the next job as soon as it
+finishes one, so a slow TTS call never holds back the rest of a batch.
+The queue can be paused (jobs in flight still finish) and resumed.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Iterable
+
+from backend.config import (
+    ASSET_AUDIO_CONCURRENCY,
+    ASSET_IMAGE_CONCURRENCY,
+    ASSET_JOB_MAX_ATTEMPTS,
+    ASSET_WORKERS,
+)
+from backend.database import get_db
+from backend.services import asset_worker
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("audio", "image")
+
+# Job priorities, highest first
+PRIORITY_NEW = 2  # cards just created, seeded or regenerated
+PRIORITY_ACTIVE = 1  # backfill for cards in the quiz rotation
+PRIORITY_INACTIVE = 0  # backfill for everything else
+
+_LIMITS = {"audio": ASSET_AUDIO_CONCURRENCY, "image": ASSET_IMAGE_CONCURRENCY}
+_BASE_BACKOFF = 10.0  # seconds before the first retry; doubles per attempt
+_MAX_BACKOFF = 3600.0
+_IDLE_RECHECK = 60.0  # seconds between checks when nothing wakes the workers
+_DONE_RETENTION = 86400.0  # finished jobs are kept this long for throughput stats
+
+_running: dict[str, int] = {kind: 0 for kind in KINDS}
+_claim_lock = asyncio.Lock()
+_wakeup = asyncio.Event()
+_workers: list[asyncio.Task] = []
+_paused = False
+
+
+async def enqueue(
+    card_ids: Iterable[int], kinds: Iterable[str] = KINDS, priority: int = PRIORITY_NEW
+) -> None:
+    """Queue asset jobs for cards.
+
+    A job already queued for the same card and kind is kept, with its
+    priority raised to `priority` if that is higher.
+    """
+    now = time.time()
+    kinds = tuple(kinds)
+    rows = [(card_id, kind, priority, now) for card_id in card_ids for kind in kinds]
+    if not rows:
+        return
+    async with get_db() as db:
+        await db.executemany(
+            "INSERT INTO asset_jobs (card_id, kind, priority, created_at) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (card_id, kind) WHERE status IN ('pending', 'running') "
+            "DO UPDATE SET priority = MAX(priority, excluded.priority)",
+            rows,
+        )
+        await db.commit()
+    _wakeup.set()
+
+
+async def backfill_assets() -> int:
+    """Queue jobs for cards missing audio and for images not yet normalized.
+
+    Active cards go ahead of inactive ones. Returns how many jobs were added.
+    """
+    now = time.time()
+    priority = f"CASE WHEN active = 1 THEN {PRIORITY_ACTIVE} ELSE {PRIORITY_INACTIVE} END"
+    async with get_db() as db:
+        cursor = await db.execute(
+            "INSERT OR IGNORE INTO asset_jobs (card_id, kind, priority, created_at) "
+            f"SELECT id, 'audio', {priority}, ? FROM flashcards WHERE audio_path IS NULL "
+            "UNION ALL "
+            f"SELECT id, 'image', {priority}, ? FROM flashcards "
+            "WHERE audio_path IS NULL AND image_path IS NULL "
+            "UNION ALL "
+            # Separate branches so each is served by a partial index
+            f"SELECT id, 'image', {priority}, ? FROM flashcards "
+            "WHERE image_path IS NOT NULL AND image_bytes IS NULL",
+            (now, now, now),
+        )
+        await db.commit()
+    _wakeup.set()
+    return cursor.rowcount
+
+
+def pause() -> None:
+    """Stop claiming new jobs; jobs already running finish."""
+    global _paused
+    _paused = True
+
+
+def resume() -> None:
+    global _paused
+    _paused = False
+    _wakeup.set()
+
+
+async def _claim() -> tuple[int, int, str, int] | None:
+    """Mark the oldest ready job of a kind with free capacity as running."""
+    kinds = [kind for kind in KINDS if _running[kind] < _LIMITS[kind]]
+    if not kinds:
+        return None
+    placeholders = ", ".join("?" * len(kinds))
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "UPDATE asset_jobs SET status = 'running', attempts = attempts + 1 "
+            "WHERE id = (SELECT id FROM asset_jobs "
+            f"WHERE status = 'pending' AND run_after <= ? AND kind IN ({placeholders}) "
+            "ORDER BY priority DESC, id LIMIT 1) "
+            "RETURNING id, card_id, kind, attempts",
+            (time.time(), *kinds),
+        )
+        await db.commit()
+    if not rows:
+        return None
+    job_id, card_id, kind, attempts = rows[0]
+    _running[kind] += 1
+    return job_id, card_id, kind, attempts
+
+
+async def _idle_timeout() -> float:
+    """Seconds until the next backed-off job is due (capped)."""
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT MIN(run_after) FROM asset_jobs WHERE status = 'pending'"
+        )
+    due = rows[0][0]
+    if due is None or due <= time.time():
+        # Nothing pending, or ready jobs held back by the per-kind limits
+        # (a finishing job wakes the workers)
+        return _IDLE_RECHECK
+    return min(_IDLE_RECHECK, due - time.time())
+
+
+async def _run(job_id: int, card_id: int, kind: str, attempts: int) -> None:
+    """Run a claimed job and record the outcome (done, retry or failed)."""
+    error: Exception | None = None
+    try:
+        await asset_worker.run_job(kind, card_id)
+    except Exception as e:
+        error = e
+
+    now = time.time()
+    async with get_db() as db:
+        if error is None:
+            await db.execute(
+                "UPDATE asset_jobs SET status = 'done', finished_at = ?, last_error = NULL "
+                "WHERE id = ?",
+                (now, job_id),
+            )
+        elif attempts >= ASSET_JOB_MAX_ATTEMPTS:
+            await db.execute(
+                "UPDATE asset_jobs SET status = 'failed', finished_at = ?, last_error = ? "
+                "WHERE id = ?",
+                (now, repr(error)[:500], job_id),
+            )
+        else:
+            delay = min(_MAX_BACKOFF, _BASE_BACKOFF * 2 ** (attempts - 1))
+            await db.execute(
+                "UPDATE asset_jobs SET status = 'pending', run_after = ?, last_error = ? "
+                "WHERE id = ?",
+                (now + delay, repr(error)[:500], job_id),
+            )
+        await db.commit()
+    if error is not None:
+        logger.warning(
+            "Asset job %s for card %d failed (attempt %d/%d)",
+            kind, card_id, attempts, ASSET_JOB_MAX_ATTEMPTS,
+            exc_info=error,
+        )
+
+
+async def _worker() -> None:
+    while True:
+        _wakeup.clear()
+        try:
+            job = None
+            if not _paused:
+                async with _claim_lock:
+                    job = await _claim()
+            if job is None:
+                try:
+                    await asyncio.wait_for(_wakeup.wait(), await _idle_timeout())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await _run(*job)
+            finally:
+                _running[job[2]] -= 1
+                _wakeup.set()
+        except Exception:
+            # Keep the pool at full size if the database hiccups
+            logger.exception("Asset queue worker error")
+            await asyncio.sleep(_BASE_BACKOFF)
+
+
+async def start() -> None:
+    """Requeue jobs interrupted by a restart and start the worker pool."""
+    if _workers:
+        return
+    async with get_db() as db:
+        await db.execute("UPDATE asset_jobs SET status = 'pending' WHERE status = 'running'")
+        await db.execute(
+            "DELETE FROM asset_jobs WHERE status = 'done' AND finished_at < ?",
+            (time.time() - _DONE_RETENTION,),
+        )
+        await db.commit()
+    _workers.extend(asyncio.create_task(_worker()) for _ in range(ASSET_WORKERS))
+
+
+async def stop() -> None:
+    """Cancel the workers; interrupted jobs are requeued on the next start."""
+    workers = list(_workers)
+    _workers.clear()
+    for task in workers:
+        task.cancel()
+    # Let each worker's finally release its slot before the counts reset
+    await asyncio.gather(*workers, return_exceptions=True)
+    for kind in KINDS:
+        _running[kind] = 0
+
+
+async def get_status() -> dict:
+    """Queue depth per kind, progress through the backlog and throughput.
+
+    The backlog is every job created since the oldest one still queued,
+    so its progress survives restarts.
+    """
+    now = time.time()
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT kind, status, COUNT(*) FROM asset_jobs "
+            "WHERE status != 'done' GROUP BY kind, status"
+        )
+        done = await db.execute_fetchall(
+            "SELECT COUNT(*), SUM(finished_at > ?), SUM(finished_at > ?) FROM asset_jobs "
+            "WHERE status = 'done' AND finished_at > ?",
+            (now - 60, now - 600, now - 3600),
+        )
+        backlog = await db.execute_fetchall(
+            "SELECT COUNT(*), SUM(status IN ('done', 'failed')) FROM asset_jobs "
+            "WHERE created_at >= (SELECT MIN(created_at) FROM asset_jobs "
+            "WHERE status IN ('pending', 'running'))"
+        )
+    kinds = {
+        kind: {"pending": 0, "running": 0, "failed": 0, "limit": _LIMITS[kind]}
+        for kind in KINDS
+    }
+    for kind, status, count in rows:
+        if kind in kinds:
+            kinds[kind][status] = count
+    last_hour, last_minute, last_10_minutes = done[0]
+    depth = sum(k["pending"] + k["running"] for k in kinds.values())
+    # Prefer the last minute's rate; it reacts faster when a backlog starts
+    per_minute = last_minute or (last_10_minutes or 0) / 10
+    eta = depth / per_minute * 60 if depth and per_minute and not _paused else None
+    return {
+        "depth": depth,
+        "kinds": kinds,
+        "workers": len(_workers),
+        "paused": _paused,
+        "backlog_total": backlog[0][0],
+        "backlog_completed": backlog[0][1] or 0,
+        "eta_seconds": eta,
+        "completed_last_minute": last_minute or 0,
+        "completed_last_hour": last_hour or 0,
+        "throughput_per_minute": (last_10_minutes or 0) / 10,
+    }
@@ -1,107 +1,218 @@
-"""Background asset generation for flashcards — TTS audio and CC images."""
+"""Asset generation for flashcards — TTS audio and CC images.
+
+These are the job handlers; scheduling, retries and concurrency limits
+live in asset_queue.
+"""
 
 import asyncio
+from contextlib import asynccontextmanager
+import importlib.util
 import logging
+import os
+from pathlib import Path
+from urllib.parse import urlsplit
 
-import edge_tts
-import httpx
-
-from backend.config import ASSETS_DIR, TTS_RATE, TTS_VOICE
+from backend.config import ASSETS_DIR, HTTP_PER_HOST_LIMIT, IMAGE_MAX_BYTES
 from backend.database import get_db
+from backend.services import image_processing, tts_store
 
 logger = logging.getLogger(__name__)
 
-AUDIO_DIR = ASSETS_DIR / "audio"
 IMAGE_DIR = ASSETS_DIR / "images"
 
 OPENVERSE_SEARCH_URL = "https://api.openverse.org/v1/images/"
 
+_CHUNK_SIZE = 64 * 1024
+
+
+# ---------------------------------------------------------------------------
+# Audio
+# ---------------------------------------------------------------------------
 
 async def generate_audio(card_id: int, chinese: str) -> None:
-    """Generate TTS audio for a flashcard's Chinese text."""
-    try:
-        out_path = AUDIO_DIR / f"{card_id}.mp3"
-        communicate = edge_tts.Communicate(text=chinese, voice=TTS_VOICE, rate=TTS_RATE)
-        await communicate.save(str(out_path))
+    """Give a flashcard TTS audio for its Chinese text.
 
-        async with get_db() as db:
-            await db.execute(
-                "UPDATE flashcards SET audio_path = ? WHERE id = ?",
-                (f"audio/{card_id}.mp3", card_id),
-            )
-            await db.commit()
-        logger.info("Generated audio for card %d", card_id)
-    except Exception:
-        logger.warning("Failed to generate audio for card %d", card_id, exc_info=True)
+    The audio comes from the shared store, so each utterance is only
+    synthesized once. Raises on failure so the job queue can retry.
+    """
+    key = await tts_store.synthesize(chinese)
+    await tts_store.assign(card_id, key)
+    logger.info("Set audio for card %d", card_id)
 
 
-async def fetch_image(card_id: int, english: str) -> None:
-    """Fetch a Creative Commons image from Openverse for the card's English term."""
-    try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.get(
-                OPENVERSE_SEARCH_URL,
-                params={"q": english, "page_size": 1},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            results = data.get("results", [])
-            if not results:
-                logger.info("No Openverse image found for card %d (%s)", card_id, english)
-                return
+# ---------------------------------------------------------------------------
+# Images
+# ---------------------------------------------------------------------------
+
+_client = None  # httpx.AsyncClient, created on first use
+_host_slots: dict[str, asyncio.Semaphore] = {}
+
+
+def _http():
+    """Return the shared client; connections are pooled across jobs."""
+    global _client
+    if _client is None:
+        import httpx  # deferred: only needed once a card needs an image
+
+        _client = httpx.AsyncClient(
+            timeout=15,
+            follow_redirects=True,
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+async def close_http() -> None:
+    """Close the shared client (called on shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
-            hit = results[0]
-            image_url = hit.get("url", "")
-            if not image_url:
-                return
+@asynccontextmanager
+async def _host_slot(url: str):
+    """Limit concurrent requests to one host to HTTP_PER_HOST_LIMIT."""
+    host = urlsplit(url).hostname or ""
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(HTTP_PER_HOST_LIMIT)
+    async with slot:
+        yield
 
-            img_resp = await client.get(image_url)
-            img_resp.raise_for_status()
 
-        out_path = IMAGE_DIR / f"{card_id}.jpg"
-        out_path.write_bytes(img_resp.content)
+async def _download(url: str, out_path: Path) -> bool:
+    """Stream url into out_path via a temp file and an atomic rename.
+
+    File writes run in a thread so large bodies don't block the event
+    loop. Returns False, keeping nothing, if the body exceeds
+    IMAGE_MAX_BYTES.
+    """
+    tmp_path = out_path.with_name(out_path.name + ".part")
+    try:
+        async with _host_slot(url):
+            async with _http().stream("GET", url) as resp:
+                resp.raise_for_status()
+                if int(resp.headers.get("content-length") or 0) > IMAGE_MAX_BYTES:
+                    return False
+                f = await asyncio.to_thread(open, tmp_path, "wb")
+                try:
+                    size = 0
+                    async for chunk in resp.aiter_bytes(_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > IMAGE_MAX_BYTES:
+                            return False
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
+        await asyncio.to_thread(os.replace, tmp_path, out_path)
+        return True
+    finally:
+        tmp_path.unlink(missing_ok=True)  # no-op after a successful rename
 
-        # Store path with attribution metadata
-        creator = hit.get("creator", "Unknown")
-        license_name = hit.get("license", "CC")
-        image_value = f"images/{card_id}.jpg|{creator}|{license_name}"
 
+async def fetch_image(card_id: int, english: str) -> None:
+    """Fetch a Creative Commons image from Openverse for the card's English term.
+
+    Finding no image (or only an oversized or undecodable one) is not an
+    error; request failures raise so the job queue can retry.
+    """
+    async with _host_slot(OPENVERSE_SEARCH_URL):
+        resp = await _http().get(
+            OPENVERSE_SEARCH_URL,
+            params={"q": english, "page_size": 1},
+        )
+    resp.raise_for_status()
+    results = resp.json().get("results", [])
+    if not results:
+        logger.info("No Openverse image found for card %d (%s)", card_id, english)
+        return
+
+    hit = results[0]
+    image_url = hit.get("url", "")
+    if not image_url:
+        return
+
+    IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+    download_path = IMAGE_DIR / f"{card_id}.download"
+    if not await _download(image_url, download_path):
+        logger.info("Skipped oversized image for card %d (%s)", card_id, image_url)
+        return
+
+    creator = hit.get("creator", "Unknown")
+    license_name = hit.get("license", "CC")
+    await _store_image(card_id, download_path, creator, license_name)
+
+
+async def _store_image(card_id: int, src: Path, creator: str, license_name: str) -> None:
+    """Normalize src into the card's display/thumbnail WebPs and record them.
+
+    src is removed afterwards. An undecodable file leaves the card without
+    an image (clearing one saved before normalization).
+    """
+    display = IMAGE_DIR / f"{card_id}.webp"
+    thumb = IMAGE_DIR / f"{card_id}_thumb.webp"
+    try:
+        info = await image_processing.normalize(src, display, thumb)
+    finally:
+        src.unlink(missing_ok=True)
+    if info is None:
+        logger.info("Discarded undecodable image for card %d", card_id)
         async with get_db() as db:
             await db.execute(
-                "UPDATE flashcards SET image_path = ? WHERE id = ?",
-                (image_value, card_id),
+                "UPDATE flashcards SET image_path = NULL WHERE id = ?", (card_id,)
             )
             await db.commit()
-        logger.info("Fetched image for card %d", card_id)
-    except Exception:
-        logger.warning("Failed to fetch image for card %d", card_id, exc_info=True)
-
+        return
 
-async def process_card_assets(card_id: int, chinese: str, english: str) -> None:
-    """Generate audio and fetch image concurrently for a flashcard."""
-    await asyncio.gather(
-        generate_audio(card_id, chinese),
-        fetch_image(card_id, english),
-        return_exceptions=True,
+    async with get_db() as db:
+        # Path with attribution metadata
+        await db.execute(
+            "UPDATE flashcards SET image_path = ?, image_thumb_path = ?, "
+            "image_width = ?, image_height = ?, image_bytes = ?, image_thumb_bytes = ? "
+            "WHERE id = ?",
+            (
+                f"images/{display.name}|{creator}|{license_name}",
+                f"images/{thumb.name}",
+                info.width,
+                info.height,
+                info.display_bytes,
+                info.thumb_bytes,
+                card_id,
+            ),
+        )
+        await db.commit()
+    logger.info(
+        "Stored image for card %d (%dx%d, %d bytes)",
+        card_id, info.width, info.height, info.display_bytes,
     )
 
 
-async def backfill_assets(batch_size: int = 5) -> int:
-    """Queue asset generation for all cards missing audio, in batches."""
-    async with get_db() as db:
+# ---------------------------------------------------------------------------
+# Jobs
+# ---------------------------------------------------------------------------
+
+async def run_job(kind: str, card_id: int) -> None:
+    """Run one asset job; a card deleted since it was queued is skipped."""
+    async with get_db(readonly=True) as db:
         rows = await db.execute_fetchall(
-            "SELECT id, chinese, english FROM flashcards WHERE audio_path IS NULL"
+            "SELECT chinese, english, image_path, image_bytes FROM flashcards WHERE id = ?",
+            (card_id,),
         )
     if not rows:
-        return 0
-    total = len(rows)
-
-    async def _process_batches():
-        for i in range(0, len(rows), batch_size):
-            batch = rows[i : i + batch_size]
-            await asyncio.gather(
-                *(process_card_assets(r[0], r[1], r[2]) for r in batch)
-            )
-
-    asyncio.create_task(_process_batches())
-    return total
+        return
+    chinese, english, image_path, image_bytes = rows[0]
+    if kind == "audio":
+        await generate_audio(card_id, chinese)
+    elif kind == "image" and image_path and image_bytes is None:
+        # Image saved as-is before normalization; convert the local file
+        path, creator, license_name = (image_path.split("|") + ["", ""])[:3]
+        if (ASSETS_DIR / path).is_file():
+            await _store_image(card_id, ASSETS_DIR / path, creator, license_name)
+        else:
+            await fetch_image(card_id, english)
+    elif kind == "image":
+        await fetch_image(card_id, english)
+    else:
+        raise ValueError(f"Unknown asset job kind: {kind}")
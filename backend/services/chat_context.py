@@ -0,0 +1,155 @@
+"""Bounded conversation context for chat sessions.
+
+Rather than sending a session's whole history every turn, the provider
+gets a persisted rolling summary of older turns (chat_sessions.summary,
+covering messages up to chat_sessions.summary_upto) plus the messages
+after it verbatim. Once more than CHAT_CONTEXT_TURNS + CHAT_SUMMARY_EVERY
+turns are unsummarized, a background task folds all but the last
+CHAT_CONTEXT_TURNS into the summary, so the verbatim tail stays between
+K and K + M turns. The result is further trimmed to
+CHAT_CONTEXT_TOKEN_BUDGET (oldest messages first) and starts on a user
+turn; dropping messages the summary doesn't cover is logged.
+"""
+
+import asyncio
+import logging
+
+from backend.config import (
+    CHAT_CONTEXT_TOKEN_BUDGET,
+    CHAT_CONTEXT_TURNS,
+    CHAT_SUMMARY_EVERY,
+)
+from backend.database import get_db
+
+logger = logging.getLogger(__name__)
+
+_SUMMARY_PROMPT = """\
+You are maintaining a running summary of a Mandarin tutoring chat between \
+a learner (user) and their tutor (assistant).
+
+Previous summary:
+{summary}
+
+New messages:
+{transcript}
+
+Write an updated summary in English, under 150 words. Keep what matters \
+for continuing the conversation: topics discussed, facts the learner \
+shared about themselves, vocabulary and grammar points covered, and \
+recurring mistakes. Reply with only the summary."""
+
+_tasks: dict[int, asyncio.Task] = {}  # session id -> running summarization
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: about one per CJK character, four ASCII chars per token."""
+    wide = sum(1 for ch in text if ord(ch) >= 0x2E80)
+    return wide + (len(text) - wide + 3) // 4
+
+
+async def load_context(db, session_id: int) -> tuple[list[dict[str, str]], str | None]:
+    """Return (recent messages oldest-first, summary of older turns).
+
+    `db` is an open connection, so this can run inside the caller's
+    transaction right after the new user message is inserted.
+    """
+    rows = await db.execute_fetchall(
+        "SELECT summary, summary_upto FROM chat_sessions WHERE id = ?",
+        (session_id,),
+    )
+    summary, summary_upto = rows[0] if rows else (None, 0)
+    # Only messages after the summary are read. They are bounded by (K + M)
+    # turns plus the new one; the cap only matters while a summarization
+    # is lagging or failing. One extra row tells us whether it cut any.
+    limit = 2 * (CHAT_CONTEXT_TURNS + CHAT_SUMMARY_EVERY) + 2
+    history_rows = await db.execute_fetchall(
+        "SELECT role, content FROM chat_messages "
+        "WHERE session_id = ? AND id > ? ORDER BY id DESC LIMIT ?",
+        (session_id, summary_upto, limit + 1),
+    )
+    capped = len(history_rows) > limit
+
+    budget = CHAT_CONTEXT_TOKEN_BUDGET - estimate_tokens(summary or "")
+    messages: list[dict[str, str]] = []
+    for role, content in history_rows[:limit]:
+        budget -= estimate_tokens(content)
+        if budget < 0 and messages:
+            break  # always keep at least the newest message
+        messages.append({"role": role, "content": content})
+    messages.reverse()
+    # Start on a user turn (the newest message is the user's, so one stays)
+    while len(messages) > 1 and messages[0]["role"] != "user":
+        messages.pop(0)
+
+    dropped = len(history_rows) - len(messages)
+    if dropped:
+        # Nothing covers these: they are newer than the summary
+        logger.warning(
+            "Dropped %s%d unsummarized messages from the context of session %d",
+            "at least " if capped else "", dropped, session_id,
+        )
+    return messages, summary
+
+
+def schedule_summary(session_id: int) -> None:
+    """Refresh the session's summary in the background if it is due."""
+    task = _tasks.get(session_id)
+    if task is not None and not task.done():
+        return
+    task = asyncio.create_task(_summarize(session_id))
+    _tasks[session_id] = task
+
+    def _forget(done: asyncio.Task) -> None:
+        if _tasks.get(session_id) is done:
+            del _tasks[session_id]
+
+    task.add_done_callback(_forget)
+
+
+async def _summarize(session_id: int) -> None:
+    from backend.providers.registry import get_chat_provider
+
+    keep = 2 * CHAT_CONTEXT_TURNS
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT summary, summary_upto FROM chat_sessions WHERE id = ?",
+            (session_id,),
+        )
+        if not rows:
+            return
+        summary, summary_upto = rows[0]
+        count_rows = await db.execute_fetchall(
+            "SELECT COUNT(*) FROM chat_messages WHERE session_id = ? AND id > ?",
+            (session_id, summary_upto),
+        )
+        if count_rows[0][0] < keep + 2 * CHAT_SUMMARY_EVERY:
+            return
+        older = await db.execute_fetchall(
+            "SELECT id, role, content FROM chat_messages "
+            "WHERE session_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (session_id, summary_upto, count_rows[0][0] - keep),
+        )
+
+    transcript = "\n".join(f"{role}: {content}" for _, role, content in older)
+    prompt = _SUMMARY_PROMPT.format(summary=summary or "(none yet)", transcript=transcript)
+    try:
+        new_summary = await get_chat_provider().generate_text(prompt, cache=False)
+    except Exception:
+        logger.warning("Chat summary failed for session %d", session_id, exc_info=True)
+        return
+
+    async with get_db() as db:
+        # Guard against the session being deleted or summarized meanwhile
+        await db.execute(
+            "UPDATE chat_sessions SET summary = ?, summary_upto = ? "
+            "WHERE id = ? AND summary_upto = ?",
+            (new_summary, older[-1][0], session_id, summary_upto),
+        )
+        await db.commit()
+
+
+def stop() -> None:
+    """Cancel in-flight summarizations (called on shutdown)."""
+    for task in list(_tasks.values()):
+        task.cancel()
+    _tasks.clear()
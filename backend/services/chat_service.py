@@ -1,39 +1,61 @@
+import asyncio
+from collections.abc import AsyncIterator
 import json
+import logging
 
 from backend.chinese.pinyin import annotate_pinyin
-from backend.chinese.segmentation import segment_to_word_boundaries
+from backend.chinese.segmentation import segment_text, word_boundaries
 from backend.database import get_db
 from backend.models.chat import (
+    ChatMessagePage,
     ChatMessageResponse,
     ChatSessionDetail,
     ChatSessionResponse,
-    PinyinPair,
+    MessagePinyin,
     SegmentedMessageResponse,
     WordBoundary,
 )
 from backend.providers.base import ChatResponse
 from backend.providers.registry import get_chat_provider
+from backend.services import chat_context, pinyin_store
+
+logger = logging.getLogger(__name__)
+
+_MESSAGE_COLS = (
+    "id, session_id, role, content, translation, feedback, emotion, created_at, "
+    "pinyin, pinyin_codes"
+)
 
 
 async def create_session() -> ChatSessionResponse:
     async with get_db() as db:
-        cursor = await db.execute(
-            "INSERT INTO chat_sessions (title) VALUES (NULL)"
-        )
-        await db.commit()
         row = await db.execute_fetchall(
-            "SELECT id, created_at, title FROM chat_sessions WHERE id = ?",
-            (cursor.lastrowid,),
+            "INSERT INTO chat_sessions (title) VALUES (NULL) "
+            "RETURNING id, created_at, title"
         )
+        await db.commit()
         r = row[0]
         return ChatSessionResponse(id=r[0], created_at=r[1], title=r[2])
 
 
-async def list_sessions() -> list[ChatSessionResponse]:
-    async with get_db() as db:
-        rows = await db.execute_fetchall(
-            "SELECT id, created_at, title FROM chat_sessions ORDER BY id DESC"
-        )
+async def list_sessions(
+    before_id: int | None = None, limit: int | None = None
+) -> list[ChatSessionResponse]:
+    """List sessions newest first, optionally one keyset page at a time.
+
+    before_id is the id of the last session on the previous page.
+    """
+    query = "SELECT id, created_at, title FROM chat_sessions"
+    params: list[int] = []
+    if before_id is not None:
+        query += " WHERE id < ?"
+        params.append(before_id)
+    query += " ORDER BY id DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(query, params)
         return [
             ChatSessionResponse(id=r[0], created_at=r[1], title=r[2])
             for r in rows
@@ -58,7 +80,7 @@ async def delete_session(session_id: int) -> bool:
 
 
 async def get_session(session_id: int) -> ChatSessionDetail | None:
-    async with get_db() as db:
+    async with get_db(readonly=True) as db:
         rows = await db.execute_fetchall(
             "SELECT id, created_at, title FROM chat_sessions WHERE id = ?",
             (session_id,),
@@ -67,16 +89,71 @@ async def get_session(session_id: int) -> ChatSessionDetail | None:
             return None
         r = rows[0]
         msg_rows = await db.execute_fetchall(
-            "SELECT id, session_id, role, content, pinyin, translation, feedback, emotion, created_at "
-            "FROM chat_messages WHERE session_id = ? ORDER BY id",
+            f"SELECT {_MESSAGE_COLS} FROM chat_messages WHERE session_id = ? ORDER BY id",
             (session_id,),
         )
+        await pinyin_store.ensure_loaded()
         messages = [_row_to_message(m) for m in msg_rows]
         return ChatSessionDetail(
             id=r[0], created_at=r[1], title=r[2], messages=messages
         )
 
 
+async def list_messages(
+    session_id: int,
+    before_id: int | None = None,
+    limit: int = 50,
+    include_pinyin: bool = True,
+) -> ChatMessagePage | None:
+    """Return the newest `limit` messages older than before_id.
+
+    Messages in the page are oldest first. With include_pinyin=False the
+    pinyin annotations are neither read nor decoded (fetch them later with
+    get_message_pinyin). Returns None if the session doesn't exist.
+    """
+    cols = _MESSAGE_COLS if include_pinyin else _MESSAGE_COLS.replace(
+        "pinyin, pinyin_codes", "NULL, NULL"
+    )
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT id FROM chat_sessions WHERE id = ?", (session_id,)
+        )
+        if not rows:
+            return None
+        query = f"SELECT {cols} FROM chat_messages WHERE session_id = ?"
+        params = [session_id]
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        # One extra row tells us whether an older page exists
+        msg_rows = await db.execute_fetchall(
+            query + " ORDER BY id DESC LIMIT ?", (*params, limit + 1)
+        )
+    has_more = len(msg_rows) > limit
+    if include_pinyin:
+        await pinyin_store.ensure_loaded()
+    messages = [_row_to_message(m) for m in reversed(msg_rows[:limit])]
+    return ChatMessagePage(messages=messages, has_more=has_more)
+
+
+async def get_message_pinyin(message_ids: list[int]) -> list[MessagePinyin]:
+    """Return pinyin annotations for messages loaded without them."""
+    if not message_ids:
+        return []
+    placeholders = ", ".join("?" * len(message_ids))
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT id, content, pinyin, pinyin_codes FROM chat_messages "
+            f"WHERE id IN ({placeholders})",
+            message_ids,
+        )
+    await pinyin_store.ensure_loaded()
+    return [
+        MessagePinyin(message_id=r[0], pinyin=_decode_pinyin(r[1], r[2], r[3]))
+        for r in rows
+    ]
+
+
 async def send_message(
     session_id: int, content: str
 ) -> tuple[ChatMessageResponse, ChatMessageResponse] | None:
@@ -84,119 +161,255 @@ async def send_message(
 
     Returns (user_msg, assistant_msg) or None if session not found.
     """
-    async with get_db() as db:
-        # Verify session exists
+    saved = await _save_user_message(session_id, content)
+    if saved is None:
+        return None
+    user_msg, messages, summary = saved
+
+    # Call AI provider without holding a pooled connection
+    provider = get_chat_provider()
+    ai_response: ChatResponse = await provider.chat(
+        messages, cache=False, context=_summary_context(summary)
+    )
+    assistant_msg = await _save_assistant_reply(session_id, content, ai_response)
+    return user_msg, assistant_msg
+
+
+# Punctuation that closes a chunk of streamed text for pinyin annotation
+_CHUNK_END = set("。！？!?；;，,\n")
+# Translation stored on a reply cut off mid-stream
+_INTERRUPTED = "(reply interrupted)"
+
+
+async def send_message_stream(
+    session_id: int, content: str
+) -> AsyncIterator[tuple[str, dict]] | None:
+    """Send a user message and stream the AI response as events.
+
+    Returns None if the session is not found. Otherwise an async iterator
+    of (event, data) pairs is returned; the user message is saved when it
+    is first iterated, so a stream dropped before then leaves no trace:
+
+    - "user_message": the saved user message
+    - "delta": {"text"} for each new piece of the reply
+    - "chunk": {"text", "pinyin"} whenever a clause of the reply completes
+    - "done": {"assistant_message"}, the saved reply with translation,
+      feedback and emotion
+
+    Provider errors (e.g. RateLimitError) propagate out of the iterator.
+    If the reply doesn't finish (an error or the client disconnecting),
+    the text streamed so far is saved as an interrupted reply, or the user
+    message is removed if nothing was streamed, so the history keeps
+    alternating between user and assistant turns.
+    """
+    async with get_db(readonly=True) as db:
         rows = await db.execute_fetchall(
             "SELECT id FROM chat_sessions WHERE id = ?", (session_id,)
         )
-        if not rows:
-            return None
+    if not rows:
+        return None
+
+    async def events() -> AsyncIterator[tuple[str, dict]]:
+        saved = await _save_user_message(session_id, content)
+        if saved is None:
+            raise LookupError(f"Chat session {session_id} was deleted")
+        user_msg, messages, summary = saved
+        streamed = ""
+        pending = ""
+        assistant_msg: ChatMessageResponse | None = None
+        try:
+            yield "user_message", user_msg.model_dump()
+
+            provider = get_chat_provider()
+            ai_response: ChatResponse | None = None
+            async for item in provider.chat_stream(
+                messages, context=_summary_context(summary)
+            ):
+                if isinstance(item, ChatResponse):
+                    ai_response = item
+                    break
+                streamed += item
+                yield "delta", {"text": item}
+                pending += item
+                cut = max((i for i, ch in enumerate(pending) if ch in _CHUNK_END), default=-1)
+                if cut >= 0:
+                    chunk, pending = pending[: cut + 1], pending[cut + 1 :]
+                    yield "chunk", _annotated_chunk(chunk)
+            if pending:
+                yield "chunk", _annotated_chunk(pending)
+            if ai_response is None:
+                raise RuntimeError("Chat stream ended without a final response")
+
+            assistant_msg = await _save_assistant_reply(session_id, content, ai_response)
+        finally:
+            if assistant_msg is None:
+                # Client disconnect or provider error. Shielded: on a
+                # disconnect the surrounding task is being cancelled.
+                await asyncio.shield(
+                    _settle_interrupted_reply(session_id, content, user_msg.id, streamed)
+                )
+        yield "done", {"assistant_message": assistant_msg.model_dump()}
+
+    return events()
 
-        # Save user message
-        cursor = await db.execute(
-            "INSERT INTO chat_messages (session_id, role, content) VALUES (?, 'user', ?)",
-            (session_id, content),
+
+async def _settle_interrupted_reply(
+    session_id: int, content: str, user_message_id: int, streamed: str
+) -> None:
+    """Close out a streamed exchange whose reply didn't finish."""
+    try:
+        if streamed.strip():
+            await _save_assistant_reply(
+                session_id,
+                content,
+                ChatResponse(response=streamed, translation=_INTERRUPTED, feedback=""),
+            )
+        else:
+            async with get_db() as db:
+                await db.execute(
+                    "DELETE FROM chat_messages WHERE id = ?", (user_message_id,)
+                )
+                await db.commit()
+    except Exception:
+        logger.exception("Failed to settle interrupted reply in session %d", session_id)
+
+
+def _summary_context(summary: str | None) -> str | None:
+    if not summary:
+        return None
+    return f"Summary of the earlier part of this conversation:\n{summary}"
+
+
+def _annotated_chunk(text: str) -> dict:
+    return {
+        "text": text,
+        "pinyin": [{"char": c, "pinyin": p} for c, p in annotate_pinyin(text)],
+    }
+
+
+async def _save_user_message(
+    session_id: int, content: str
+) -> tuple[ChatMessageResponse, list[dict[str, str]], str | None] | None:
+    """Store a user message.
+
+    Returns (saved message, recent history, summary of older turns), or
+    None if the session doesn't exist. See chat_context for how the
+    history is bounded. Runs as one short transaction.
+    """
+    async with get_db() as db:
+        # Insert only if the session exists
+        rows = await db.execute_fetchall(
+            "INSERT INTO chat_messages (session_id, role, content) "
+            "SELECT id, 'user', ? FROM chat_sessions WHERE id = ? "
+            f"RETURNING {_MESSAGE_COLS}",
+            (content, session_id),
         )
+        if not rows:
+            return None
+        # Build bounded conversation context for the provider
+        messages, summary = await chat_context.load_context(db, session_id)
         await db.commit()
-        user_msg_id = cursor.lastrowid
+    return _row_to_message(rows[0]), messages, summary
 
-        # Build conversation history for the provider
-        history_rows = await db.execute_fetchall(
-            "SELECT role, content FROM chat_messages WHERE session_id = ? ORDER BY id",
-            (session_id,),
-        )
-        messages = [{"role": r[0], "content": r[1]} for r in history_rows]
 
-        # Call AI provider
-        provider = get_chat_provider()
-        ai_response: ChatResponse = await provider.chat(messages)
+async def _save_assistant_reply(
+    session_id: int, content: str, ai_response: ChatResponse
+) -> ChatMessageResponse:
+    """Store the assistant's reply and auto-title the session if needed.
 
-        # Generate pinyin annotation
-        pinyin_pairs = annotate_pinyin(ai_response.response)
-        pinyin_json = json.dumps(
-            [{"char": c, "pinyin": p} for c, p in pinyin_pairs],
-            ensure_ascii=False,
-        )
+    content is the user message that prompted the reply. The insert and
+    the title update commit together as one short transaction.
+    """
+    # Generate pinyin annotation
+    pinyin_codes = await pinyin_store.encode(annotate_pinyin(ai_response.response))
+
+    # Use first ~20 chars of user's message as title
+    title = content[:20].strip()
+    if len(content) > 20:
+        title += "..."
 
-        # Save assistant message
-        cursor = await db.execute(
-            "INSERT INTO chat_messages (session_id, role, content, pinyin, translation, feedback, emotion) "
-            "VALUES (?, 'assistant', ?, ?, ?, ?, ?)",
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "INSERT INTO chat_messages (session_id, role, content, pinyin_codes, translation, feedback, emotion) "
+            "VALUES (?, 'assistant', ?, ?, ?, ?, ?) "
+            f"RETURNING {_MESSAGE_COLS}",
             (
                 session_id,
                 ai_response.response,
-                pinyin_json,
+                pinyin_codes,
                 ai_response.translation,
                 ai_response.feedback,
                 ai_response.emotion,
             ),
         )
-        await db.commit()
-        assistant_msg_id = cursor.lastrowid
-
         # Auto-title the session on the first exchange
-        title_rows = await db.execute_fetchall(
-            "SELECT title FROM chat_sessions WHERE id = ?", (session_id,)
-        )
-        if title_rows and title_rows[0][0] is None:
-            # Use first ~20 chars of user's message as title
-            title = content[:20].strip()
-            if len(content) > 20:
-                title += "..."
-            await db.execute(
-                "UPDATE chat_sessions SET title = ? WHERE id = ?",
-                (title, session_id),
-            )
-            await db.commit()
-
-        # Fetch the saved rows to return
-        user_row = await db.execute_fetchall(
-            "SELECT id, session_id, role, content, pinyin, translation, feedback, emotion, created_at "
-            "FROM chat_messages WHERE id = ?",
-            (user_msg_id,),
-        )
-        assistant_row = await db.execute_fetchall(
-            "SELECT id, session_id, role, content, pinyin, translation, feedback, emotion, created_at "
-            "FROM chat_messages WHERE id = ?",
-            (assistant_msg_id,),
+        await db.execute(
+            "UPDATE chat_sessions SET title = ? WHERE id = ? AND title IS NULL",
+            (title, session_id),
         )
-        return _row_to_message(user_row[0]), _row_to_message(assistant_row[0])
+        await db.commit()
+    chat_context.schedule_summary(session_id)
+    return _row_to_message(rows[0])
 
 
 async def segment_message(message_id: int) -> SegmentedMessageResponse | None:
-    """Segment an assistant message's content into word boundaries."""
-    async with get_db() as db:
+    """Segment an assistant message's content into word boundaries.
+
+    The segmentation is stored with the message on first use, so later
+    calls are a lookup.
+    """
+    async with get_db(readonly=True) as db:
         rows = await db.execute_fetchall(
-            "SELECT id, content, role FROM chat_messages WHERE id = ?",
+            "SELECT id, content, role, segments FROM chat_messages WHERE id = ?",
             (message_id,),
         )
-        if not rows:
-            return None
-        row = rows[0]
-        if row[2] != "assistant":
-            return None
+    if not rows:
+        return None
+    row = rows[0]
+    if row[2] != "assistant":
+        return None
 
-        content = row[1]
-        boundaries = segment_to_word_boundaries(content)
-        words = [
-            WordBoundary(start=start, end=end, word=word)
-            for start, end, word in boundaries
-        ]
-        return SegmentedMessageResponse(message_id=message_id, words=words)
+    if row[3] is not None:
+        segments = json.loads(row[3])
+    else:
+        segments = segment_text(row[1])
+        async with get_db() as db:
+            await db.execute(
+                "UPDATE chat_messages SET segments = ? WHERE id = ?",
+                (json.dumps(segments, ensure_ascii=False), message_id),
+            )
+            await db.commit()
+    words = [
+        WordBoundary(start=start, end=end, word=word)
+        for start, end, word in word_boundaries(segments)
+    ]
+    return SegmentedMessageResponse(message_id=message_id, words=words)
+
+
+def _decode_pinyin(
+    content: str, raw: str | None, codes: bytes | None
+) -> list[dict[str, str]] | None:
+    """Return pinyin pairs from compact codes, or legacy JSON if present.
+
+    Plain dicts are validated into PinyinPair by pydantic-core, which is
+    much cheaper than building each model in Python.
+    """
+    if codes is not None:
+        return pinyin_store.decode(content, codes)
+    if raw:
+        return json.loads(raw)
+    return None
 
 
 def _row_to_message(row) -> ChatMessageResponse:
-    pinyin_data = None
-    if row[4]:
-        pinyin_data = [PinyinPair(**p) for p in json.loads(row[4])]
     return ChatMessageResponse(
         id=row[0],
         session_id=row[1],
         role=row[2],
         content=row[3],
-        pinyin=pinyin_data,
-        translation=row[5],
-        feedback=row[6],
-        emotion=row[7],
-        created_at=row[8],
+        translation=row[4],
+        feedback=row[5],
+        emotion=row[6],
+        created_at=row[7],
+        pinyin=_decode_pinyin(row[3], row[8], row[9]),
     )
@@ -1,10 +1,11 @@
 import asyncio
 import json
 import random
+import sqlite3
 
-from backend.chinese.hsk import get_vocab
+from backend.chinese.hsk import vocab_level
 from backend.chinese.pinyin import pinyin_for_text
-from backend.database import get_db
+from backend.database import FLASHCARD_STATS_WINDOW, get_db
 from backend.models.flashcard import (
     FlashcardFromWordResponse,
     FlashcardResponse,
@@ -12,6 +13,7 @@ from backend.models.flashcard import (
     QuizQuestion,
 )
 from backend.providers.base import RateLimitError
+from backend.services import quiz_sampler
 
 
 # ---------------------------------------------------------------------------
@@ -30,12 +32,15 @@ def _row_to_card(row) -> FlashcardResponse:
         active=bool(row[7]),
         created_at=row[8],
         source=row[9],
+        image_thumb_path=row[10],
+        image_width=row[11],
+        image_height=row[12],
     )
 
 
 _CARD_COLS = (
     "id, chinese, pinyin, english, notes, audio_path, image_path, "
-    "active, created_at, source"
+    "active, created_at, source, image_thumb_path, image_width, image_height"
 )
 
 
@@ -57,26 +62,37 @@ Card:
 Reply with ONLY the note sentence, nothing else."""
 
 
-async def _generate_notes(card_id: int, chinese: str, pinyin: str, english: str) -> None:
-    """Call AI in the background to populate the notes field."""
+async def _generate_notes_batch(cards: list[tuple[int, str, str, str]]) -> None:
+    """Populate notes for (id, chinese, pinyin, english) cards in one AI call."""
     try:
         from backend.providers.registry import get_chat_provider
 
         provider = get_chat_provider()
-        prompt = _NOTES_PROMPT.format(chinese=chinese, pinyin=pinyin, english=english)
-        notes = await provider.generate_text(prompt)
-        notes = notes.strip().strip('"')
-        if notes:
+        prompts = [
+            _NOTES_PROMPT.format(chinese=chinese, pinyin=pinyin, english=english)
+            for _, chinese, pinyin, english in cards
+        ]
+        replies = await provider.generate_batch(prompts)
+        updates = [
+            (notes, card[0])
+            for card, reply in zip(cards, replies)
+            if (notes := reply.strip().strip('"'))
+        ]
+        if updates:
             async with get_db() as db:
-                await db.execute(
-                    "UPDATE flashcards SET notes = ? WHERE id = ?",
-                    (notes, card_id),
+                await db.executemany(
+                    "UPDATE flashcards SET notes = ? WHERE id = ?", updates
                 )
                 await db.commit()
     except Exception:
         pass  # non-critical — card works without notes
 
 
+async def _generate_notes(card_id: int, chinese: str, pinyin: str, english: str) -> None:
+    """Call AI in the background to populate the notes field."""
+    await _generate_notes_batch([(card_id, chinese, pinyin, english)])
+
+
 # ---------------------------------------------------------------------------
 # From-word creation (chat integration)
 # ---------------------------------------------------------------------------
@@ -96,33 +112,67 @@ async def create_card_from_word(
     Auto-generates pinyin (local) and English (via AI).
     Returns existing card with duplicate=True if the word already exists.
     """
-    # Check for duplicate
-    async with get_db() as db:
-        rows = await db.execute_fetchall(
-            f"SELECT {_CARD_COLS} FROM flashcards WHERE chinese = ?",
-            (word,),
-        )
-        if rows:
-            return FlashcardFromWordResponse(
-                card=_row_to_card(rows[0]), duplicate=True
-            )
+    return (await create_cards_from_words([word], source=source))[0]
 
-    # Auto-generate pinyin
-    pin = pinyin_for_text(word)
 
-    # Auto-generate English via AI
-    from backend.providers.registry import get_chat_provider
+async def create_cards_from_words(
+    words: list[str], source: str = "chat"
+) -> list[FlashcardFromWordResponse]:
+    """Create flashcards for many Chinese words at once.
 
-    provider = get_chat_provider()
-    prompt = _TRANSLATE_PROMPT.format(word=word)
-    english = await provider.generate_text(prompt)
-    english = english.strip().strip('"').strip("'")
+    Translations for all new words come from one batched AI call, and their
+    notes from another. Results follow the order of `words` (duplicates in
+    the input collapse to one entry).
+    """
+    words = list(dict.fromkeys(words))
+    placeholders = ", ".join("?" * len(words))
 
-    # Create the card (this also fires background notes generation)
-    card = await create_card(
-        chinese=word, pinyin=pin, english=english, source=source
-    )
-    return FlashcardFromWordResponse(card=card, duplicate=False)
+    async def _existing() -> dict[str, FlashcardResponse]:
+        async with get_db(readonly=True) as db:
+            rows = await db.execute_fetchall(
+                f"SELECT {_CARD_COLS} FROM flashcards WHERE chinese IN ({placeholders})",
+                words,
+            )
+        return {r[1]: _row_to_card(r) for r in rows}
+
+    # Check for duplicates
+    existing = await _existing()
+    new_words = [w for w in words if w not in existing]
+
+    created: dict[str, FlashcardResponse] = {}
+    if new_words:
+        # Auto-generate English via AI, one request for the whole batch
+        from backend.providers.registry import get_chat_provider
+
+        provider = get_chat_provider()
+        replies = await provider.generate_batch(
+            [_TRANSLATE_PROMPT.format(word=w) for w in new_words]
+        )
+        for word, english in zip(new_words, replies):
+            english = english.strip().strip('"').strip("'")
+            try:
+                created[word] = await create_card(
+                    chinese=word,
+                    pinyin=pinyin_for_text(word),
+                    english=english,
+                    source=source,
+                    generate_notes=False,
+                )
+            except ValueError:
+                pass  # lost a race with a concurrent request for the same word
+        if created:
+            asyncio.create_task(_generate_notes_batch([
+                (c.id, c.chinese, c.pinyin, c.english) for c in created.values()
+            ]))
+        if len(created) < len(new_words):
+            existing = await _existing()
+
+    return [
+        FlashcardFromWordResponse(card=created[w], duplicate=False)
+        if w in created
+        else FlashcardFromWordResponse(card=existing[w], duplicate=True)
+        for w in words
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -135,6 +185,7 @@ async def create_card(
     english: str,
     notes: str | None = None,
     source: str = "manual",
+    generate_notes: bool = True,
 ) -> FlashcardResponse:
     # Auto-generate pinyin if not provided
     if not pinyin.strip():
@@ -143,11 +194,14 @@ async def create_card(
     english = english.lower()
 
     async with get_db() as db:
-        cursor = await db.execute(
-            "INSERT INTO flashcards (chinese, pinyin, english, notes, source) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (chinese, pinyin, english, notes, source),
-        )
+        try:
+            cursor = await db.execute(
+                "INSERT INTO flashcards (chinese, pinyin, english, notes, source) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (chinese, pinyin, english, notes, source),
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"A card for {chinese} already exists")
         await db.commit()
         card_id = cursor.lastrowid
         rows = await db.execute_fetchall(
@@ -155,14 +209,15 @@ async def create_card(
             (card_id,),
         )
         card = _row_to_card(rows[0])
+    quiz_sampler.invalidate()
 
     # Fire-and-forget AI notes generation (only if no notes provided)
-    if not notes:
+    if not notes and generate_notes:
         asyncio.create_task(_generate_notes(card_id, chinese, pinyin, english))
 
-    # Fire-and-forget asset generation (TTS audio + CC image)
-    from backend.services.asset_worker import process_card_assets
-    asyncio.create_task(process_card_assets(card_id, chinese, english))
+    # Queue asset generation (TTS audio + CC image)
+    from backend.services import asset_queue
+    await asset_queue.enqueue([card_id])
 
     return card
 
@@ -176,7 +231,9 @@ async def regenerate_card_assets(card_id: int) -> FlashcardResponse | None:
     # Clear existing fields so polling knows to wait
     async with get_db() as db:
         await db.execute(
-            "UPDATE flashcards SET notes = NULL, audio_path = NULL, image_path = NULL "
+            "UPDATE flashcards SET notes = NULL, audio_path = NULL, image_path = NULL, "
+            "image_thumb_path = NULL, image_width = NULL, image_height = NULL, "
+            "image_bytes = NULL, image_thumb_bytes = NULL "
             "WHERE id = ?",
             (card_id,),
         )
@@ -186,15 +243,15 @@ async def regenerate_card_assets(card_id: int) -> FlashcardResponse | None:
     asyncio.create_task(
         _generate_notes(card_id, card.chinese, card.pinyin, card.english)
     )
-    from backend.services.asset_worker import process_card_assets
-    asyncio.create_task(process_card_assets(card_id, card.chinese, card.english))
+    from backend.services import asset_queue
+    await asset_queue.enqueue([card_id])
 
     # Return the card with cleared fields so the frontend starts polling
     return await get_card(card_id)
 
 
 async def list_cards(active_only: bool | None = None) -> list[FlashcardResponse]:
-    async with get_db() as db:
+    async with get_db(readonly=True) as db:
         if active_only is True:
             rows = await db.execute_fetchall(
                 f"SELECT {_CARD_COLS} FROM flashcards WHERE active = 1 ORDER BY id"
@@ -211,7 +268,7 @@ async def list_cards(active_only: bool | None = None) -> list[FlashcardResponse]
 
 
 async def get_card(card_id: int) -> FlashcardResponse | None:
-    async with get_db() as db:
+    async with get_db(readonly=True) as db:
         rows = await db.execute_fetchall(
             f"SELECT {_CARD_COLS} FROM flashcards WHERE id = ?",
             (card_id,),
@@ -230,6 +287,9 @@ async def update_card(card_id: int, **fields) -> FlashcardResponse | None:
     # Convert bool active to int for SQLite
     if "active" in updates:
         updates["active"] = int(updates["active"])
+    # English is stored lowercase (see create_card)
+    if "english" in updates:
+        updates["english"] = updates["english"].lower()
 
     set_clause = ", ".join(f"{k} = ?" for k in updates)
     values = list(updates.values()) + [card_id]
@@ -240,11 +300,16 @@ async def update_card(card_id: int, **fields) -> FlashcardResponse | None:
         )
         if not rows:
             return None
-        await db.execute(
-            f"UPDATE flashcards SET {set_clause} WHERE id = ?",
-            values,
-        )
+        try:
+            await db.execute(
+                f"UPDATE flashcards SET {set_clause} WHERE id = ?",
+                values,
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"A card for {updates['chinese']} already exists")
         await db.commit()
+    if updates.keys() & {"chinese", "english", "active"}:
+        quiz_sampler.invalidate()
 
     return await get_card(card_id)
 
@@ -257,56 +322,52 @@ async def delete_card(card_id: int) -> bool | str:
     """
     async with get_db() as db:
         rows = await db.execute_fetchall(
-            "SELECT id, active FROM flashcards WHERE id = ?", (card_id,)
+            "SELECT id, active, audio_hash FROM flashcards WHERE id = ?", (card_id,)
         )
         if not rows:
             return False
         if rows[0][1] == 1:
             return "Cannot delete an active card. Deactivate it first."
+        audio_hash = rows[0][2]
         await db.execute(
             "DELETE FROM flashcard_attempts WHERE card_id = ?", (card_id,)
         )
+        await db.execute(
+            "DELETE FROM flashcard_stats WHERE card_id = ?", (card_id,)
+        )
+        await db.execute(
+            "DELETE FROM asset_jobs WHERE card_id = ? AND status = 'pending'", (card_id,)
+        )
         await db.execute(
             "DELETE FROM flashcards WHERE id = ?", (card_id,)
         )
         await db.commit()
-        return True
+    quiz_sampler.invalidate()
+    if audio_hash:
+        from backend.services import tts_store
+        await tts_store.release(audio_hash)
+    return True
 
 
 # ---------------------------------------------------------------------------
 # Quiz — weighted card selection
 # ---------------------------------------------------------------------------
 
-_WINDOW_SIZE = 10  # look at last N attempts per card for weighting
+_WINDOW_SIZE = FLASHCARD_STATS_WINDOW  # look at last N attempts per card for weighting
+_WINDOW_MASK = (1 << _WINDOW_SIZE) - 1
 
 
-async def _get_card_weights(db) -> dict[int, float]:
-    """Compute selection weights for active cards based on correctness history.
+def _card_weight(recent_mask: int | None, recent_count: int | None) -> float:
+    """Compute a card's selection weight from its rolling correctness window.
 
     Cards with lower correctness get higher weight (appear more often).
     Cards with no history get weight 1.0 (same as 0% correct).
     """
-    rows = await db.execute_fetchall(
-        "SELECT id FROM flashcards WHERE active = 1"
-    )
-    card_ids = [r[0] for r in rows]
-    if not card_ids:
-        return {}
-
-    weights: dict[int, float] = {}
-    for card_id in card_ids:
-        attempts = await db.execute_fetchall(
-            "SELECT correct FROM flashcard_attempts WHERE card_id = ? "
-            "ORDER BY id DESC LIMIT ?",
-            (card_id, _WINDOW_SIZE),
-        )
-        if not attempts:
-            weights[card_id] = 1.0  # no history — full weight
-        else:
-            correctness = sum(a[0] for a in attempts) / len(attempts)
-            # Invert: 100% correct → 0.1 weight, 0% correct → 1.0 weight
-            weights[card_id] = max(0.1, 1.0 - correctness * 0.9)
-    return weights
+    if not recent_count:
+        return 1.0  # no history — full weight
+    correctness = bin(recent_mask).count("1") / recent_count
+    # Invert: 100% correct → 0.1 weight, 0% correct → 1.0 weight
+    return max(0.1, 1.0 - correctness * 0.9)
 
 
 async def get_quiz_question(
@@ -316,50 +377,43 @@ async def get_quiz_question(
     if quiz_type is None:
         quiz_type = random.choice(["en_to_zh", "zh_to_en"])
 
-    async with get_db() as db:
-        rows = await db.execute_fetchall(
-            f"SELECT {_CARD_COLS} FROM flashcards WHERE active = 1"
-        )
-        if not rows:
-            return None
-
-        cards = [_row_to_card(r) for r in rows]
+    sampler = await quiz_sampler.get_sampler(_card_weight)
+    if not len(sampler):
+        return None
 
-        # Filter out already-seen cards in this session
-        available = [c for c in cards if c.id not in (exclude_ids or [])]
-        if not available:
-            return None  # session exhausted
+    # Weighted random selection, skipping cards already seen this session
+    target_id = sampler.draw(exclude=set(exclude_ids or ()))
+    if target_id is None:
+        return None  # session exhausted
 
-        # Weighted random selection
-        weights = await _get_card_weights(db)
-        pool = available
-        w = [weights.get(c.id, 1.0) for c in pool]
-        target = random.choices(pool, weights=w, k=1)[0]
+    target = await get_card(target_id)
+    if target is None:
+        quiz_sampler.invalidate()
+        return None
 
-        if quiz_type == "en_to_zh":
-            prompt = target.english
-            correct = target.chinese
-            wrong_pool = [c.chinese for c in cards if c.id != target.id]
-        else:
-            prompt = target.chinese
-            correct = target.english
-            wrong_pool = [c.english for c in cards if c.id != target.id]
-
-        # Deduplicate wrong options and pick up to 3
-        wrong_pool = list(set(wrong_pool) - {correct})
-        wrong = random.sample(wrong_pool, min(3, len(wrong_pool)))
-        options = wrong + [correct]
-        random.shuffle(options)
-
-        return QuizQuestion(
-            card_id=target.id,
-            quiz_type=quiz_type,
-            prompt=prompt,
-            pinyin=target.pinyin if quiz_type == "zh_to_en" else None,
-            options=options,
-            audio_path=target.audio_path,
-            image_path=target.image_path,
-        )
+    field = 0 if quiz_type == "en_to_zh" else 1
+    if quiz_type == "en_to_zh":
+        prompt = target.english
+        correct = target.chinese
+    else:
+        prompt = target.chinese
+        correct = target.english
+
+    # Pick up to 3 distinct wrong options from the rest of the deck
+    wrong = sampler.sample_texts(3, field=field, skip_id=target.id, skip_text=correct)
+    options = wrong + [correct]
+    random.shuffle(options)
+
+    return QuizQuestion(
+        card_id=target.id,
+        quiz_type=quiz_type,
+        prompt=prompt,
+        pinyin=target.pinyin if quiz_type == "zh_to_en" else None,
+        options=options,
+        audio_path=target.audio_path,
+        image_path=target.image_path,
+        image_thumb_path=target.image_thumb_path,
+    )
 
 
 async def submit_answer(
@@ -382,8 +436,23 @@ async def submit_answer(
             "VALUES (?, ?, ?)",
             (card_id, int(is_correct), quiz_type),
         )
+        # Roll the result into the per-card window in the same transaction
+        stats = await db.execute_fetchall(
+            "INSERT INTO flashcard_stats "
+            "(card_id, recent_mask, recent_count, total_attempts, last_seen) "
+            "VALUES (?, ?, 1, 1, datetime('now')) "
+            "ON CONFLICT(card_id) DO UPDATE SET "
+            "recent_mask = ((recent_mask << 1) | excluded.recent_mask) & ?, "
+            "recent_count = MIN(recent_count + 1, ?), "
+            "total_attempts = total_attempts + 1, "
+            "last_seen = excluded.last_seen "
+            "RETURNING recent_mask, recent_count",
+            (card_id, int(is_correct), _WINDOW_MASK, _WINDOW_SIZE),
+        )
         await db.commit()
 
+    quiz_sampler.update_weight(card_id, _card_weight(stats[0][0], stats[0][1]))
+
     return QuizAnswerResponse(correct=is_correct, correct_answer=correct_answer)
 
 
@@ -392,34 +461,45 @@ async def submit_answer(
 # ---------------------------------------------------------------------------
 
 
+# Checked explicitly rather than left to the unique index on chinese, which
+# databases with legacy duplicates only have as a plain index
+_SEED_INSERT = (
+    "INSERT INTO flashcards (chinese, pinyin, english, source) "
+    "SELECT ?, ?, ?, 'seed' "
+    "WHERE NOT EXISTS (SELECT 1 FROM flashcards WHERE chinese = ?)"
+)
+
+
 async def seed_cards(level: int = 2, count: int = 10) -> int:
     """Insert HSK seed cards, skipping any that already exist.
 
     Returns the number of new cards actually seeded.
     """
-    vocab = get_vocab(level)
-    random.shuffle(vocab)
+    vocab = vocab_level(level)
+    # Visit the level in random order, stopping once `count` are inserted
+    order = random.sample(range(len(vocab)), len(vocab))
 
-    seeded = 0
+    seeded: list[tuple[int, str, str, str]] = []
     async with get_db() as db:
-        for entry in vocab:
-            if seeded >= count:
+        for i in order:
+            if len(seeded) >= count:
                 break
-            # Skip duplicates
-            rows = await db.execute_fetchall(
-                "SELECT id FROM flashcards WHERE chinese = ?",
-                (entry["chinese"],),
-            )
-            if rows:
-                continue
-            await db.execute(
-                "INSERT INTO flashcards (chinese, pinyin, english, source) "
-                "VALUES (?, ?, ?, 'seed')",
-                (entry["chinese"], entry["pinyin"], entry["english"].lower()),
+            entry = vocab[i]
+            english = entry["english"].lower()
+            cursor = await db.execute(
+                _SEED_INSERT,
+                (entry["chinese"], entry["pinyin"], english, entry["chinese"]),
             )
-            seeded += 1
+            if cursor.rowcount:
+                seeded.append((cursor.lastrowid, entry["chinese"], entry["pinyin"], english))
         await db.commit()
-    return seeded
+    if seeded:
+        quiz_sampler.invalidate()
+        # Notes for the whole seed batch in a single AI call
+        asyncio.create_task(_generate_notes_batch(seeded))
+        from backend.services import asset_queue
+        await asset_queue.enqueue(card_id for card_id, *_ in seeded)
+    return len(seeded)
 
 
 # ---------------------------------------------------------------------------
@@ -458,23 +538,8 @@ def _hsk_level_from_source(source: str) -> int | None:
     return int(m.group(1)) if m else None
 
 
-async def get_example_sentence(card_id: int) -> dict:
-    """Generate an example sentence for a specific flashcard word.
-
-    If the card originated from Mad Libs (source like 'madlibs-hsk1'),
-    uses the known HSK level for grammar patterns and stores the
-    sentence in the Mad Libs question bank.
-    """
-    card = await get_card(card_id)
-    if card is None:
-        raise ValueError("Card not found")
-
+def _example_prompt(card: FlashcardResponse, hsk_level: int | None) -> str:
     word = card.chinese
-    hsk_level = _hsk_level_from_source(card.source)
-
-    from backend.providers.registry import get_chat_provider
-    provider = get_chat_provider()
-
     if hsk_level is not None:
         from backend.chinese.hsk import get_grammar
         grammar = get_grammar(hsk_level)
@@ -488,28 +553,29 @@ async def get_example_sentence(card_id: int) -> dict:
                 f"Here are the grammar patterns for HSK {hsk_level}. "
                 f"If possible, demonstrate one of these patterns:\n{patterns}\n\n"
             )
-        prompt = _EXAMPLE_SENTENCE_PROMPT.format(
+        return _EXAMPLE_SENTENCE_PROMPT.format(
             word=word, pinyin=card.pinyin, english=card.english,
             level=hsk_level, grammar_section=grammar_section,
         )
-    else:
-        prompt = _EXAMPLE_SENTENCE_PROMPT_NOLEVEL.format(
-            word=word, pinyin=card.pinyin, english=card.english,
-        )
+    return _EXAMPLE_SENTENCE_PROMPT_NOLEVEL.format(
+        word=word, pinyin=card.pinyin, english=card.english,
+    )
+
 
+async def _finish_example_sentence(
+    card: FlashcardResponse, hsk_level: int | None, response: str | None
+) -> dict:
+    """Parse an example-sentence reply (None if rate limited) and store it."""
+    word = card.chinese
     sentence_zh = ""
     sentence_en = ""
 
-    try:
-        response = await provider.generate_text(prompt)
-        for line in response.strip().split("\n"):
-            line = line.strip()
-            if line.lower().startswith("chinese:"):
-                sentence_zh = line.split(":", 1)[1].strip()
-            elif line.lower().startswith("english:"):
-                sentence_en = line.split(":", 1)[1].strip()
-    except RateLimitError:
-        pass
+    for line in (response or "").strip().split("\n"):
+        line = line.strip()
+        if line.lower().startswith("chinese:"):
+            sentence_zh = line.split(":", 1)[1].strip()
+        elif line.lower().startswith("english:"):
+            sentence_en = line.split(":", 1)[1].strip()
 
     if not sentence_zh or not sentence_en or word not in sentence_zh:
         sentence_zh = f"我喜欢{word}。"
@@ -519,16 +585,62 @@ async def get_example_sentence(card_id: int) -> dict:
 
     # Store in Mad Libs question bank if we know the HSK level
     if hsk_level is not None and word in sentence_zh:
-        async with get_db() as db:
-            await db.execute(
-                "INSERT INTO game_sentences (hsk_level, vocab_word, sentence_zh, sentence_en) "
-                "VALUES (?, ?, ?, ?)",
-                (hsk_level, word, sentence_zh, sentence_en),
-            )
-            await db.commit()
+        from backend.services import sentence_bank
+        await sentence_bank.add_sentence(hsk_level, word, sentence_zh, sentence_en)
 
     return {
         "sentence_zh": sentence_zh,
         "sentence_en": sentence_en,
         "pinyin_sentence": pinyin_sentence,
     }
+
+
+async def get_example_sentence(card_id: int) -> dict:
+    """Generate an example sentence for a specific flashcard word.
+
+    If the card originated from Mad Libs (source like 'madlibs-hsk1'),
+    uses the known HSK level for grammar patterns and stores the
+    sentence in the Mad Libs question bank.
+    """
+    card = await get_card(card_id)
+    if card is None:
+        raise ValueError("Card not found")
+
+    hsk_level = _hsk_level_from_source(card.source)
+
+    from backend.providers.registry import get_chat_provider
+    provider = get_chat_provider()
+
+    try:
+        response = await provider.generate_text(_example_prompt(card, hsk_level))
+    except RateLimitError:
+        response = None
+
+    return await _finish_example_sentence(card, hsk_level, response)
+
+
+async def get_example_sentences(card_ids: list[int]) -> list[dict]:
+    """Generate example sentences for many cards in one batched AI call.
+
+    Unknown card ids are skipped; each result carries its card_id.
+    """
+    cards = [c for c in [await get_card(cid) for cid in card_ids] if c is not None]
+    if not cards:
+        return []
+    levels = [_hsk_level_from_source(c.source) for c in cards]
+
+    from backend.providers.registry import get_chat_provider
+    provider = get_chat_provider()
+
+    try:
+        responses: list[str | None] = await provider.generate_batch(
+            [_example_prompt(c, lvl) for c, lvl in zip(cards, levels)]
+        )
+    except RateLimitError:
+        responses = [None] * len(cards)
+
+    results = []
+    for card, hsk_level, response in zip(cards, levels, responses):
+        result = await _finish_example_sentence(card, hsk_level, response)
+        results.append({"card_id": card.id, **result})
+    return results
@@ -1,12 +1,12 @@
 import random
 import re
 
-from backend.chinese.hsk import get_vocab, get_grammar
+from backend.chinese.hsk import get_grammar, sample_vocab, vocab_level
 from backend.chinese.pinyin import pinyin_for_text
 from backend.chinese.segmentation import segment_text
 from backend.database import get_db, get_dedede_audio_path
 from backend.models.game import MatchingPair, MatchingRound, MadLibsRound, ScramblerRound, SentenceCount, TuneInRound, AudioCardCount, ScrambleHarderRound, DededeRound, GameSentence, GameSentenceList
-from backend.providers.base import RateLimitError
+from backend.services import madlibs_pool, sentence_bank
 
 _ZH_PUNCT = re.compile(r'[，。！？、；：""''《》（）…—\s]+')
 
@@ -23,7 +23,7 @@ async def get_matching_round(hsk_level: int) -> MatchingRound:
     pairs: list[MatchingPair] = []
 
     # Try flashcards first
-    async with get_db() as db:
+    async with get_db(readonly=True) as db:
         rows = await db.execute_fetchall(
             "SELECT chinese, pinyin, english, audio_path FROM flashcards WHERE active = 1"
         )
@@ -37,18 +37,12 @@ async def get_matching_round(hsk_level: int) -> MatchingRound:
     # Supplement from HSK data if fewer than 4
     if len(pairs) < 4:
         existing_zh = {p.chinese for p in pairs}
-        vocab = get_vocab(hsk_level)
-        random.shuffle(vocab)
-        for entry in vocab:
-            if entry["chinese"] not in existing_zh:
-                pairs.append(MatchingPair(
-                    chinese=entry["chinese"],
-                    pinyin=entry["pinyin"],
-                    english=entry["english"],
-                ))
-                existing_zh.add(entry["chinese"])
-            if len(pairs) >= 4:
-                break
+        for entry in sample_vocab(hsk_level, 4 - len(pairs), exclude=existing_zh):
+            pairs.append(MatchingPair(
+                chinese=entry["chinese"],
+                pinyin=entry["pinyin"],
+                english=entry["english"],
+            ))
 
     return MatchingRound(pairs=pairs[:4])
 
@@ -71,24 +65,8 @@ Chinese: <full Chinese sentence>
 English: <English translation>"""
 
 
-async def _generate_sentence(hsk_level: int) -> dict:
-    """Pick a random HSK vocab word, generate a sentence via LLM, store it."""
-    vocab = get_vocab(hsk_level)
-    entry = random.choice(vocab)
-    word = entry["chinese"]
-
-    grammar = get_grammar(hsk_level)
-    grammar_patterns = "\n".join(
-        f"- {g['pattern']} ({g['english']}), e.g. {g['example']}"
-        for g in grammar
-    )
-
-    from backend.providers.registry import get_chat_provider
-    provider = get_chat_provider()
-    prompt = _SENTENCE_PROMPT.format(word=word, level=hsk_level, grammar_patterns=grammar_patterns)
-    response = await provider.generate_text(prompt)
-
-    # Parse response
+def _parse_sentence_reply(response: str) -> tuple[str, str]:
+    """Parse a 'Chinese: ... / English: ...' reply into (zh, en)."""
     sentence_zh = ""
     sentence_en = ""
     for line in response.strip().split("\n"):
@@ -97,22 +75,49 @@ async def _generate_sentence(hsk_level: int) -> dict:
             sentence_zh = line.split(":", 1)[1].strip()
         elif line.lower().startswith("english:"):
             sentence_en = line.split(":", 1)[1].strip()
+    return sentence_zh, sentence_en
+
 
-    if not sentence_zh or not sentence_en or word not in sentence_zh:
-        # Fallback if parsing fails or word not present in sentence
-        sentence_zh = f"我喜欢{word}。"
-        sentence_en = f"I like {entry['english']}."
-
-    # Store in DB
-    async with get_db() as db:
-        await db.execute(
-            "INSERT INTO game_sentences (hsk_level, vocab_word, sentence_zh, sentence_en) "
-            "VALUES (?, ?, ?, ?)",
-            (hsk_level, word, sentence_zh, sentence_en),
+async def _generate_sentences(
+    hsk_level: int, count: int, *, served: bool = True
+) -> list[dict]:
+    """Generate sentences for `count` random HSK vocab words in one LLM call.
+
+    Each sentence is stored in the bank; the stored rows are returned.
+    """
+    entries = sample_vocab(hsk_level, count)
+
+    grammar = get_grammar(hsk_level)
+    grammar_patterns = "\n".join(
+        f"- {g['pattern']} ({g['english']}), e.g. {g['example']}"
+        for g in grammar
+    )
+
+    from backend.providers.registry import get_chat_provider
+    provider = get_chat_provider()
+    prompts = [
+        _SENTENCE_PROMPT.format(
+            word=e["chinese"], level=hsk_level, grammar_patterns=grammar_patterns
         )
-        await db.commit()
+        for e in entries
+    ]
+    # Always fresh: the same word should yield a new sentence each time
+    responses = await provider.generate_batch(prompts, cache=False)
+
+    results: list[dict] = []
+    for entry, response in zip(entries, responses):
+        word = entry["chinese"]
+        sentence_zh, sentence_en = _parse_sentence_reply(response)
+        if not sentence_zh or not sentence_en or word not in sentence_zh:
+            # Fallback if parsing fails or word not present in sentence
+            sentence_zh = f"我喜欢{word}。"
+            sentence_en = f"I like {entry['english']}."
 
-    return {"vocab_word": word, "sentence_zh": sentence_zh, "sentence_en": sentence_en}
+        # Store in DB
+        results.append(await sentence_bank.add_sentence(
+            hsk_level, word, sentence_zh, sentence_en, served=served
+        ))
+    return results
 
 
 async def _pick_stored_sentence(hsk_level: int, *, require_word_in_sentence: bool = False) -> dict | None:
@@ -122,55 +127,54 @@ async def _pick_stored_sentence(hsk_level: int, *, require_word_in_sentence: boo
     vocab_word actually appears as a substring of sentence_zh (needed for
     Mad Libs blanking).
     """
-    async with get_db() as db:
-        limit = 10 if require_word_in_sentence else 1
-        rows = await db.execute_fetchall(
-            "SELECT vocab_word, sentence_zh, sentence_en FROM game_sentences "
-            "WHERE hsk_level = ? ORDER BY RANDOM() LIMIT ?",
-            (hsk_level, limit),
-        )
-        if not rows:
-            return None
-        for r in rows:
-            result = {"vocab_word": r[0], "sentence_zh": r[1], "sentence_en": r[2]}
-            if not require_word_in_sentence or r[0] in r[1]:
-                return result
-        return None
+    limit = 10 if require_word_in_sentence else 1
+    for result in await sentence_bank.pick(hsk_level, limit):
+        if not require_word_in_sentence or result["vocab_word"] in result["sentence_zh"]:
+            return result
+    return None
+
+
+def _stored_segments(data: dict) -> list[str]:
+    """Word segments for a sentence, using the stored value when present."""
+    return data.get("segments") or segment_text(data["sentence_zh"])
+
+
+def _stored_pinyin(data: dict) -> str:
+    """Pinyin for a sentence, using the stored value when present."""
+    return data.get("pinyin") or pinyin_for_text(data["sentence_zh"])
 
 
 def _build_madlibs_options(vocab_word: str, hsk_level: int) -> list[str]:
     """Build 4 options: correct word + 3 distractors from the same HSK level."""
-    vocab = get_vocab(hsk_level)
-    distractors = [e["chinese"] for e in vocab if e["chinese"] != vocab_word]
-    random.shuffle(distractors)
-    options = distractors[:3] + [vocab_word]
+    distractors = sample_vocab(hsk_level, 3, exclude={vocab_word})
+    options = [e["chinese"] for e in distractors] + [vocab_word]
     random.shuffle(options)
     return options
 
 
 async def get_madlibs_round(hsk_level: int) -> MadLibsRound:
-    """Get a Mad Libs round: 70% reuse stored, 30% generate new."""
+    """Get a Mad Libs round: 70% reuse stored, 30% serve a fresh one.
+
+    Fresh sentences come from the background prefetch pool, so this never
+    calls the LLM on the request path.
+    """
     use_stored = random.random() < 0.7
     data = None
-    rate_limited = False
 
     if use_stored:
         data = await _pick_stored_sentence(hsk_level, require_word_in_sentence=True)
 
     if data is None:
-        try:
-            data = await _generate_sentence(hsk_level)
-        except RateLimitError:
-            rate_limited = True
-            data = await _pick_stored_sentence(hsk_level, require_word_in_sentence=True)
-        except Exception:
-            # LLM or SDK error (e.g. Gemini JSON parse failure) — fall back to stored
-            data = await _pick_stored_sentence(hsk_level, require_word_in_sentence=True)
-
-    # If still no data (empty DB + rate limited), build a simple fallback
+        data = await madlibs_pool.take(hsk_level)
+
+    if data is None:
+        data = await _pick_stored_sentence(hsk_level, require_word_in_sentence=True)
+
+    rate_limited = madlibs_pool.is_rate_limited()
+
+    # If still no data (empty DB, pool not yet filled), build a simple fallback
     if data is None:
-        vocab = get_vocab(hsk_level)
-        entry = random.choice(vocab)
+        entry = random.choice(vocab_level(hsk_level))
         word = entry["chinese"]
         data = {
             "vocab_word": word,
@@ -185,8 +189,8 @@ async def get_madlibs_round(hsk_level: int) -> MadLibsRound:
     # Create the blank version
     blanked = sentence_zh.replace(vocab_word, "____")
 
-    # Generate pinyin for the full sentence
-    pinyin_sentence = pinyin_for_text(sentence_zh)
+    # Pinyin for the full sentence
+    pinyin_sentence = _stored_pinyin(data)
 
     # Build options
     options = _build_madlibs_options(vocab_word, hsk_level)
@@ -207,12 +211,7 @@ async def get_madlibs_round(hsk_level: int) -> MadLibsRound:
 
 async def get_sentence_count(hsk_level: int) -> SentenceCount:
     """Return how many sentences exist for a given HSK level."""
-    async with get_db() as db:
-        rows = await db.execute_fetchall(
-            "SELECT COUNT(*) FROM game_sentences WHERE hsk_level = ?",
-            (hsk_level,),
-        )
-        count = rows[0][0] if rows else 0
+    count = await sentence_bank.count(hsk_level)
     return SentenceCount(hsk_level=hsk_level, count=count)
 
 
@@ -226,7 +225,7 @@ async def get_scrambler_round(hsk_level: int) -> ScramblerRound:
     sentence_en: str = data["sentence_en"]
 
     # Segment and strip punctuation
-    segments = segment_text(sentence_zh)
+    segments = _stored_segments(data)
     correct_order = [seg for seg in segments if not _ZH_PUNCT.fullmatch(seg)]
 
     if not correct_order:
@@ -240,7 +239,7 @@ async def get_scrambler_round(hsk_level: int) -> ScramblerRound:
             if words != correct_order:
                 break
 
-    pinyin_sentence = pinyin_for_text(sentence_zh)
+    pinyin_sentence = _stored_pinyin(data)
 
     return ScramblerRound(
         sentence_en=sentence_en,
@@ -257,7 +256,7 @@ async def get_scrambler_round(hsk_level: int) -> ScramblerRound:
 
 async def get_audio_card_count() -> AudioCardCount:
     """Return how many active flashcards have audio."""
-    async with get_db() as db:
+    async with get_db(readonly=True) as db:
         rows = await db.execute_fetchall(
             "SELECT COUNT(*) FROM flashcards WHERE active = 1 AND audio_path IS NOT NULL"
         )
@@ -267,7 +266,7 @@ async def get_audio_card_count() -> AudioCardCount:
 
 async def get_tunein_round(hsk_level: int) -> TuneInRound:
     """Pick a random flashcard with audio and build a 4-option listening round."""
-    async with get_db() as db:
+    async with get_db(readonly=True) as db:
         rows = await db.execute_fetchall(
             "SELECT chinese, pinyin, english, audio_path "
             "FROM flashcards WHERE active = 1 AND audio_path IS NOT NULL"
@@ -291,14 +290,10 @@ async def get_tunein_round(hsk_level: int) -> TuneInRound:
     # Supplement from HSK data if not enough distractors
     if len(distractors) < 3:
         existing = {correct_zh} | set(distractors)
-        vocab = get_vocab(hsk_level)
-        random.shuffle(vocab)
-        for entry in vocab:
-            if entry["chinese"] not in existing:
-                distractors.append(entry["chinese"])
-                existing.add(entry["chinese"])
-            if len(distractors) >= 3:
-                break
+        distractors.extend(
+            e["chinese"]
+            for e in sample_vocab(hsk_level, 3 - len(distractors), exclude=existing)
+        )
 
     options = distractors[:3] + [correct_zh]
     random.shuffle(options)
@@ -323,13 +318,7 @@ SCRAMBLE_HARDER_MIN = 20
 
 async def _pick_stored_sentences(hsk_level: int, count: int) -> list[dict]:
     """Pick multiple distinct random stored sentences for this level."""
-    async with get_db() as db:
-        rows = await db.execute_fetchall(
-            "SELECT vocab_word, sentence_zh, sentence_en FROM game_sentences "
-            "WHERE hsk_level = ? ORDER BY RANDOM() LIMIT ?",
-            (hsk_level, count),
-        )
-    return [{"vocab_word": r[0], "sentence_zh": r[1], "sentence_en": r[2]} for r in rows]
+    return await sentence_bank.pick(hsk_level, count)
 
 
 def _segment_english(text: str) -> list[str]:
@@ -355,12 +344,12 @@ async def get_scramble_harder_round(hsk_level: int) -> ScrambleHarderRound:
     if direction == "zh":
         # Unscramble Chinese; prompt is English
         prompt = sentence_en
-        segments = segment_text(sentence_zh)
+        segments = _stored_segments(main)
         correct_order = [seg for seg in segments if not _ZH_PUNCT.fullmatch(seg)]
         # Distractor words from the other sentences (Chinese)
         distractor_words: list[str] = []
         for ds in distractors_src:
-            segs = segment_text(ds["sentence_zh"])
+            segs = _stored_segments(ds)
             filtered = [s for s in segs if not _ZH_PUNCT.fullmatch(s)]
             distractor_words.extend(filtered)
     else:
@@ -387,7 +376,7 @@ async def get_scramble_harder_round(hsk_level: int) -> ScrambleHarderRound:
     words = list(correct_order) + chosen_distractors
     random.shuffle(words)
 
-    pinyin_sentence = pinyin_for_text(sentence_zh)
+    pinyin_sentence = _stored_pinyin(main)
 
     return ScrambleHarderRound(
         direction=direction,
@@ -406,18 +395,22 @@ async def get_scramble_harder_round(hsk_level: int) -> ScrambleHarderRound:
 # ---------------------------------------------------------------------------
 
 async def list_sentences(hsk_level: int | None = None) -> GameSentenceList:
-    """List all game sentences, optionally filtered by HSK level."""
-    async with get_db() as db:
+    """List all game sentences, optionally filtered by HSK level.
+
+    Sentences still waiting in the Mad Libs prefetch pool aren't listed.
+    """
+    async with get_db(readonly=True) as db:
         if hsk_level and hsk_level > 0:
             rows = await db.execute_fetchall(
                 "SELECT id, hsk_level, vocab_word, sentence_zh, sentence_en, created_at "
-                "FROM game_sentences WHERE hsk_level = ? ORDER BY created_at DESC",
+                "FROM game_sentences WHERE hsk_level = ? AND served = 1 "
+                "ORDER BY created_at DESC",
                 (hsk_level,),
             )
         else:
             rows = await db.execute_fetchall(
                 "SELECT id, hsk_level, vocab_word, sentence_zh, sentence_en, created_at "
-                "FROM game_sentences ORDER BY created_at DESC"
+                "FROM game_sentences WHERE served = 1 ORDER BY created_at DESC"
             )
     sentences = [
         GameSentence(
@@ -432,25 +425,31 @@ async def list_sentences(hsk_level: int | None = None) -> GameSentenceList:
 
 async def delete_sentence(sentence_id: int) -> bool:
     """Delete a game sentence by ID. Returns True if a row was deleted."""
-    async with get_db() as db:
-        cursor = await db.execute(
-            "DELETE FROM game_sentences WHERE id = ?", (sentence_id,)
-        )
-        await db.commit()
-        return cursor.rowcount > 0
+    madlibs_pool.discard(sentence_id)
+    return await sentence_bank.delete_sentence(sentence_id)
 
 
 # ---------------------------------------------------------------------------
 # Dedede (的得地)
 # ---------------------------------------------------------------------------
 
+_dedede_ids: sentence_bank.RowIdIndex | None = None
+
+
 async def get_dedede_round() -> DededeRound:
     """Pick a random 的/得/地 question."""
-    async with get_db() as db:
+    global _dedede_ids
+    async with get_db(readonly=True) as db:
+        # The question set is seeded once at startup, so cache its ids
+        if _dedede_ids is None:
+            id_rows = await db.execute_fetchall("SELECT id FROM dedede_questions")
+            _dedede_ids = sentence_bank.RowIdIndex(r[0] for r in id_rows)
+        picked = _dedede_ids.sample(1)
         rows = await db.execute_fetchall(
             "SELECT sentence, answer, english, pinyin "
-            "FROM dedede_questions ORDER BY RANDOM() LIMIT 1"
-        )
+            "FROM dedede_questions WHERE id = ?",
+            (picked[0],),
+        ) if picked else []
     if not rows:
         raise ValueError("No dedede questions available")
     r = rows[0]
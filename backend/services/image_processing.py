@@ -0,0 +1,92 @@
+"""Normalize fetched images into a display WebP and a thumbnail.
+
+Openverse hits are often multi-megabyte originals. Each one is decoded
+once and re-encoded as WebP: a display image capped at IMAGE_DISPLAY_MAX
+pixels on its longer side and a thumbnail capped at IMAGE_THUMB_MAX (the
+quiz and card list only show small images). Pillow work is CPU-bound,
+so it runs in a small process pool rather than on the event loop.
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+from backend.config import (
+    IMAGE_DISPLAY_MAX,
+    IMAGE_PROCESS_WORKERS,
+    IMAGE_THUMB_MAX,
+    IMAGE_WEBP_QUALITY,
+)
+from backend.processes import process_pool
+
+_pool: ProcessPoolExecutor | None = None
+
+
+class ImageInfo(NamedTuple):
+    width: int  # of the display image
+    height: int
+    display_bytes: int
+    thumb_bytes: int
+
+
+def _save_webp(img, path: Path) -> int:
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        img.save(tmp_path, "WEBP", quality=IMAGE_WEBP_QUALITY, method=4)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)  # no-op after the rename
+    return path.stat().st_size
+
+
+def _normalize(src: str, display: str, thumb: str) -> ImageInfo | None:
+    # Runs in a worker process
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(src) as original:
+            # Let JPEG decode at a reduced scale when the original is huge
+            original.draft("RGB", (IMAGE_DISPLAY_MAX, IMAGE_DISPLAY_MAX))
+            img = ImageOps.exif_transpose(original)
+            alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+            img = img.convert("RGBA" if alpha else "RGB")
+            img.thumbnail((IMAGE_DISPLAY_MAX, IMAGE_DISPLAY_MAX), Image.LANCZOS)
+            width, height = img.size
+            display_bytes = _save_webp(img, Path(display))
+            img.thumbnail((IMAGE_THUMB_MAX, IMAGE_THUMB_MAX), Image.LANCZOS)
+            thumb_bytes = _save_webp(img, Path(thumb))
+    except (OSError, Image.DecompressionBombError):
+        # Not an image, truncated, or too large to decode (UnidentifiedImageError
+        # is an OSError); don't leave a display image without its thumbnail
+        Path(display).unlink(missing_ok=True)
+        Path(thumb).unlink(missing_ok=True)
+        return None
+    return ImageInfo(width, height, display_bytes, thumb_bytes)
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = process_pool(IMAGE_PROCESS_WORKERS)
+    return _pool
+
+
+async def normalize(src: Path, display: Path, thumb: Path) -> ImageInfo | None:
+    """Write the display and thumbnail variants of src.
+
+    Returns None if src isn't a decodable image.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor(), _normalize, str(src), str(display), str(thumb)
+    )
+
+
+def shutdown() -> None:
+    """Stop the worker processes (called on shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,156 @@
+"""Background prefetch pool of fresh Mad Libs sentences per HSK level.
+
+A producer task keeps MADLIBS_POOL_TARGET generated-but-unserved sentences
+(game_sentences.served = 0) queued for each level, so the round endpoint
+never waits on the LLM. Each level's deficit is filled with one batched
+provider call; generation runs with bounded concurrency and
+backs off exponentially on RateLimitError (and on other provider errors,
+so a misconfigured key doesn't spin).
+"""
+
+import asyncio
+from collections import deque
+import logging
+
+from backend.config import MADLIBS_POOL_CONCURRENCY, MADLIBS_POOL_TARGET
+from backend.database import get_db
+from backend.providers.base import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+LEVELS = (1, 2, 3)
+
+_MAX_BACKOFF = 300.0  # seconds
+_IDLE_RECHECK = 60.0  # seconds between refill checks when nothing happens
+
+_fresh: dict[int, deque[int]] = {level: deque() for level in LEVELS}
+_wakeup = asyncio.Event()
+_backoff_until = 0.0
+_backoff_delay = 0.0
+_rate_limited = False  # whether the current backoff came from a 429
+_task: asyncio.Task | None = None
+
+
+def _backing_off() -> bool:
+    return asyncio.get_running_loop().time() < _backoff_until
+
+
+def is_rate_limited() -> bool:
+    """True while the producer is backing off after a 429."""
+    return _rate_limited and _backing_off()
+
+
+async def _load() -> None:
+    """Load unserved sentences left over from a previous run."""
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT id, hsk_level FROM game_sentences WHERE served = 0 ORDER BY id"
+        )
+    for queue in _fresh.values():
+        queue.clear()
+    for sentence_id, level in rows:
+        if level in _fresh:
+            _fresh[level].append(sentence_id)
+
+
+async def take(hsk_level: int) -> dict | None:
+    """Serve one fresh sentence from the pool, or None if it is empty."""
+    from backend.services import sentence_bank
+
+    queue = _fresh.get(hsk_level)
+    data = None
+    while queue and data is None:
+        sentence_id = queue.popleft()
+        async with get_db() as db:
+            await db.execute(
+                "UPDATE game_sentences SET served = 1 WHERE id = ?", (sentence_id,)
+            )
+            await db.commit()
+        data = await sentence_bank.get(sentence_id)  # None if deleted meanwhile
+        if data is not None:
+            await sentence_bank.register(sentence_id, hsk_level)
+    _wakeup.set()
+    return data
+
+
+def discard(sentence_id: int) -> None:
+    """Forget a deleted sentence so its level is refilled."""
+    for queue in _fresh.values():
+        if sentence_id in queue:
+            queue.remove(sentence_id)
+            _wakeup.set()
+            return
+
+
+def _back_off(rate_limited: bool) -> bool:
+    """Extend the backoff window; returns False if one is already running."""
+    global _backoff_until, _backoff_delay, _rate_limited
+    if _backing_off():
+        return False  # a concurrent failure already backed off
+    _rate_limited = rate_limited
+    _backoff_delay = min(_MAX_BACKOFF, max(5.0, _backoff_delay * 2))
+    _backoff_until = asyncio.get_running_loop().time() + _backoff_delay
+    return True
+
+
+async def _produce(level: int, count: int, sem: asyncio.Semaphore) -> None:
+    """Generate `count` sentences for a level in one batched provider call."""
+    global _backoff_delay
+    from backend.services.game_service import _generate_sentences
+
+    async with sem:
+        if _backing_off():
+            return
+        try:
+            generated = await _generate_sentences(level, count, served=False)
+        except RateLimitError:
+            if _back_off(rate_limited=True):
+                logger.warning(
+                    "Mad Libs prefetch rate limited; backing off %.0fs", _backoff_delay
+                )
+            return
+        except Exception:
+            if _back_off(rate_limited=False):
+                logger.warning(
+                    "Mad Libs prefetch failed for HSK %d", level, exc_info=True
+                )
+            return
+        _backoff_delay = 0.0
+        _fresh[level].extend(data["id"] for data in generated)
+
+
+async def _run() -> None:
+    await _load()
+    sem = asyncio.Semaphore(MADLIBS_POOL_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+    while True:
+        _wakeup.clear()
+        wanted = {
+            level: MADLIBS_POOL_TARGET - len(_fresh[level])
+            for level in LEVELS
+            if len(_fresh[level]) < MADLIBS_POOL_TARGET
+        }
+        if wanted and not _backing_off():
+            await asyncio.gather(
+                *(_produce(level, count, sem) for level, count in wanted.items())
+            )
+            continue
+        timeout = max(1.0, _backoff_until - loop.time()) if wanted else _IDLE_RECHECK
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start() -> None:
+    """Start the background producer (called from the app lifespan)."""
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_run())
+
+
+def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        _task = None
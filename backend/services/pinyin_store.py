@@ -0,0 +1,91 @@
+"""Compact storage for per-character pinyin annotations.
+
+Chat messages used to store pinyin as a JSON list of {"char", "pinyin"}
+objects, repeating the keys and every character already in `content`.
+Instead each syllable is interned once in the pinyin_syllables table and a
+message stores chat_messages.pinyin_codes: one little-endian uint16
+syllable id per character of `content`, aligned by position (id 0 means
+no pinyin). The syllable table is small (well under 2k tone-marked
+syllables), so it is kept in memory for encoding and decoding.
+"""
+
+import asyncio
+from array import array
+import sys
+
+from backend.database import get_db
+
+_syllables: list[str] = [""]  # id -> syllable; id 0 is "no pinyin"
+_ids: dict[str, int] = {"": 0}
+_loaded = False
+_lock = asyncio.Lock()
+
+
+async def load(db) -> None:
+    """(Re)load the syllable table from an open connection."""
+    global _loaded
+    rows = await db.execute_fetchall("SELECT id, syllable FROM pinyin_syllables")
+    size = max((r[0] for r in rows), default=0) + 1
+    syllables = [""] * size
+    for syllable_id, syllable in rows:
+        syllables[syllable_id] = syllable
+    _syllables[:] = syllables
+    _ids.clear()
+    _ids.update({s: i for i, s in enumerate(syllables) if s or i == 0})
+    _loaded = True
+
+
+async def ensure_loaded() -> None:
+    if not _loaded:
+        async with get_db(readonly=True) as db:
+            await load(db)
+
+
+async def intern(db, syllables) -> None:
+    """Add unseen syllables to the table via an open connection.
+
+    The caller commits.
+    """
+    new = sorted({s for s in syllables if s not in _ids})
+    if not new:
+        return
+    await db.executemany(
+        "INSERT OR IGNORE INTO pinyin_syllables (syllable) VALUES (?)",
+        [(s,) for s in new],
+    )
+    await load(db)
+
+
+def pack(pairs: list[tuple[str, str]]) -> bytes:
+    """Encode (char, pinyin) pairs whose syllables are all interned."""
+    codes = array("H", [_ids[p] for _, p in pairs])
+    if sys.byteorder == "big":
+        codes.byteswap()
+    return codes.tobytes()
+
+
+async def encode(pairs: list[tuple[str, str]]) -> bytes:
+    """Encode (char, pinyin) pairs, interning new syllables first.
+
+    Must not be called while holding the writer connection.
+    """
+    await ensure_loaded()
+    if any(p not in _ids for _, p in pairs):
+        async with _lock:
+            async with get_db() as db:
+                await intern(db, (p for _, p in pairs))
+                await db.commit()
+    return pack(pairs)
+
+
+def decode(content: str, blob: bytes) -> list[dict[str, str]]:
+    """Rebuild the API's [{"char", "pinyin"}] list for a message."""
+    codes = array("H")
+    codes.frombytes(blob)
+    if sys.byteorder == "big":
+        codes.byteswap()
+    syllables = _syllables
+    return [
+        {"char": char, "pinyin": syllables[code] if code < len(syllables) else ""}
+        for char, code in zip(content, codes)
+    ]
@@ -0,0 +1,187 @@
+"""Resident weighted sampler for quiz card selection.
+
+Keeps the active deck's selection weights in a Fenwick (binary indexed)
+tree so a weighted draw and a single-card weight update are both
+O(log n). Weights are stored as integers (millionths) so the tree's sums
+stay exact however many updates it has absorbed. The sampler is built lazily from the database on first use and
+dropped by `invalidate()` whenever the set of active cards or their text
+changes (create / update / delete / seed).
+"""
+
+import asyncio
+import random
+
+from backend.database import get_db
+
+_SCALE = 1_000_000  # weight units per 1.0
+
+
+def _scaled(weight: float) -> int:
+    return max(0, round(weight * _SCALE))
+
+
+class WeightedSampler:
+    """Fenwick tree over per-card weights, keyed by card id."""
+
+    def __init__(self, cards: list[tuple[int, str, str, float]]) -> None:
+        # cards: (card_id, chinese, english, weight)
+        self._ids = [c[0] for c in cards]
+        self._pos = {card_id: i for i, card_id in enumerate(self._ids)}
+        self._text = {c[0]: (c[1], c[2]) for c in cards}
+        self._weights = [_scaled(c[3]) for c in cards]
+        n = len(cards)
+        self._tree = [0] * (n + 1)
+        # O(n) Fenwick construction
+        for i in range(1, n + 1):
+            self._tree[i] += self._weights[i - 1]
+            parent = i + (i & -i)
+            if parent <= n:
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, card_id: int) -> bool:
+        return card_id in self._pos
+
+    def _add(self, index: int, delta: int) -> None:
+        i = index + 1
+        n = len(self._ids)
+        while i <= n:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, index: int) -> int:
+        """Sum of weights[0:index], in weight units."""
+        total = 0
+        i = index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def total(self) -> float:
+        return self._prefix(len(self._ids)) / _SCALE
+
+    def update(self, card_id: int, weight: float) -> None:
+        """Set a card's weight. Unknown ids are ignored."""
+        index = self._pos.get(card_id)
+        if index is None:
+            return
+        scaled = _scaled(weight)
+        self._add(index, scaled - self._weights[index])
+        self._weights[index] = scaled
+
+    def _find(self, target: int) -> int:
+        """Return the smallest index whose prefix sum exceeds target.
+
+        For 0 <= target < total that slot always has a positive weight.
+        """
+        pos = 0
+        step = 1 << len(self._ids).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= len(self._ids) and self._tree[nxt] <= target:
+                target -= self._tree[nxt]
+                pos = nxt
+            step >>= 1
+        return pos
+
+    def draw(self, exclude: set[int] | None = None) -> int | None:
+        """Draw one card id proportionally to weight, skipping `exclude`.
+
+        Excluded cards are zeroed for the duration of the draw and then
+        restored, so per-session exclusion never rebuilds the tree. Returns
+        None only when no eligible weight remains.
+        """
+        masked: list[tuple[int, int]] = []
+        for card_id in exclude or ():
+            index = self._pos.get(card_id)
+            if index is not None and self._weights[index] > 0:
+                masked.append((index, self._weights[index]))
+                self._add(index, -self._weights[index])
+                self._weights[index] = 0
+        try:
+            total = self._prefix(len(self._ids))
+            if total <= 0:
+                return None
+            return self._ids[self._find(random.randrange(total))]
+        finally:
+            for index, weight in masked:
+                self._add(index, weight)
+                self._weights[index] = weight
+
+    def text(self, card_id: int) -> tuple[str, str]:
+        """Return (chinese, english) for a card in the sampler."""
+        return self._text[card_id]
+
+    def sample_texts(
+        self, k: int, *, field: int, skip_id: int, skip_text: str
+    ) -> list[str]:
+        """Pick up to k distinct card texts uniformly, for quiz distractors.
+
+        field is 0 for chinese, 1 for english. Uses rejection sampling so
+        the cost is O(k) on large decks; small decks fall back to a scan.
+        """
+        picked: list[str] = []
+        seen = {skip_text}
+        n = len(self._ids)
+        for _ in range(k * 10):
+            if len(picked) >= k or n <= k + 1:
+                break
+            card_id = self._ids[random.randrange(n)]
+            value = self._text[card_id][field]
+            if card_id != skip_id and value not in seen:
+                seen.add(value)
+                picked.append(value)
+        if len(picked) < k:
+            pool = list({
+                t[field] for cid, t in self._text.items() if cid != skip_id
+            } - seen)
+            picked.extend(random.sample(pool, min(k - len(picked), len(pool))))
+        return picked
+
+
+_sampler: WeightedSampler | None = None
+_version = 0
+_lock = asyncio.Lock()
+
+
+def invalidate() -> None:
+    """Drop the resident sampler; it is rebuilt on the next quiz request."""
+    global _sampler, _version
+    _sampler = None
+    _version += 1
+
+
+async def get_sampler(weight_fn) -> WeightedSampler:
+    """Return the resident sampler, building it from the DB if needed.
+
+    weight_fn maps (recent_mask, recent_count) to a selection weight.
+    """
+    global _sampler
+    if _sampler is not None:
+        return _sampler
+    async with _lock:
+        if _sampler is not None:
+            return _sampler
+        version = _version
+        async with get_db(readonly=True) as db:
+            rows = await db.execute_fetchall(
+                "SELECT f.id, f.chinese, f.english, s.recent_mask, s.recent_count "
+                "FROM flashcards f LEFT JOIN flashcard_stats s ON s.card_id = f.id "
+                "WHERE f.active = 1 ORDER BY f.id"
+            )
+        sampler = WeightedSampler(
+            [(r[0], r[1], r[2], weight_fn(r[3], r[4])) for r in rows]
+        )
+        # Only keep it if nothing was invalidated while we were loading
+        if version == _version:
+            _sampler = sampler
+        return sampler
+
+
+def update_weight(card_id: int, weight: float) -> None:
+    """Apply a new weight to the resident sampler, if one is loaded."""
+    if _sampler is not None:
+        _sampler.update(card_id, weight)
@@ -0,0 +1,222 @@
+"""In-memory random access over the game sentence bank.
+
+`ORDER BY RANDOM()` sorts the whole table on every round. Instead we keep
+the row ids of each HSK level in memory, sample k of them, and fetch just
+those rows by primary key, so a pick costs O(k) regardless of bank size.
+The id arrays are loaded once and kept current by routing every insert
+and delete through this module. Sentences prefetched into the Mad Libs
+pool stay out of them until the pool serves them.
+
+Sentences never change after insertion, so their jieba segmentation and
+pinyin are computed once on write and stored alongside them.
+"""
+
+import asyncio
+import json
+import logging
+import random
+
+from backend.chinese.pinyin import annotate_many, pinyin_for_text
+from backend.chinese.segmentation import segment_many, segment_text
+from backend.database import get_db
+
+logger = logging.getLogger(__name__)
+
+
+class RowIdIndex:
+    """Set of row ids supporting O(1) add/remove and O(k) random sampling."""
+
+    def __init__(self, ids=()) -> None:
+        self._ids: list[int] = []
+        self._pos: dict[int, int] = {}
+        for row_id in ids:
+            self.add(row_id)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, row_id: int) -> None:
+        if row_id not in self._pos:
+            self._pos[row_id] = len(self._ids)
+            self._ids.append(row_id)
+
+    def remove(self, row_id: int) -> None:
+        index = self._pos.pop(row_id, None)
+        if index is None:
+            return
+        last = self._ids.pop()
+        if last != row_id:
+            # Swap-remove: move the last id into the vacated slot
+            self._ids[index] = last
+            self._pos[last] = index
+
+    def sample(self, k: int) -> list[int]:
+        return random.sample(self._ids, min(k, len(self._ids)))
+
+
+_levels: dict[int, RowIdIndex] | None = None
+_level_of: dict[int, int] = {}
+_lock = asyncio.Lock()
+
+_SENTENCE_COLS = "id, vocab_word, sentence_zh, sentence_en, segments, pinyin"
+
+
+def _nlp_fields(sentence_zh: str) -> tuple[str, str]:
+    """Return (segments JSON, pinyin) to persist for a sentence."""
+    segments = json.dumps(segment_text(sentence_zh), ensure_ascii=False)
+    return segments, pinyin_for_text(sentence_zh)
+
+
+def _nlp_batch(rows) -> list[tuple[str, str, int]]:
+    """Return (segments JSON, pinyin, id) for (id, sentence_zh) rows."""
+    texts = [r[1] for r in rows]
+    return [
+        (json.dumps(words, ensure_ascii=False), a.pinyin, r[0])
+        for r, words, a in zip(rows, segment_many(texts), annotate_many(texts))
+    ]
+
+
+def _row_to_sentence(row) -> dict:
+    return {
+        "id": row[0],
+        "vocab_word": row[1],
+        "sentence_zh": row[2],
+        "sentence_en": row[3],
+        "segments": json.loads(row[4]) if row[4] else None,
+        "pinyin": row[5],
+    }
+
+
+async def _ensure_loaded() -> dict[int, RowIdIndex]:
+    global _levels
+    if _levels is not None:
+        return _levels
+    async with _lock:
+        if _levels is None:
+            async with get_db(readonly=True) as db:
+                rows = await db.execute_fetchall(
+                    "SELECT id, hsk_level FROM game_sentences WHERE served = 1"
+                )
+            levels: dict[int, RowIdIndex] = {}
+            for row_id, level in rows:
+                levels.setdefault(level, RowIdIndex()).add(row_id)
+                _level_of[row_id] = level
+            _levels = levels
+    return _levels
+
+
+async def count(hsk_level: int) -> int:
+    """Return how many served sentences are stored for a level."""
+    levels = await _ensure_loaded()
+    index = levels.get(hsk_level)
+    return len(index) if index else 0
+
+
+async def add_sentence(
+    hsk_level: int,
+    vocab_word: str,
+    sentence_zh: str,
+    sentence_en: str,
+    *,
+    served: bool = True,
+) -> dict:
+    """Insert a sentence into the bank and register it for sampling.
+
+    Pass served=False for sentences prefetched into the Mad Libs pool;
+    those are registered by register() once the pool serves them.
+    Returns the stored sentence, including its precomputed NLP fields.
+    """
+    segments, pinyin = _nlp_fields(sentence_zh)
+    async with get_db() as db:
+        cursor = await db.execute(
+            "INSERT INTO game_sentences "
+            "(hsk_level, vocab_word, sentence_zh, sentence_en, segments, pinyin, served) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (hsk_level, vocab_word, sentence_zh, sentence_en, segments, pinyin, int(served)),
+        )
+        await db.commit()
+        sentence_id = cursor.lastrowid
+    if served:
+        await register(sentence_id, hsk_level)
+    return _row_to_sentence(
+        (sentence_id, vocab_word, sentence_zh, sentence_en, segments, pinyin)
+    )
+
+
+async def register(sentence_id: int, hsk_level: int) -> None:
+    """Make a stored sentence available for sampling."""
+    levels = await _ensure_loaded()
+    levels.setdefault(hsk_level, RowIdIndex()).add(sentence_id)
+    _level_of[sentence_id] = hsk_level
+
+
+async def delete_sentence(sentence_id: int) -> bool:
+    """Delete a sentence by ID. Returns True if a row was deleted."""
+    async with get_db() as db:
+        cursor = await db.execute(
+            "DELETE FROM game_sentences WHERE id = ?", (sentence_id,)
+        )
+        await db.commit()
+        deleted = cursor.rowcount > 0
+    levels = await _ensure_loaded()
+    level = _level_of.pop(sentence_id, None)
+    if level is not None and level in levels:
+        levels[level].remove(sentence_id)
+    return deleted
+
+
+async def get(sentence_id: int) -> dict | None:
+    """Return one stored sentence by id."""
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            f"SELECT {_SENTENCE_COLS} FROM game_sentences WHERE id = ?",
+            (sentence_id,),
+        )
+    return _row_to_sentence(rows[0]) if rows else None
+
+
+async def pick(hsk_level: int, k: int) -> list[dict]:
+    """Return up to k distinct random sentences for a level."""
+    levels = await _ensure_loaded()
+    index = levels.get(hsk_level)
+    if not index:
+        return []
+    ids = index.sample(k)
+    placeholders = ", ".join("?" * len(ids))
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            f"SELECT {_SENTENCE_COLS} FROM game_sentences WHERE id IN ({placeholders})",
+            ids,
+        )
+    by_id = {r[0]: r for r in rows}
+    # Preserve the random order; skip ids deleted out from under us
+    return [_row_to_sentence(by_id[i]) for i in ids if i in by_id]
+
+
+async def backfill_nlp(batch_size: int = 200) -> int:
+    """Fill in segments/pinyin for sentences stored before they existed.
+
+    Works in batches, computing each batch off the event loop. Returns the
+    number of sentences updated.
+    """
+    updated = 0
+    while True:
+        async with get_db(readonly=True) as db:
+            rows = await db.execute_fetchall(
+                "SELECT id, sentence_zh FROM game_sentences "
+                "WHERE segments IS NULL OR pinyin IS NULL LIMIT ?",
+                (batch_size,),
+            )
+        if not rows:
+            break
+        values = await asyncio.to_thread(_nlp_batch, rows)
+        async with get_db() as db:
+            await db.executemany(
+                "UPDATE game_sentences SET segments = ?, pinyin = ? WHERE id = ?",
+                values,
+            )
+            await db.commit()
+        updated += len(rows)
+    if updated:
+        logger.info("Backfilled segments/pinyin for %d sentences", updated)
+    return updated
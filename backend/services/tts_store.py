@@ -0,0 +1,163 @@
+"""Content-addressed store for TTS audio.
+
+Each utterance is synthesized once, into audio/tts/{key}.mp3, where the
+key is a hash of (text, voice, rate). The audio_blobs table records the
+file and how many flashcards reference it (flashcards.audio_hash), so
+cards with the same Chinese, re-created words and regenerated assets
+reuse the file instead of calling edge-tts again. When a blob's last card
+goes it is kept for TTS_UNUSED_RETENTION_DAYS (a deleted word is often
+added back) and then removed by collect(); pinned blobs (the 的/得/地
+clips) are never removed.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+
+from backend.config import ASSETS_DIR, TTS_RATE, TTS_UNUSED_RETENTION_DAYS, TTS_VOICE
+from backend.database import get_db
+
+logger = logging.getLogger(__name__)
+
+TTS_DIR = ASSETS_DIR / "audio" / "tts"
+
+_stats = {"hits": 0, "misses": 0}
+_inflight: dict[str, asyncio.Task] = {}  # key -> running synthesis
+# Serializes publishing and deleting blob files, so collect() can't remove
+# a file that is being re-created for the same key
+_files_lock = asyncio.Lock()
+
+
+def audio_key(text: str, voice: str = TTS_VOICE, rate: str = TTS_RATE) -> str:
+    return hashlib.sha256(f"{voice}\0{rate}\0{text}".encode("utf-8")).hexdigest()
+
+
+def relative_path(key: str) -> str:
+    """Path of a blob relative to ASSETS_DIR (as stored in audio_path)."""
+    return f"audio/tts/{key}.mp3"
+
+
+async def _synthesize(key: str, text: str) -> None:
+    import edge_tts  # deferred: only needed on a cache miss
+
+    TTS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = ASSETS_DIR / relative_path(key)
+    tmp_path = out_path.with_suffix(f".{os.getpid()}.tmp")
+    communicate = edge_tts.Communicate(text=text, voice=TTS_VOICE, rate=TTS_RATE)
+    try:
+        await communicate.save(str(tmp_path))
+        async with _files_lock:
+            tmp_path.replace(out_path)
+            async with get_db() as db:
+                await db.execute(
+                    "INSERT OR IGNORE INTO audio_blobs (hash, path, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, relative_path(key), time.time()),
+                )
+                await db.commit()
+        logger.info("Synthesized TTS audio %s", relative_path(key))
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+async def synthesize(text: str) -> str:
+    """Return the key of the audio for `text`, synthesizing it on a miss.
+
+    Concurrent requests for the same utterance share one synthesis.
+    """
+    key = audio_key(text)
+    async with get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT 1 FROM audio_blobs WHERE hash = ?", (key,)
+        )
+    if rows and (ASSETS_DIR / relative_path(key)).is_file():
+        _stats["hits"] += 1
+        return key
+
+    task = _inflight.get(key)
+    if task is None:
+        _stats["misses"] += 1
+        task = asyncio.create_task(_synthesize(key, text))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        _stats["hits"] += 1  # shares a synthesis already under way
+    await asyncio.shield(task)
+    return key
+
+
+async def assign(card_id: int, key: str) -> None:
+    """Point a card at a blob, moving its reference from any previous one."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT audio_hash, audio_path FROM flashcards WHERE id = ?", (card_id,)
+        )
+        if not rows:
+            return  # card deleted meanwhile
+        old_key, old_path = rows[0]
+        if old_key != key:
+            cursor = await db.execute(
+                "UPDATE audio_blobs SET refcount = refcount + 1, released_at = NULL "
+                "WHERE hash = ?",
+                (key,),
+            )
+            if not cursor.rowcount:
+                raise RuntimeError(f"TTS blob {key} was collected before use")
+        await db.execute(
+            "UPDATE flashcards SET audio_path = ?, audio_hash = ? WHERE id = ?",
+            (relative_path(key), key, card_id),
+        )
+        await db.commit()
+    if old_key is None and old_path and old_path != relative_path(key):
+        # Per-card file from before the store
+        (ASSETS_DIR / old_path).unlink(missing_ok=True)
+    elif old_key is not None and old_key != key:
+        await release(old_key)
+
+
+async def release(key: str) -> None:
+    """Drop one card reference to a blob."""
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE audio_blobs SET refcount = refcount - 1, "
+            "released_at = CASE WHEN refcount <= 1 THEN ? ELSE released_at END "
+            "WHERE hash = ?",
+            (time.time(), key),
+        )
+        await db.commit()
+
+
+async def collect() -> int:
+    """Delete blobs that have gone unreferenced past the retention period."""
+    cutoff = time.time() - TTS_UNUSED_RETENTION_DAYS * 86400
+    async with _files_lock:
+        async with get_db() as db:
+            rows = await db.execute_fetchall(
+                "DELETE FROM audio_blobs "
+                "WHERE refcount <= 0 AND pinned = 0 "
+                "AND COALESCE(released_at, created_at) < ? "
+                "RETURNING path",
+                (cutoff,),
+            )
+            await db.commit()
+        for (path,) in rows:
+            (ASSETS_DIR / path).unlink(missing_ok=True)
+    return len(rows)
+
+
+async def pin(texts) -> None:
+    """Synthesize utterances that must always exist and exempt them from cleanup."""
+    keys = [await synthesize(text) for text in texts]
+    async with get_db() as db:
+        await db.executemany(
+            "UPDATE audio_blobs SET pinned = 1 WHERE hash = ?", [(k,) for k in keys]
+        )
+        await db.commit()
+
+
+def get_stats() -> dict:
+    """Hit/miss counts for the metrics endpoint."""
+    lookups = _stats["hits"] + _stats["misses"]
+    return {**_stats, "hit_rate": _stats["hits"] / lookups if lookups else 0.0}
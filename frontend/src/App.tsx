@@ -113,10 +113,12 @@ function AuthenticatedApp() {
         sessions={chat.sessions}
         currentSessionId={chat.currentSessionId}
         messages={chat.messages}
+        hasMoreMessages={chat.hasMoreMessages}
         loading={chat.loading}
         sending={chat.sending}
         error={chat.error}
         onSelectSession={chat.selectSession}
+        onLoadEarlierMessages={chat.loadEarlierMessages}
         onCreateSession={chat.createSession}
         onDeleteSession={chat.deleteSession}
         onSendMessage={chat.sendMessage}
@@ -1,5 +1,7 @@
-import { apiFetch } from "./client";
+import { apiFetch, apiStream } from "./client";
 import type {
+  ChatMessage,
+  ChatMessagePage,
   ChatSession,
   ChatSessionDetail,
   SegmentedMessageResponse,
@@ -18,6 +20,16 @@ export function getSession(id: number): Promise<ChatSessionDetail> {
   return apiFetch(`/api/chat/sessions/${id}`);
 }
 
+export function listMessages(
+  sessionId: number,
+  options: { beforeId?: number; limit?: number } = {}
+): Promise<ChatMessagePage> {
+  const params = new URLSearchParams();
+  if (options.beforeId !== undefined) params.set("before_id", String(options.beforeId));
+  if (options.limit !== undefined) params.set("limit", String(options.limit));
+  return apiFetch(`/api/chat/sessions/${sessionId}/messages?${params}`);
+}
+
 export async function deleteSession(id: number): Promise<void> {
   await apiFetch(`/api/chat/sessions/${id}`, { method: "DELETE" });
 }
@@ -32,6 +44,38 @@ export function sendMessage(
   });
 }
 
+export interface SendMessageStreamHandlers {
+  onUserMessage: (message: ChatMessage) => void;
+  onDelta: (text: string) => void;
+  onDone: (message: ChatMessage) => void;
+}
+
+/** Send a message and receive the reply incrementally over SSE. */
+export async function sendMessageStream(
+  sessionId: number,
+  content: string,
+  handlers: SendMessageStreamHandlers
+): Promise<void> {
+  let streamError: string | null = null;
+  await apiStream(
+    `/api/chat/sessions/${sessionId}/messages/stream`,
+    { method: "POST", body: JSON.stringify({ content }) },
+    (event, data) => {
+      const payload = data as Record<string, unknown>;
+      if (event === "user_message") {
+        handlers.onUserMessage(payload as unknown as ChatMessage);
+      } else if (event === "delta") {
+        handlers.onDelta(payload.text as string);
+      } else if (event === "done") {
+        handlers.onDone(payload.assistant_message as ChatMessage);
+      } else if (event === "error") {
+        streamError = payload.detail as string;
+      }
+    }
+  );
+  if (streamError) throw new Error(streamError);
+}
+
 export function segmentMessage(
   messageId: number
 ): Promise<SegmentedMessageResponse> {
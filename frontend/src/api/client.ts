@@ -36,10 +36,10 @@ export function authedUrl(path: string): string {
   return token ? `${path}?token=${encodeURIComponent(token)}` : path;
 }
 
-export async function apiFetch<T>(
+async function authedFetch(
   path: string,
-  options: RequestInit = {}
-): Promise<T> {
+  options: RequestInit
+): Promise<Response> {
   const token = getToken();
   const headers: Record<string, string> = {
     "Content-Type": "application/json",
@@ -54,6 +54,44 @@ export async function apiFetch<T>(
     const body = await res.json().catch(() => ({}));
     throw new Error(body.detail || `API error ${res.status}`);
   }
+  return res;
+}
+
+export async function apiFetch<T>(
+  path: string,
+  options: RequestInit = {}
+): Promise<T> {
+  const res = await authedFetch(path, options);
   if (res.status === 204) return undefined as T;
   return res.json();
 }
+
+/** POST to a Server-Sent Events endpoint, calling onEvent for each event. */
+export async function apiStream(
+  path: string,
+  options: RequestInit,
+  onEvent: (event: string, data: unknown) => void
+): Promise<void> {
+  const res = await authedFetch(path, options);
+  if (!res.body) throw new Error("Streaming not supported");
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let end;
+    while ((end = buffer.indexOf("\n\n")) >= 0) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      let event = "message";
+      let data = "";
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      onEvent(event, data ? JSON.parse(data) : null);
+    }
+  }
+}
@@ -9,10 +9,12 @@ interface Props {
   sessions: ChatSession[];
   currentSessionId: number | null;
   messages: ChatMessage[];
+  hasMoreMessages: boolean;
   loading: boolean;
   sending: boolean;
   error: string | null;
   onSelectSession: (id: number) => void;
+  onLoadEarlierMessages: () => void;
   onCreateSession: () => void;
   onDeleteSession: (id: number) => void;
   onSendMessage: (content: string) => void;
@@ -24,10 +26,12 @@ export default function ChatPanel({
   sessions,
   currentSessionId,
   messages,
+  hasMoreMessages,
   loading,
   sending,
   error,
   onSelectSession,
+  onLoadEarlierMessages,
   onCreateSession,
   onDeleteSession,
   onSendMessage,
@@ -37,12 +41,15 @@ export default function ChatPanel({
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const [sidebarOpen, setSidebarOpen] = useState(false);
 
+  // Scroll down when the conversation grows at the bottom (not when
+  // earlier messages are prepended)
+  const lastMessage = messages[messages.length - 1];
   useEffect(() => {
     const parent = messagesEndRef.current?.parentElement;
     if (parent) {
       parent.scrollTo({ top: parent.scrollHeight, behavior: "smooth" });
     }
-  }, [messages]);
+  }, [lastMessage?.id, lastMessage?.content]);
 
   return (
     <div className="chat-panel">
@@ -125,6 +132,11 @@ export default function ChatPanel({
         ) : (
           <>
             <div className="messages-area">
+              {hasMoreMessages && (
+                <button className="load-earlier-btn" onClick={onLoadEarlierMessages}>
+                  Load earlier messages
+                </button>
+              )}
               {messages.map((m) => (
                 <MessageBubble
                   key={m.id}
@@ -127,10 +127,11 @@ function ExampleSentenceDisplay({ cardId, examples, setExamples }: {
   );
 }
 
-function parseImagePath(imagePath: string | null) {
+// Shows the thumbnail variant when the image has been normalized
+function parseImagePath(imagePath: string | null, thumbPath: string | null = null) {
   if (!imagePath) return null;
   const [path, creator, license] = imagePath.split("|");
-  return { path, creator: creator || "Unknown", license: license || "CC" };
+  return { path: thumbPath || path, creator: creator || "Unknown", license: license || "CC" };
 }
 
 interface Props {
@@ -283,7 +284,7 @@ export default function CardManager({
                   }}
                 />
               </div>
-              {(() => { const img = parseImagePath(card.image_path); return img ? (
+              {(() => { const img = parseImagePath(card.image_path, card.image_thumb_path); return img ? (
                 <div className="cm-card-image">
                   <img src={`/assets/${img.path}?v=${encodeURIComponent(card.image_path || "")}`} alt={card.english} />
                   <span className="cm-card-attribution">{img.creator} / {img.license}</span>
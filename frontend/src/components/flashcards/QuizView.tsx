@@ -6,10 +6,11 @@ import { playCorrect, playIncorrect } from "../../hooks/useSounds";
 import CongratulationImg from "../../assets/Congratulation.jpg";
 import "./QuizView.css";
 
-function parseImagePath(imagePath: string | null) {
+// Shows the thumbnail variant when the image has been normalized
+function parseImagePath(imagePath: string | null, thumbPath: string | null = null) {
   if (!imagePath) return null;
   const [path, creator, license] = imagePath.split("|");
-  return { path, creator: creator || "Unknown", license: license || "CC" };
+  return { path: thumbPath || path, creator: creator || "Unknown", license: license || "CC" };
 }
 
 interface ReviewSession {
@@ -147,7 +148,7 @@ export default function QuizView({
           {showingChinese ? "What does this mean?" : "Which is the correct translation?"}
         </div>
         {!showingChinese && (() => {
-          const img = parseImagePath(q.image_path);
+          const img = parseImagePath(q.image_path, q.image_thumb_path);
           return img ? (
             <div className="qv-image">
               <img src={`/assets/${img.path}?v=${encodeURIComponent(q.image_path || "")}`} alt="" />
@@ -2,10 +2,13 @@ import { useCallback, useEffect, useState } from "react";
 import * as chatApi from "../api/chat";
 import type { ChatMessage, ChatSession } from "../types/chat";
 
+const MESSAGE_PAGE_SIZE = 50;
+
 export function useChat() {
   const [sessions, setSessions] = useState<ChatSession[]>([]);
   const [currentSessionId, setCurrentSessionId] = useState<number | null>(null);
   const [messages, setMessages] = useState<ChatMessage[]>([]);
+  const [hasMoreMessages, setHasMoreMessages] = useState(false);
   const [loading, setLoading] = useState(false);
   const [sending, setSending] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -24,14 +27,15 @@ export function useChat() {
     refreshSessions();
   }, [refreshSessions]);
 
-  // Load a session's messages
+  // Load the latest page of a session's messages
   const selectSession = useCallback(async (id: number) => {
     setCurrentSessionId(id);
     setLoading(true);
     setError(null);
     try {
-      const detail = await chatApi.getSession(id);
-      setMessages(detail.messages);
+      const page = await chatApi.listMessages(id, { limit: MESSAGE_PAGE_SIZE });
+      setMessages(page.messages);
+      setHasMoreMessages(page.has_more);
     } catch (e) {
       setError(e instanceof Error ? e.message : "Failed to load session");
     } finally {
@@ -39,6 +43,22 @@ export function useChat() {
     }
   }, []);
 
+  // Prepend the page of messages before the oldest one loaded
+  const loadEarlierMessages = useCallback(async () => {
+    const oldest = messages.find((m) => m.id > 0);
+    if (!currentSessionId || !oldest) return;
+    try {
+      const page = await chatApi.listMessages(currentSessionId, {
+        beforeId: oldest.id,
+        limit: MESSAGE_PAGE_SIZE,
+      });
+      setMessages((prev) => [...page.messages, ...prev]);
+      setHasMoreMessages(page.has_more);
+    } catch (e) {
+      setError(e instanceof Error ? e.message : "Failed to load messages");
+    }
+  }, [currentSessionId, messages]);
+
   // Create a new session
   const createSession = useCallback(async () => {
     setError(null);
@@ -47,6 +67,7 @@ export function useChat() {
       setSessions((prev) => [session, ...prev]);
       setCurrentSessionId(session.id);
       setMessages([]);
+      setHasMoreMessages(false);
       return session;
     } catch (e) {
       setError(e instanceof Error ? e.message : "Failed to create session");
@@ -93,19 +114,48 @@ export function useChat() {
       };
       setMessages((prev) => [...prev, optimistic]);
 
+      // Placeholder for the assistant reply, filled in as it streams
+      const pending: ChatMessage = {
+        ...optimistic,
+        id: optimistic.id - 1,
+        role: "assistant",
+        content: "",
+      };
+
       try {
-        const res = await chatApi.sendMessage(currentSessionId, content);
-        // Replace optimistic message with real one, append assistant reply
-        setMessages((prev) => [
-          ...prev.filter((m) => m.id !== optimistic.id),
-          res.user_message,
-          res.assistant_message,
-        ]);
+        await chatApi.sendMessageStream(currentSessionId, content, {
+          onUserMessage: (userMessage) =>
+            setMessages((prev) => [
+              ...prev.map((m) => (m.id === optimistic.id ? userMessage : m)),
+              pending,
+            ]),
+          onDelta: (text) =>
+            setMessages((prev) =>
+              prev.map((m) =>
+                m.id === pending.id ? { ...m, content: m.content + text } : m
+              )
+            ),
+          onDone: (assistantMessage) =>
+            setMessages((prev) =>
+              prev.map((m) => (m.id === pending.id ? assistantMessage : m))
+            ),
+        });
         refreshSessions();
       } catch (e) {
-        // Remove optimistic message on error
-        setMessages((prev) => prev.filter((m) => m.id !== optimistic.id));
         setError(e instanceof Error ? e.message : "Failed to send message");
+        // The server keeps a partial reply (marked as interrupted), or drops
+        // the user message if nothing was streamed; reload to match it
+        try {
+          const page = await chatApi.listMessages(currentSessionId, {
+            limit: MESSAGE_PAGE_SIZE,
+          });
+          setMessages(page.messages);
+          setHasMoreMessages(page.has_more);
+        } catch {
+          setMessages((prev) =>
+            prev.filter((m) => m.id !== optimistic.id && m.id !== pending.id)
+          );
+        }
       } finally {
         setSending(false);
       }
@@ -117,10 +167,12 @@ export function useChat() {
     sessions,
     currentSessionId,
     messages,
+    hasMoreMessages,
     loading,
     sending,
     error,
     selectSession,
+    loadEarlierMessages,
     createSession,
     deleteSession,
     sendMessage,
@@ -27,6 +27,11 @@ export interface ChatSessionDetail extends ChatSession {
   messages: ChatMessage[];
 }
 
+export interface ChatMessagePage {
+  messages: ChatMessage[];
+  has_more: boolean;
+}
+
 export interface SendMessageResponse {
   user_message: ChatMessage;
   assistant_message: ChatMessage;
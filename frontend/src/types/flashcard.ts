@@ -9,6 +9,9 @@ export interface Flashcard {
   active: boolean;
   created_at: string;
   source: string;
+  image_thumb_path: string | null;
+  image_width: number | null;
+  image_height: number | null;
 }
 
 export interface QuizQuestion {
@@ -19,6 +22,7 @@ export interface QuizQuestion {
   options: string[];
   audio_path: string | null;
   image_path: string | null;
+  image_thumb_path: string | null;
 }
 
 export interface QuizAnswerResponse {
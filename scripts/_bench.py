@@ -0,0 +1,62 @@
+"""Shared setup for the benchmark scripts.
+
+Importing this module puts the project root on sys.path and points
+DB_PATH at a throwaway directory (unless it is already set), so it must be
+imported before anything from backend. Run the scripts from anywhere:
+
+    python scripts/bench_quiz_weights.py
+"""
+
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+WORK_DIR = Path(tempfile.mkdtemp(prefix="trilingo-bench-"))
+os.environ.setdefault("DB_PATH", str(WORK_DIR / "bench.db"))
+
+
+async def init_database(path: str | None = None) -> None:
+    """Create and migrate a database.
+
+    The 的/得/地 audio step is skipped: it would call edge-tts.
+    """
+    from backend import database
+
+    if path is not None:
+        database.DB_PATH = path
+
+    async def no_audio() -> None:
+        pass
+
+    database._ensure_dedede_audio = no_audio
+    await database.init_db()
+
+
+async def open_database(path: str | None = None) -> None:
+    """init_database(), then open the connection pool."""
+    from backend import database
+
+    await init_database(path)
+    await database.open_pool()
+
+
+async def close_database() -> None:
+    from backend import database
+
+    await database.close_pool()
+
+
+class Timer:
+    """`with Timer() as t: ...` then read t.seconds."""
+
+    def __enter__(self) -> "Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.seconds = time.perf_counter() - self._start
@@ -0,0 +1,160 @@
+"""Benchmark the bulk audio backfill: fixed batches vs the asset job queue.
+
+Half of N cards are active; none has audio. edge-tts is replaced by a
+stub whose latency is lognormal (median 20 ms, heavy tail) and seeded per
+text, so both runs see the same latencies; image fetching is a no-op.
+Nothing touches the network or the real assets directory.
+
+  batches   the previous backfill: gather 5 cards at a time, each writing
+            its own file and UPDATE, waiting for the slowest of the five
+  queue     backfill_assets() + the worker pool under
+            ASSET_AUDIO_CONCURRENCY=5 (a sliding window). A card created
+            mid-run is enqueued and the time to its audio is reported,
+            along with a pause/resume and the status endpoint's progress.
+            The 0.5 s pause is included in its total.
+
+    python scripts/bench_asset_backfill.py [--cards N]
+"""
+
+import argparse
+import asyncio
+import math
+import os
+from pathlib import Path
+import random
+import sys
+import types
+
+import _bench
+from _bench import Timer
+
+os.environ.setdefault("ASSET_AUDIO_CONCURRENCY", "5")
+os.environ.setdefault("ASSET_WORKERS", "8")
+
+
+def tts_latency(text: str) -> float:
+    return math.exp(random.Random(text).gauss(math.log(0.02), 0.8))
+
+
+class StubCommunicate:
+    def __init__(self, text: str, voice: str = "", rate: str = "") -> None:
+        self.text = text
+
+    async def save(self, path: str) -> None:
+        await asyncio.sleep(tts_latency(self.text))
+        Path(path).write_bytes(b"mp3")
+
+
+sys.modules["edge_tts"] = types.SimpleNamespace(Communicate=StubCommunicate)
+
+from backend import database  # noqa: E402
+from backend.services import asset_queue, asset_worker, tts_store  # noqa: E402
+
+tts_store.ASSETS_DIR = _bench.WORK_DIR / "assets"
+tts_store.TTS_DIR = tts_store.ASSETS_DIR / "audio" / "tts"
+
+
+async def no_image(card_id: int, english: str) -> None:
+    pass
+
+
+asset_worker.fetch_image = no_image
+
+
+async def populate(cards: int) -> None:
+    async with database.get_db() as db:
+        await db.executemany(
+            "INSERT INTO flashcards (chinese, pinyin, english, active) VALUES (?, '', ?, ?)",
+            [(f"词{i}", f"word {i}", int(i % 2 == 0)) for i in range(cards)],
+        )
+        await db.commit()
+
+
+async def missing_audio() -> int:
+    async with database.get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT COUNT(*) FROM flashcards WHERE audio_path IS NULL"
+        )
+    return rows[0][0]
+
+
+async def run_batches() -> None:
+    async with database.get_db(readonly=True) as db:
+        rows = await db.execute_fetchall(
+            "SELECT id, chinese, english FROM flashcards WHERE audio_path IS NULL"
+        )
+    audio_dir = tts_store.ASSETS_DIR / "audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+
+    async def audio(card_id: int, chinese: str) -> None:
+        await StubCommunicate(chinese).save(str(audio_dir / f"{card_id}.mp3"))
+        async with database.get_db() as db:
+            await db.execute(
+                "UPDATE flashcards SET audio_path = ? WHERE id = ?",
+                (f"audio/{card_id}.mp3", card_id),
+            )
+            await db.commit()
+
+    for i in range(0, len(rows), 5):
+        await asyncio.gather(*(
+            asyncio.gather(audio(r[0], r[1]), no_image(r[0], r[2]))
+            for r in rows[i : i + 5]
+        ))
+
+
+async def run_queue() -> None:
+    loop = asyncio.get_running_loop()
+    await asset_queue.backfill_assets()
+    await asset_queue.start()
+    try:
+        await asyncio.sleep(1)
+        async with database.get_db() as db:
+            cursor = await db.execute(
+                "INSERT INTO flashcards (chinese, pinyin, english) VALUES ('新', '', 'new')"
+            )
+            await db.commit()
+        new_id = cursor.lastrowid
+        enqueued = loop.time()
+        await asset_queue.enqueue([new_id])
+        while True:
+            async with database.get_db(readonly=True) as db:
+                rows = await db.execute_fetchall(
+                    "SELECT audio_path FROM flashcards WHERE id = ?", (new_id,)
+                )
+            if rows[0][0]:
+                break
+            await asyncio.sleep(0.005)
+        print(f"  new card had audio {(loop.time() - enqueued) * 1000:.0f} ms after enqueue")
+
+        asset_queue.pause()
+        await asyncio.sleep(0.5)
+        status = await asset_queue.get_status()
+        print(
+            f"  paused: {status['backlog_completed']}/{status['backlog_total']} done, "
+            f"{status['kinds']['audio']['running']} running"
+        )
+        asset_queue.resume()
+        while await missing_audio():
+            await asyncio.sleep(0.1)
+    finally:
+        await asset_queue.stop()
+
+
+async def main(cards: int) -> None:
+    for name, run in (("batches", run_batches), ("queue", run_queue)):
+        print(name)
+        await _bench.open_database(str(_bench.WORK_DIR / f"{name}.db"))
+        try:
+            await populate(cards)
+            with Timer() as t:
+                await run()
+        finally:
+            await _bench.close_database()
+        print(f"  {cards} cards in {t.seconds:.1f} s, {cards / t.seconds:.0f} cards/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.cards))
@@ -0,0 +1,110 @@
+"""Benchmark chat pinyin storage: legacy JSON vs interned syllable codes.
+
+Builds a session of N assistant messages at schema version 7, with pinyin
+stored as JSON the way it was before migration 8, then runs the real
+migration. Reports the database size (after VACUUM) and the stored bytes
+per message before and after, the migration time, the cost of decoding
+every annotation both ways, and the time to load the whole session with
+the current code.
+
+    python scripts/bench_chat_pinyin.py [--messages N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+
+import _bench
+from _bench import Timer
+
+import aiosqlite
+
+from backend import database
+from backend.chinese.pinyin import annotate_pinyin
+from backend.models.chat import PinyinPair
+from backend.services import chat_service, pinyin_store
+
+TEXTS = [
+    "你好，我是Alister。你今天怎么样？",
+    "我们去吃饭吧！好吗？",
+    "这个句子有点长，但是没关系，我们可以慢慢学习中文。",
+]
+
+
+async def vacuumed_size() -> int:
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        await db.execute("VACUUM")
+    return os.path.getsize(database.DB_PATH)
+
+
+async def build_legacy(messages: int) -> None:
+    """Create a version-7 database holding one session of JSON-pinyin messages."""
+    migrations = database._MIGRATIONS
+    database._MIGRATIONS = [m for m in migrations if m[0] < 8]
+    try:
+        await _bench.init_database()
+    finally:
+        database._MIGRATIONS = migrations
+    encoded = [
+        json.dumps(
+            [{"char": c, "pinyin": p} for c, p in annotate_pinyin(text)],
+            ensure_ascii=False,
+        )
+        for text in TEXTS
+    ]
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        await db.execute("INSERT INTO chat_sessions (title) VALUES ('bench')")
+        await db.executemany(
+            "INSERT INTO chat_messages "
+            "(session_id, role, content, pinyin, translation, feedback) "
+            "VALUES (1, 'assistant', ?, ?, 'translation', 'feedback')",
+            [(TEXTS[i % 3], encoded[i % 3]) for i in range(messages)],
+        )
+        await db.commit()
+
+
+async def main(messages: int) -> None:
+    await build_legacy(messages)
+    before = await vacuumed_size()
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        legacy = await db.execute_fetchall(
+            "SELECT content, pinyin FROM chat_messages ORDER BY id"
+        )
+        with Timer() as migrate:
+            await database._run_migrations(db)
+        compact = await db.execute_fetchall(
+            "SELECT content, pinyin_codes FROM chat_messages ORDER BY id"
+        )
+    after = await vacuumed_size()
+
+    with Timer() as old_decode:
+        for _, raw in legacy:
+            [PinyinPair(**p) for p in json.loads(raw)]
+    with Timer() as new_decode:
+        for content, codes in compact:
+            pinyin_store.decode(content, codes)
+
+    await database.open_pool()
+    try:
+        with Timer() as load:
+            await chat_service.get_session(1)
+    finally:
+        await database.close_pool()
+
+    json_bytes = sum(len(raw.encode()) for _, raw in legacy) / messages
+    code_bytes = sum(len(codes) for _, codes in compact) / messages
+
+    print(f"{messages} assistant messages")
+    print(f"  database size    {before / 1e6:8.1f} MB -> {after / 1e6:.1f} MB")
+    print(f"  stored pinyin    {json_bytes:8.0f} B  -> {code_bytes:.0f} B per message")
+    print(f"  decode all       {old_decode.seconds:8.2f} s  -> {new_decode.seconds:.2f} s")
+    print(f"  migration 8+     {migrate.seconds:8.2f} s")
+    print(f"  load session     {load.seconds:8.2f} s (current code, compact rows)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages))
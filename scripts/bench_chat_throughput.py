@@ -0,0 +1,78 @@
+"""Benchmark chat send throughput with many concurrent chatters.
+
+Each chatter opens a session and sends its messages one after another
+through chat_service.send_message. A stub provider answers after a fixed
+latency, so the ideal rate is chatters / latency messages per second.
+The gap to that rate is the time spent in the database. The script also
+counts the commits per message.
+
+    python scripts/bench_chat_throughput.py [--chatters N] [--messages N] [--latency S]
+"""
+
+import argparse
+import asyncio
+
+import _bench
+from _bench import Timer
+
+from backend import database
+from backend.providers import registry
+from backend.providers.base import ChatProvider, ChatResponse
+from backend.services import chat_service
+
+
+class StubProvider(ChatProvider):
+    model = "stub"
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def chat(self, messages, system_prompt=None, *, cache=True, context=None):
+        await asyncio.sleep(self.latency)
+        return ChatResponse(
+            response="好的，我明白了。", translation="OK, I understand.", feedback=""
+        )
+
+
+async def main(chatters: int, messages: int, latency: float) -> None:
+    registry._provider = StubProvider(latency)
+    commits = 0
+    connect = database._connect
+
+    async def counting_connect():
+        def trace(sql: str) -> None:
+            nonlocal commits
+            commits += sql.lstrip().upper().startswith("COMMIT")
+
+        db = await connect()
+        await db.set_trace_callback(trace)
+        return db
+
+    database._connect = counting_connect
+    await _bench.open_database()
+
+    async def chatter() -> None:
+        session = await chat_service.create_session()
+        for i in range(messages):
+            await chat_service.send_message(session.id, f"你好，这是第{i}条消息。")
+
+    try:
+        commits = 0
+        with Timer() as t:
+            await asyncio.gather(*(chatter() for _ in range(chatters)))
+    finally:
+        await _bench.close_database()
+
+    total = chatters * messages
+    print(f"{total} messages from {chatters} chatters in {t.seconds:.2f} s")
+    print(f"  {total / t.seconds:.1f} msg/s (ideal {chatters / latency:.1f})")
+    print(f"  {(commits - chatters) / total:.1f} commits per message")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chatters", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.chatters, args.messages, args.latency))
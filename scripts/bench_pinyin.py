@@ -0,0 +1,125 @@
+"""Benchmark pinyin annotation: the original per-call pypinyin pass vs
+the memoized backend.chinese.pinyin.
+
+First checks that both produce identical output on a set of mixed texts,
+then times three workloads:
+  replies   unique chat-reply-sized texts, pairs only
+  bank      sentence-bank backfill, pairs plus joined string
+            (annotate_many for the new code)
+  repeated  a few texts over and over, joined string only
+
+Caches are cleared before each workload.
+
+    python scripts/bench_pinyin.py
+"""
+
+import random
+
+import _bench
+from _bench import Timer
+
+from pypinyin import Style, pinyin
+
+from backend.chinese import pinyin as new
+
+CHAT = [
+    "你好，我是Alister。你今天怎么样？我们去银行吧！",
+    "这个句子有点长，但是没关系，我们可以慢慢学习中文。OK?",
+    "他在重庆长大，喜欢音乐和长跑。",
+    "The 的 particle: 我的书, 跑得快, 慢慢地走。",
+]
+
+
+def old_annotate_pinyin(text: str) -> list[tuple[str, str]]:
+    readings = pinyin(text, style=Style.TONE, heteronym=False)
+    result: list[tuple[str, str]] = []
+    pos = 0
+    for reading in readings:
+        segment = reading[0]
+        if text[pos : pos + len(segment)] == segment:
+            for char in segment:
+                result.append((char, ""))
+            pos += len(segment)
+        else:
+            result.append((text[pos], segment))
+            pos += 1
+    return result
+
+
+def old_pinyin_for_text(text: str) -> str:
+    readings = pinyin(text, style=Style.TONE, heteronym=False)
+    parts: list[str] = []
+    pos = 0
+    for reading in readings:
+        segment = reading[0]
+        if text[pos : pos + len(segment)] == segment:
+            pos += len(segment)
+        else:
+            parts.append(segment)
+            pos += 1
+    return " ".join(parts)
+
+
+def clear_caches() -> None:
+    new.annotate.cache_clear()
+    new._word_pairs.cache_clear()
+
+
+def check_equivalence(rng: random.Random) -> int:
+    samples = CHAT + [
+        "".join(rng.choice(CHAT)[i : i + 7] for i in range(0, 20, 3))
+        for _ in range(2000)
+    ]
+    for text in samples:
+        assert new.annotate_pinyin(text) == old_annotate_pinyin(text), text
+        assert new.pinyin_for_text(text) == old_pinyin_for_text(text), text
+    for text, annotation in zip(samples, new.annotate_many(samples)):
+        assert list(annotation.pairs) == old_annotate_pinyin(text), text
+    return len(samples)
+
+
+def main() -> None:
+    rng = random.Random(16)
+    new.warm_up()
+    old_annotate_pinyin(CHAT[0])
+    print(f"identical output on {check_equivalence(rng)} texts")
+
+    replies = ["".join(rng.sample(CHAT, 3)) + str(i) for i in range(2000)]
+    bank = [rng.choice(CHAT)[: rng.randint(5, 25)] + str(i) for i in range(20000)]
+    repeated = CHAT * 500
+
+    clear_caches()
+    with Timer() as old_replies:
+        for text in replies:
+            old_annotate_pinyin(text)
+    with Timer() as new_replies:
+        for text in replies:
+            new.annotate_pinyin(text)
+
+    clear_caches()
+    with Timer() as old_bank:
+        for text in bank:
+            old_annotate_pinyin(text)
+            old_pinyin_for_text(text)
+    with Timer() as new_bank:
+        new.annotate_many(bank)
+
+    clear_caches()
+    with Timer() as old_repeated:
+        for text in repeated:
+            old_pinyin_for_text(text)
+    with Timer() as new_repeated:
+        for text in repeated:
+            new.pinyin_for_text(text)
+
+    print(f"{'':>10} {'old':>10} {'new':>10}  (ms)")
+    for name, old_t, new_t in (
+        ("replies", old_replies, new_replies),
+        ("bank", old_bank, new_bank),
+        ("repeated", old_repeated, new_repeated),
+    ):
+        print(f"{name:>10} {old_t.seconds * 1000:>10.1f} {new_t.seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
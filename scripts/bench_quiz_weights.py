@@ -0,0 +1,127 @@
+"""Benchmark quiz card weighting at 100 / 1k / 10k cards x 100k attempts.
+
+Compares, per quiz request:
+  per-card    the original loop, one attempts query per active card
+  window      one ROW_NUMBER() query over all attempts
+  sampler     the current path: rebuild the resident sampler from
+              flashcard_stats, then draw one card
+  draw        a draw from an already loaded sampler (the steady state)
+
+    python scripts/bench_quiz_weights.py [--attempts N] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import random
+
+import _bench
+from _bench import Timer
+
+from backend import database
+from backend.database import FLASHCARD_STATS_WINDOW
+from backend.services import flashcard_service, quiz_sampler
+
+
+async def per_card(db) -> dict[int, float]:
+    rows = await db.execute_fetchall("SELECT id FROM flashcards WHERE active = 1")
+    weights = {}
+    for (card_id,) in rows:
+        attempts = await db.execute_fetchall(
+            "SELECT correct FROM flashcard_attempts WHERE card_id = ? "
+            "ORDER BY id DESC LIMIT ?",
+            (card_id, FLASHCARD_STATS_WINDOW),
+        )
+        if not attempts:
+            weights[card_id] = 1.0
+        else:
+            correctness = sum(a[0] for a in attempts) / len(attempts)
+            weights[card_id] = max(0.1, 1.0 - correctness * 0.9)
+    return weights
+
+
+async def window(db) -> dict[int, float]:
+    rows = await db.execute_fetchall(
+        "SELECT f.id, AVG(a.correct) "
+        "FROM flashcards f "
+        "LEFT JOIN ("
+        "    SELECT card_id, correct, "
+        "           ROW_NUMBER() OVER (PARTITION BY card_id ORDER BY id DESC) AS rn "
+        "    FROM flashcard_attempts "
+        "    WHERE card_id IN (SELECT id FROM flashcards WHERE active = 1)"
+        ") a ON a.card_id = f.id AND a.rn <= ? "
+        "WHERE f.active = 1 "
+        "GROUP BY f.id",
+        (FLASHCARD_STATS_WINDOW,),
+    )
+    return {
+        card_id: 1.0 if c is None else max(0.1, 1.0 - c * 0.9)
+        for card_id, c in rows
+    }
+
+
+async def populate(cards: int, attempts: int) -> None:
+    rng = random.Random(cards)
+    async with database.get_db() as db:
+        await db.execute("DELETE FROM flashcard_stats")
+        await db.execute("DELETE FROM flashcard_attempts")
+        await db.execute("DELETE FROM flashcards")
+        await db.executemany(
+            "INSERT INTO flashcards (id, chinese, pinyin, english, active) "
+            "VALUES (?, ?, '', ?, 1)",
+            [(i, f"字{i}", f"word {i}") for i in range(1, cards + 1)],
+        )
+        await db.executemany(
+            "INSERT INTO flashcard_attempts (card_id, quiz_type, correct) "
+            "VALUES (?, 'en_to_zh', ?)",
+            [(rng.randint(1, cards), rng.random() < 0.7) for _ in range(attempts)],
+        )
+        await database._rebuild_flashcard_stats(db)
+        await db.commit()
+
+
+async def timed(fn, repeat: int) -> float:
+    with Timer() as t:
+        for _ in range(repeat):
+            await fn()
+    return t.seconds / repeat * 1000
+
+
+async def main(attempts: int, repeat: int) -> None:
+    await _bench.open_database()
+    print(f"{'cards':>6} {'per-card':>10} {'window':>10} {'sampler':>10} {'draw':>10}  (ms)")
+    try:
+        for cards in (100, 1_000, 10_000):
+            await populate(cards, attempts)
+            quiz_sampler.invalidate()
+
+            async def run(query):
+                async with database.get_db(readonly=True) as db:
+                    await query(db)
+
+            async def rebuild_and_draw():
+                quiz_sampler.invalidate()
+                sampler = await quiz_sampler.get_sampler(flashcard_service._card_weight)
+                sampler.draw()
+
+            sampler = await quiz_sampler.get_sampler(flashcard_service._card_weight)
+
+            async def draw():
+                sampler.draw()
+
+            results = [
+                await timed(lambda: run(per_card), repeat),
+                await timed(lambda: run(window), repeat),
+                await timed(rebuild_and_draw, repeat),
+                await timed(draw, 1000),
+            ]
+            print(f"{cards:>6} " + " ".join(f"{r:>10.3f}" for r in results))
+    finally:
+        await _bench.close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.attempts, args.repeat))
@@ -0,0 +1,75 @@
+"""Benchmark picking random game sentences at 1k / 10k / 100k rows.
+
+Compares the original `ORDER BY RANDOM() LIMIT k` query with
+sentence_bank.pick(), which samples ids from the in-memory index and
+fetches those rows by primary key. Also reports the one-time cost of
+loading the index.
+
+    python scripts/bench_sentence_pick.py [--k N] [--repeat N]
+"""
+
+import argparse
+import asyncio
+
+import _bench
+from _bench import Timer
+
+from backend import database
+from backend.services import sentence_bank
+
+
+async def order_by_random(level: int, k: int) -> list:
+    async with database.get_db(readonly=True) as db:
+        return await db.execute_fetchall(
+            "SELECT vocab_word, sentence_zh, sentence_en FROM game_sentences "
+            "WHERE hsk_level = ? ORDER BY RANDOM() LIMIT ?",
+            (level, k),
+        )
+
+
+async def populate(rows: int) -> None:
+    """Fill the bank with `rows` served sentences spread over levels 1-3."""
+    async with database.get_db() as db:
+        await db.execute("DELETE FROM game_sentences")
+        await db.executemany(
+            "INSERT INTO game_sentences "
+            "(hsk_level, vocab_word, sentence_zh, sentence_en, segments, pinyin) "
+            "VALUES (?, '好', ?, ?, '[\"我\", \"很\", \"好\"]', 'wǒ hěn hǎo')",
+            [
+                (i % 3 + 1, f"我很好，谢谢你{i}。", f"I am fine, thank you {i}.")
+                for i in range(rows)
+            ],
+        )
+        await db.commit()
+    sentence_bank._levels = None
+    sentence_bank._level_of.clear()
+
+
+async def main(k: int, repeat: int) -> None:
+    await _bench.open_database()
+    print(f"{'rows':>7} {'RANDOM()':>10} {'pick':>10} {'index load':>11}  (ms)")
+    try:
+        for rows in (1_000, 10_000, 100_000):
+            await populate(rows)
+            with Timer() as load:
+                await sentence_bank.count(1)
+            with Timer() as old:
+                for _ in range(repeat):
+                    await order_by_random(1, k)
+            with Timer() as new:
+                for _ in range(repeat):
+                    await sentence_bank.pick(1, k)
+            print(
+                f"{rows:>7} {old.seconds / repeat * 1000:>10.3f} "
+                f"{new.seconds / repeat * 1000:>10.3f} {load.seconds * 1000:>11.1f}"
+            )
+    finally:
+        await _bench.close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--k", type=int, default=10, help="sentences per pick")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.k, args.repeat))
@@ -0,0 +1,54 @@
+"""Seeding must not duplicate words, and its existence check must use an index."""
+
+import asyncio
+import sqlite3
+
+import aiosqlite
+
+from backend import database
+from backend.services.flashcard_service import _SEED_INSERT
+
+
+def _migrated(path, cards=()) -> sqlite3.Connection:
+    """Create the schema, insert `cards` (chinese, english), then migrate."""
+
+    async def build():
+        async with aiosqlite.connect(path) as db:
+            await db.executescript(database._SCHEMA)
+            await db.executemany(
+                "INSERT INTO flashcards (chinese, pinyin, english) VALUES (?, '', ?)",
+                cards,
+            )
+            await db.commit()
+            await database._run_migrations(db)
+
+    asyncio.run(build())
+    return sqlite3.connect(path)
+
+
+def test_seed_existence_check_uses_chinese_index(tmp_path):
+    db = _migrated(tmp_path / "t.db")
+    plan = db.execute(
+        "EXPLAIN QUERY PLAN " + _SEED_INSERT, ("你好", "nǐ hǎo", "hello", "你好")
+    ).fetchall()
+    details = " | ".join(row[3] for row in plan)
+    assert "idx_flashcards_chinese" in details
+    assert "SCAN flashcards" not in details
+
+
+def test_seed_skips_existing_words_without_unique_index(tmp_path):
+    # Legacy duplicates make migration 2 fall back to a non-unique index
+    db = _migrated(tmp_path / "t.db", [("你好", "hello"), ("你好", "hi")])
+    unique = db.execute(
+        "SELECT \"unique\" FROM pragma_index_list('flashcards') "
+        "WHERE name = 'idx_flashcards_chinese'"
+    ).fetchone()
+    assert unique == (0,)
+
+    cursor = db.execute(_SEED_INSERT, ("你好", "nǐ hǎo", "hello", "你好"))
+    assert cursor.rowcount == 0
+    cursor = db.execute(_SEED_INSERT, ("谢谢", "xiè xie", "thanks", "谢谢"))
+    assert cursor.rowcount == 1
+    assert db.execute(
+        "SELECT COUNT(*) FROM flashcards WHERE chinese = '你好'"
+    ).fetchone() == (2,)
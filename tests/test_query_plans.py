@@ -0,0 +1,152 @@
+"""Hot-path queries must be served by their indexes, not full table scans.
+
+Each test runs the real service function against a migrated database,
+records the SQL it executes (with parameters bound) and checks the
+EXPLAIN QUERY PLAN of the statements that touch the table in question.
+"""
+
+import asyncio
+import re
+import sqlite3
+
+import aiosqlite
+import pytest
+
+from backend import database
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "t.db")
+    monkeypatch.setattr(database, "DB_PATH", path)
+
+    async def build():
+        async with aiosqlite.connect(path) as db:
+            await db.executescript(database._SCHEMA)
+            await database._run_migrations(db)
+            await db.execute(
+                "INSERT INTO flashcards (chinese, pinyin, english, active) "
+                "VALUES ('你好', 'nǐ hǎo', 'hello', 1), ('谢谢', 'xiè xie', 'thanks', 0)"
+            )
+            await db.execute("INSERT INTO chat_sessions (title) VALUES ('t')")
+            await db.execute(
+                "INSERT INTO chat_messages (session_id, role, content) "
+                "VALUES (1, 'user', '你好'), (1, 'assistant', '你好！')"
+            )
+            await db.execute(
+                "INSERT INTO game_sentences (hsk_level, vocab_word, sentence_zh, sentence_en) "
+                "VALUES (1, '好', '你好。', 'Hello.')"
+            )
+            await db.commit()
+
+    asyncio.run(build())
+    return path
+
+
+def _executed(monkeypatch, work) -> list[str]:
+    """Run `work()` on a fresh connection pool and return the SQL it executed."""
+    statements: list[str] = []
+    connect = database._connect
+
+    async def traced_connect():
+        db = await connect()
+        await db.set_trace_callback(statements.append)
+        return db
+
+    monkeypatch.setattr(database, "_connect", traced_connect)
+
+    async def run():
+        await database.open_pool()
+        try:
+            await work()
+        finally:
+            await database.close_pool()
+
+    asyncio.run(run())
+    return statements
+
+
+def _assert_indexed(db_path, statements, table, *indexes):
+    """Every read of `table` must go through one of `indexes`, never a table scan."""
+    pattern = re.compile(rf"\b(?:FROM|INTO|UPDATE|JOIN)\s+{table}\b(?:\s+(\w+))?", re.I)
+    conn = sqlite3.connect(db_path)
+    checked = 0
+    for sql in statements:
+        match = pattern.search(sql)
+        if match is None:
+            continue
+        names = {table}
+        if match.group(1) and match.group(1).upper() not in ("WHERE", "SET", "ORDER"):
+            names.add(match.group(1))  # alias
+        details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        steps = [
+            d for d in details
+            if d.split()[0] in ("SCAN", "SEARCH") and d.split()[1] in names
+        ]
+        if not steps:
+            continue  # e.g. the INSERT half of INSERT ... SELECT FROM another table
+        checked += 1
+        # Scanning a partial index only visits its rows; any other scan of
+        # the table is a full pass
+        assert all(any(i in d for i in indexes) for d in steps), (sql, details)
+    assert checked, f"no statement read {table}"
+
+
+def test_active_card_selection(db_path, monkeypatch):
+    from backend.services import flashcard_service, quiz_sampler
+
+    async def work():
+        quiz_sampler.invalidate()
+        await quiz_sampler.get_sampler(flashcard_service._card_weight)
+        await flashcard_service.list_cards(active_only=True)
+
+    statements = _executed(monkeypatch, work)
+    _assert_indexed(db_path, statements, "flashcards", "idx_flashcards_active")
+
+
+def test_missing_audio_backfill(db_path, monkeypatch):
+    from backend.services import asset_queue
+
+    statements = _executed(monkeypatch, asset_queue.backfill_assets)
+    backfill = [s for s in statements if "audio_path IS NULL" in s]
+    _assert_indexed(
+        db_path,
+        backfill,
+        "flashcards",
+        "idx_flashcards_missing_audio",
+        "idx_flashcards_unnormalized_image",
+    )
+
+
+def test_chat_messages_by_session(db_path, monkeypatch):
+    from backend.services import chat_context, chat_service
+
+    async def work():
+        async with database.get_db(readonly=True) as db:
+            await chat_context.load_context(db, 1)
+        await chat_service.list_messages(1, before_id=2, limit=10)
+
+    statements = _executed(monkeypatch, work)
+    _assert_indexed(db_path, statements, "chat_messages", "idx_chat_messages_session")
+
+
+def test_game_sentences_by_level(db_path, monkeypatch):
+    from backend.services import game_service
+
+    async def work():
+        await game_service.list_sentences(1)
+
+    statements = _executed(monkeypatch, work)
+    _assert_indexed(db_path, statements, "game_sentences", "idx_game_sentences_level")
+
+
+def test_flashcard_attempts_by_card(db_path, monkeypatch):
+    from backend.services import flashcard_service
+
+    async def work():
+        await flashcard_service.delete_card(2)  # the inactive card
+
+    statements = _executed(monkeypatch, work)
+    _assert_indexed(
+        db_path, statements, "flashcard_attempts", "idx_flashcard_attempts_card"
+    )